@@ -2,31 +2,153 @@
 
 from __future__ import annotations
 
+import logging
 from copy import deepcopy
 from typing import Any
 
+import voluptuous as vol
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 
 from .const import (
+    ATTR_CUSTOM_HIGH_CUTOFF,
+    ATTR_CUSTOM_LOW_CUTOFF,
+    ATTR_CUSTOM_SLOPE,
+    ATTR_FILTER_ORDER,
+    ATTR_PROFILE,
+    CONF_ALARM_NORMAL_PRIORITY,
+    CONF_CUSTOM_HIGH_CUTOFF,
+    CONF_CUSTOM_LOW_CUTOFF,
+    CONF_CUSTOM_SLOPE,
+    CONF_MAX_WORKERS,
+    CONF_MAX_WORKERS_PER_PROFILE,
     CONF_PROFILE_NAME,
     CONF_PROFILES,
+    CONF_SPLICE_RELAY,
+    CONF_TONAL_ATTACK,
+    CONF_TONAL_BASE_FREQUENCY,
+    CONF_TONAL_DECAY,
+    CONF_TONAL_PAUSE_DURATION,
+    CONF_TONAL_PULSE_DURATION,
+    CONF_TONAL_SECONDARY_RATIO,
+    CONF_TONAL_WAVEFORM,
+    CONF_VOLUME,
+    CONF_WORKER_CPUS,
+    CONF_WORKER_NICE,
+    CUSTOM_HIGH_CUTOFF_MAX,
+    CUSTOM_LOW_CUTOFF_MIN,
+    CUSTOM_SLOPE_MAX,
+    CUSTOM_SLOPE_MIN,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_MAX_WORKERS_PER_PROFILE,
     DEFAULT_PROFILE_NAME,
+    DEFAULT_WORKER_NICE,
     DOMAIN,
+    FILTER_ORDER_MAX,
+    FILTER_ORDER_MIN,
+    SERVICE_SET_PARAMETERS,
+    TONAL_WAVEFORMS,
+)
+from .metrics import NoiseMetrics
+from .preview import PreviewCache
+from .stream import NoiseMetricsView, NoisePreviewView, NoiseStreamManager, NoiseStreamView
+
+_LOGGER = logging.getLogger(__name__)
+
+# Service field names are snake_case; map them onto the stored parameter keys.
+_SERVICE_PARAMETER_KEYS = {
+    ATTR_CUSTOM_SLOPE: CONF_CUSTOM_SLOPE,
+    ATTR_CUSTOM_LOW_CUTOFF: CONF_CUSTOM_LOW_CUTOFF,
+    ATTR_CUSTOM_HIGH_CUTOFF: CONF_CUSTOM_HIGH_CUTOFF,
+}
+
+SET_PARAMETERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_PROFILE): cv.string,
+        vol.Optional(CONF_VOLUME): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
+        vol.Optional(ATTR_CUSTOM_SLOPE): vol.All(
+            vol.Coerce(float), vol.Range(min=CUSTOM_SLOPE_MIN, max=CUSTOM_SLOPE_MAX)
+        ),
+        vol.Optional(ATTR_CUSTOM_LOW_CUTOFF): vol.All(
+            vol.Coerce(float), vol.Range(min=CUSTOM_LOW_CUTOFF_MIN, max=CUSTOM_HIGH_CUTOFF_MAX)
+        ),
+        vol.Optional(ATTR_CUSTOM_HIGH_CUTOFF): vol.All(
+            vol.Coerce(float), vol.Range(min=CUSTOM_LOW_CUTOFF_MIN, max=CUSTOM_HIGH_CUTOFF_MAX)
+        ),
+        vol.Optional(ATTR_FILTER_ORDER): vol.All(
+            vol.Coerce(int), vol.Range(min=FILTER_ORDER_MIN, max=FILTER_ORDER_MAX)
+        ),
+        vol.Optional(CONF_TONAL_WAVEFORM): vol.In(TONAL_WAVEFORMS),
+        vol.Optional(CONF_TONAL_BASE_FREQUENCY): vol.All(
+            vol.Coerce(float), vol.Range(min=100.0, max=4000.0)
+        ),
+        vol.Optional(CONF_TONAL_SECONDARY_RATIO): vol.All(
+            vol.Coerce(float), vol.Range(min=0.0, max=5.0)
+        ),
+        vol.Optional(CONF_TONAL_PULSE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=50.0, max=4000.0)
+        ),
+        vol.Optional(CONF_TONAL_PAUSE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=0.0, max=3000.0)
+        ),
+        vol.Optional(CONF_TONAL_ATTACK): vol.All(
+            vol.Coerce(float), vol.Range(min=1.0, max=1000.0)
+        ),
+        vol.Optional(CONF_TONAL_DECAY): vol.All(
+            vol.Coerce(float), vol.Range(min=10.0, max=4000.0)
+        ),
+    }
 )
-from .noise import coerce_profile
-from .stream import NoiseStreamManager, NoiseStreamView
 
 
 async def async_setup(hass: HomeAssistant, _: dict[str, Any]) -> bool:
     """Set up the integration via YAML (not supported)."""
 
     hass.data.setdefault(DOMAIN, {"entries": {}, "view": None})
+
+    async def _async_set_parameters(call: ServiceCall) -> None:
+        await _async_handle_set_parameters(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_PARAMETERS,
+        _async_set_parameters,
+        schema=SET_PARAMETERS_SCHEMA,
+    )
     return True
 
 
+async def _async_handle_set_parameters(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Change parameters of every live stream playing the targeted profile."""
+
+    target = call.data[ATTR_PROFILE]
+    updates = {
+        _SERVICE_PARAMETER_KEYS.get(key, key): value
+        for key, value in call.data.items()
+        if key != ATTR_PROFILE
+    }
+
+    entries = hass.data.get(DOMAIN, {}).get("entries", {})
+    for stored in entries.values():
+        manager: NoiseStreamManager = stored["manager"]
+        profile = manager.find_profile(target)
+        if profile is None:
+            continue
+        count = await manager.async_update_parameters(profile.slug, updates)
+        _LOGGER.debug("Updated %s live stream(s) of %s with %s", count, profile.slug, updates)
+        return
+
+    raise HomeAssistantError(f"Unknown noise profile: {target}")
+
+
 def _profiles_from_entry(entry: ConfigEntry) -> list[dict[str, Any]]:
-    """Return the active profiles for a config entry."""
+    """Return the active profiles for a config entry.
+
+    They are normalised once, by ``NoiseStreamManager.update_profiles``.
+    """
 
     raw_profiles: list[dict[str, Any]]
     if CONF_PROFILES in entry.options:
@@ -37,12 +159,25 @@ def _profiles_from_entry(entry: ConfigEntry) -> list[dict[str, Any]]:
     profiles: list[dict[str, Any]] = []
     for raw_profile in raw_profiles:
         name = str(raw_profile.get(CONF_PROFILE_NAME, DEFAULT_PROFILE_NAME))
-        cleaned = coerce_profile(raw_profile)
-        cleaned[CONF_PROFILE_NAME] = name
-        profiles.append(cleaned)
+        profiles.append({**raw_profile, CONF_PROFILE_NAME: name})
     return deepcopy(profiles)
 
 
+def _settings_from_entry(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the stream settings for a config entry."""
+
+    return {
+        CONF_MAX_WORKERS: int(entry.options.get(CONF_MAX_WORKERS, DEFAULT_MAX_WORKERS)),
+        CONF_MAX_WORKERS_PER_PROFILE: int(
+            entry.options.get(CONF_MAX_WORKERS_PER_PROFILE, DEFAULT_MAX_WORKERS_PER_PROFILE)
+        ),
+        CONF_SPLICE_RELAY: bool(entry.options.get(CONF_SPLICE_RELAY, False)),
+        CONF_WORKER_NICE: int(entry.options.get(CONF_WORKER_NICE, DEFAULT_WORKER_NICE)),
+        CONF_WORKER_CPUS: str(entry.options.get(CONF_WORKER_CPUS) or ""),
+        CONF_ALARM_NORMAL_PRIORITY: bool(entry.options.get(CONF_ALARM_NORMAL_PRIORITY, True)),
+    }
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Noise Generator from a config entry."""
 
@@ -53,8 +188,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.http.register_view(view)
         domain_data["view"] = view
 
+    metrics = domain_data.get("metrics")
+    if metrics is None:
+        metrics = domain_data["metrics"] = NoiseMetrics()
+        hass.http.register_view(NoiseMetricsView(metrics))
+
+    if domain_data.get("previews") is None:
+        previews = domain_data["previews"] = PreviewCache()
+        hass.http.register_view(NoisePreviewView(previews))
+
     profiles = _profiles_from_entry(entry)
-    manager = NoiseStreamManager(hass, entry.entry_id)
+    manager = NoiseStreamManager(hass, entry.entry_id, metrics)
+    manager.update_settings(_settings_from_entry(entry))
     manager.update_profiles(profiles)
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
@@ -92,6 +237,7 @@ async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> Non
 
     manager: NoiseStreamManager = stored["manager"]
     profiles = _profiles_from_entry(entry)
+    manager.update_settings(_settings_from_entry(entry))
     manager.update_profiles(profiles)
 
     # Media source instances read directly from hass.data; nothing else needed.
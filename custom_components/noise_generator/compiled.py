@@ -0,0 +1,123 @@
+"""Compiled profiles: normalised definitions with their filter design done once."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from .const import (
+    COMPILED_PROFILE_CACHE_SIZE,
+    CONF_EQ_BANDS,
+    CONF_MIX_DEFINITION,
+    CONF_MIX_LAYERS,
+    CONF_PROFILE_NAME,
+    CONF_PROFILE_PARAMETERS,
+    CONF_PROFILE_SUBTYPE,
+    CONF_PROFILE_TYPE,
+    PROFILE_DESIGN,
+    TONAL_CUSTOM,
+    TONAL_PRESET_PARAMETERS,
+)
+from .eq import design_bands
+from .noise import custom_design, profile_digest, tonal_timing
+
+_COMPILED: dict[str, CompiledProfile] = {}
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    """An immutable, normalised profile together with its filter design.
+
+    ``payload`` is the compact JSON handed to workers, either as ``--profile``
+    or in a profile switch message, so they build generators without
+    redesigning any filters.
+    """
+
+    digest: str
+    profile_type: str
+    subtype: str
+    parameters: Mapping[str, Any]
+    design: Mapping[str, Any]
+    payload: str
+
+    @property
+    def worker_definition(self) -> dict[str, Any]:
+        """Return the decoded ``payload``."""
+
+        return json.loads(self.payload)
+
+
+def design_profile(profile_type: str, subtype: str, params: Mapping[str, Any]) -> dict[str, Any]:
+    """Return the filter design a generator for the profile would derive."""
+
+    if profile_type == "color_noise":
+        if subtype == "eq":
+            return {"eq": design_bands(params.get(CONF_EQ_BANDS, []))}
+        if subtype == "custom":
+            return {"custom": custom_design(params)}
+    elif profile_type == "tonal_noise":
+        merged = dict(TONAL_PRESET_PARAMETERS.get(subtype, {}))
+        if subtype == TONAL_CUSTOM:
+            merged.update(params)
+        return {"tonal": tonal_timing(merged)}
+    elif profile_type == "mix":
+        return {
+            "layers": [
+                design_profile(
+                    layer[CONF_MIX_DEFINITION][CONF_PROFILE_TYPE],
+                    layer[CONF_MIX_DEFINITION][CONF_PROFILE_SUBTYPE],
+                    layer[CONF_MIX_DEFINITION].get(CONF_PROFILE_PARAMETERS) or {},
+                )
+                if CONF_MIX_DEFINITION in layer
+                else {}
+                for layer in params.get(CONF_MIX_LAYERS) or []
+            ]
+        }
+    return {}
+
+
+def compile_profile(definition: dict[str, Any], *, cache: bool = True) -> CompiledProfile:
+    """Return the compiled form of a normalised (and mix-resolved) definition.
+
+    Results are memoised by content hash, so unchanged profiles are not
+    redesigned when the options are saved again. One-off compiles, such as
+    previews, pass ``cache=False`` so they don't evict live profiles.
+    """
+
+    digest = profile_digest(definition)
+    compiled = _COMPILED.get(digest)
+    if compiled is not None:
+        return compiled
+
+    profile_type = definition[CONF_PROFILE_TYPE]
+    subtype = definition[CONF_PROFILE_SUBTYPE]
+    parameters = definition.get(CONF_PROFILE_PARAMETERS) or {}
+    design = design_profile(profile_type, subtype, parameters)
+    payload = json.dumps(
+        {
+            **{key: value for key, value in definition.items() if key != CONF_PROFILE_NAME},
+            PROFILE_DESIGN: design,
+        },
+        separators=(",", ":"),
+        default=str,
+    )
+    # Decoding the payload gives the workers' view and a private deep copy.
+    decoded = json.loads(payload)
+    compiled = CompiledProfile(
+        digest=digest,
+        profile_type=profile_type,
+        subtype=subtype,
+        parameters=MappingProxyType(decoded[CONF_PROFILE_PARAMETERS]),
+        design=MappingProxyType(decoded[PROFILE_DESIGN]),
+        payload=payload,
+    )
+    if not cache:
+        return compiled
+
+    if len(_COMPILED) >= COMPILED_PROFILE_CACHE_SIZE:
+        del _COMPILED[next(iter(_COMPILED))]
+    _COMPILED[digest] = compiled
+    return compiled
@@ -15,16 +15,36 @@ from .const import (
     ACTION_EDIT,
     ACTION_FINISH,
     ACTION_REMOVE,
+    ACTION_SETTINGS,
     CONF_ACTION,
+    CONF_ALARM_NORMAL_PRIORITY,
     CONF_CUSTOM_HIGH_CUTOFF,
     CONF_CUSTOM_LOW_CUTOFF,
     CONF_CUSTOM_SLOPE,
+    CONF_DURATION,
+    CONF_EQ_BANDS,
+    CONF_EQ_BASE,
+    CONF_EQ_FREQUENCY,
+    CONF_EQ_GAIN,
+    CONF_EQ_Q,
+    CONF_EQ_TYPE,
+    CONF_FADE_OUT,
+    CONF_MAX_WORKERS,
+    CONF_MAX_WORKERS_PER_PROFILE,
+    CONF_MIX_GAIN,
+    CONF_MIX_LAYERS,
+    CONF_MIX_PROFILE,
+    CONF_MODULATION,
+    CONF_MODULATION_DEPTH,
+    CONF_MODULATION_PERIOD,
+    CONF_PREVIEW,
     CONF_PROFILE_SUBTYPE,
     CONF_PROFILE_NAME,
     CONF_PROFILE_PARAMETERS,
     CONF_PROFILE_TYPE,
     CONF_PROFILES,
     CONF_SEED,
+    CONF_SPLICE_RELAY,
     CONF_TONAL_ATTACK,
     CONF_TONAL_BASE_FREQUENCY,
     CONF_TONAL_DECAY,
@@ -33,6 +53,8 @@ from .const import (
     CONF_TONAL_SECONDARY_RATIO,
     CONF_TONAL_WAVEFORM,
     CONF_VOLUME,
+    CONF_WORKER_CPUS,
+    CONF_WORKER_NICE,
     COLOR_DISPLAY_LABELS,
     COLOR_NOISE_SUBTYPES,
     CUSTOM_HIGH_CUTOFF_MAX,
@@ -42,41 +64,72 @@ from .const import (
     DEFAULT_CUSTOM_HIGH_CUTOFF,
     DEFAULT_CUSTOM_LOW_CUTOFF,
     DEFAULT_CUSTOM_SLOPE,
+    DEFAULT_EQ_BASE,
+    DEFAULT_EQ_Q,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_MAX_WORKERS_PER_PROFILE,
+    DEFAULT_MODULATION_DEPTH,
+    DEFAULT_MODULATION_PERIOD,
     DEFAULT_PROFILE_NAME,
     DEFAULT_PROFILE_SUBTYPE,
     DEFAULT_PROFILE_TYPE,
     DEFAULT_VOLUME,
+    DEFAULT_WORKER_NICE,
     DOMAIN,
+    DURATION_MAX,
     DEFAULT_TONAL_SUBTYPE,
+    EQ_BAND_TYPES,
+    EQ_BASE_SUBTYPES,
+    EQ_MAX_BANDS,
+    FADE_OUT_MAX,
+    MAX_WORKERS_LIMIT,
+    MIX_DISPLAY_LABELS,
+    MIX_MAX_LAYERS,
+    MIX_SUBTYPES,
+    MODULATION_DISPLAY_LABELS,
+    MODULATION_FILTER_PRESETS,
+    MODULATION_NONE,
+    MODULATION_PERIOD_MAX,
+    MODULATION_PERIOD_MIN,
+    MODULATION_PRESETS,
+    PREVIEW_DURATION,
     TONAL_CUSTOM,
     TONAL_DISPLAY_LABELS,
     TONAL_PRESET_PARAMETERS,
     TONAL_SUBTYPES,
     TONAL_WAVEFORMS,
+    WORKER_NICE_MAX,
     normalize_subtype,
     PROFILE_TYPES,
 )
 from .noise import coerce_profile
+from .scheduling import parse_cpu_list
 
 def _subtype_label(subtype: str) -> str:
     if subtype in COLOR_DISPLAY_LABELS:
         return f"Colored noises · {COLOR_DISPLAY_LABELS[subtype]}"
     if subtype in TONAL_DISPLAY_LABELS:
         return f"Tonal noises · {TONAL_DISPLAY_LABELS[subtype]}"
+    if subtype in MIX_DISPLAY_LABELS:
+        return f"Mixes · {MIX_DISPLAY_LABELS[subtype]}"
     return subtype
 
 
 def _resolve_profile_type(subtype: str) -> str:
     if subtype in COLOR_NOISE_SUBTYPES:
         return "color_noise"
+    if subtype in MIX_SUBTYPES:
+        return "mix"
     return "tonal_noise"
 
 
 
 
-def _color_custom_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schema:
+def _color_custom_schema(
+    defaults: Mapping[str, Any] | None = None, *, preview: bool = False
+) -> vol.Schema:
     defaults = defaults or {}
-    return vol.Schema(
+    schema = vol.Schema(
         {
             vol.Required(
                 CONF_CUSTOM_SLOPE,
@@ -92,6 +145,13 @@ def _color_custom_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schem
             ): vol.All(vol.Coerce(float), vol.Range(min=CUSTOM_LOW_CUTOFF_MIN, max=CUSTOM_HIGH_CUTOFF_MAX)),
         }
     )
+    return _with_preview(schema) if preview else schema
+
+
+def _with_preview(schema: vol.Schema) -> vol.Schema:
+    """Add the checkbox that renders a preview instead of saving."""
+
+    return schema.extend({vol.Required(CONF_PREVIEW, default=False): bool})
 
 
 def _color_custom_defaults(params: Mapping[str, Any] | None = None) -> dict[str, float]:
@@ -103,6 +163,128 @@ def _color_custom_defaults(params: Mapping[str, Any] | None = None) -> dict[str,
     }
 
 
+def _parse_eq_bands(text: str) -> list[dict[str, Any]]:
+    """Parse one ``type frequency gain q`` band per line."""
+
+    bands: list[dict[str, Any]] = []
+    for line in text.splitlines():
+        fields = line.replace(",", " ").split()
+        if not fields:
+            continue
+        if fields[0] not in EQ_BAND_TYPES or not 2 <= len(fields) <= 4:
+            raise vol.Invalid(f"Invalid EQ band: {line}")
+        try:
+            values = [float(value) for value in fields[1:]]
+        except ValueError as err:
+            raise vol.Invalid(f"Invalid EQ band: {line}") from err
+        bands.append(
+            {
+                CONF_EQ_TYPE: fields[0],
+                CONF_EQ_FREQUENCY: values[0],
+                CONF_EQ_GAIN: values[1] if len(values) > 1 else 0.0,
+                CONF_EQ_Q: values[2] if len(values) > 2 else DEFAULT_EQ_Q,
+            }
+        )
+    if len(bands) > EQ_MAX_BANDS:
+        raise vol.Invalid(f"At most {EQ_MAX_BANDS} EQ bands are supported")
+    return bands
+
+
+def _format_eq_bands(bands: list[Mapping[str, Any]]) -> str:
+    return "\n".join(
+        f"{band[CONF_EQ_TYPE]} {band[CONF_EQ_FREQUENCY]:g} {band[CONF_EQ_GAIN]:g} {band[CONF_EQ_Q]:g}"
+        for band in bands
+    )
+
+
+def _eq_defaults(params: Mapping[str, Any] | None = None) -> dict[str, Any]:
+    params = params or {}
+    base = params.get(CONF_EQ_BASE, DEFAULT_EQ_BASE)
+    return {
+        CONF_EQ_BASE: base if base in EQ_BASE_SUBTYPES else DEFAULT_EQ_BASE,
+        CONF_EQ_BANDS: _format_eq_bands(params.get(CONF_EQ_BANDS) or []),
+    }
+
+
+def _eq_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schema:
+    defaults = defaults or _eq_defaults()
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_EQ_BASE,
+                default=defaults[CONF_EQ_BASE],
+            ): selector.selector(
+                {
+                    "select": {
+                        "options": [
+                            {"label": COLOR_DISPLAY_LABELS[name], "value": name}
+                            for name in EQ_BASE_SUBTYPES
+                        ]
+                    }
+                }
+            ),
+            vol.Optional(
+                CONF_EQ_BANDS,
+                default=defaults[CONF_EQ_BANDS],
+            ): selector.selector({"text": {"multiline": True}}),
+        }
+    )
+
+
+def _parse_mix_layers(text: str, available: list[str]) -> list[dict[str, Any]]:
+    """Parse one ``profile name, gain`` layer per line.
+
+    Names must match one of ``available`` (case-insensitively); the gain
+    defaults to 1.
+    """
+
+    names = {name.casefold(): name for name in available}
+    layers: list[dict[str, Any]] = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        name, _, raw_gain = line.rpartition(",")
+        if not name:
+            name, raw_gain = raw_gain, "1"
+        try:
+            gain = float(raw_gain)
+        except ValueError as err:
+            raise vol.Invalid(f"Invalid mix layer: {line}") from err
+        profile = names.get(name.strip().casefold())
+        if profile is None or not 0.0 <= gain <= 1.0:
+            raise vol.Invalid(f"Invalid mix layer: {line}")
+        layers.append({CONF_MIX_PROFILE: profile, CONF_MIX_GAIN: gain})
+    if not layers or len(layers) > MIX_MAX_LAYERS:
+        raise vol.Invalid(f"A mix needs between 1 and {MIX_MAX_LAYERS} layers")
+    return layers
+
+
+def _mixes_using(profiles: list[dict[str, Any]], name: str) -> list[str]:
+    """Return the names of the mixes that have profile ``name`` as a layer."""
+
+    folded = name.casefold()
+    return [
+        profile[CONF_PROFILE_NAME]
+        for profile in profiles
+        if profile.get(CONF_PROFILE_TYPE) == "mix"
+        and any(
+            layer[CONF_MIX_PROFILE].casefold() == folded
+            for layer in profile[CONF_PROFILE_PARAMETERS].get(CONF_MIX_LAYERS, [])
+        )
+    ]
+
+
+def _mix_schema(layers_default: str, available: list[str]) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_MIX_LAYERS,
+                default=layers_default or "\n".join(f"{name}, 0.5" for name in available[:2]),
+            ): selector.selector({"text": {"multiline": True}}),
+        }
+    )
+
+
 def _tonal_defaults(params: Mapping[str, Any] | None = None) -> dict[str, Any]:
     merged = dict(TONAL_PRESET_PARAMETERS.get(DEFAULT_TONAL_SUBTYPE, {}))
     if params:
@@ -110,7 +292,9 @@ def _tonal_defaults(params: Mapping[str, Any] | None = None) -> dict[str, Any]:
     return merged
 
 
-def _tonal_params_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schema:
+def _tonal_params_schema(
+    defaults: Mapping[str, Any] | None = None, *, preview: bool = False
+) -> vol.Schema:
     defaults = _tonal_defaults(defaults)
     waveform_selector = selector.selector(
         {
@@ -122,7 +306,7 @@ def _tonal_params_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schem
             }
         }
     )
-    return vol.Schema(
+    schema = vol.Schema(
         {
             vol.Required(
                 CONF_TONAL_WAVEFORM,
@@ -154,10 +338,16 @@ def _tonal_params_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schem
             ): vol.All(vol.Coerce(float), vol.Range(min=10.0, max=4000.0)),
         }
     )
+    return _with_preview(schema) if preview else schema
 
 
-def _profile_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schema:
+def _profile_schema(
+    defaults: Mapping[str, Any] | None = None, *, include_mix: bool = False
+) -> vol.Schema:
     defaults = defaults or {}
+    subtypes = COLOR_NOISE_SUBTYPES + TONAL_SUBTYPES
+    if include_mix:
+        subtypes = subtypes + MIX_SUBTYPES
     seed_default = ""
     raw_seed = defaults.get(CONF_SEED)
     if isinstance(raw_seed, (str, int)):
@@ -165,12 +355,15 @@ def _profile_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schema:
 
     subtype_default = defaults.get(CONF_PROFILE_SUBTYPE, DEFAULT_PROFILE_SUBTYPE)
     subtype_default = normalize_subtype(subtype_default)
-    if subtype_default not in (*COLOR_NOISE_SUBTYPES, *TONAL_SUBTYPES):
+    if subtype_default not in subtypes:
         subtype_default = DEFAULT_PROFILE_SUBTYPE
 
     options = [
-        {"label": _subtype_label(subtype), "value": subtype}
-        for subtype in COLOR_NOISE_SUBTYPES + TONAL_SUBTYPES
+        {"label": _subtype_label(subtype), "value": subtype} for subtype in subtypes
+    ]
+    modulation_options = [
+        {"label": MODULATION_DISPLAY_LABELS[preset], "value": preset}
+        for preset in MODULATION_PRESETS
     ]
 
     return vol.Schema(
@@ -188,6 +381,86 @@ def _profile_schema(defaults: Mapping[str, Any] | None = None) -> vol.Schema:
                 default=defaults.get(CONF_VOLUME, DEFAULT_VOLUME),
             ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
             vol.Optional(CONF_SEED, default=seed_default): str,
+            vol.Optional(
+                CONF_DURATION,
+                default=float(defaults.get(CONF_DURATION) or 0.0),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=DURATION_MAX)),
+            vol.Optional(
+                CONF_FADE_OUT,
+                default=float(defaults.get(CONF_FADE_OUT) or 0.0),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=FADE_OUT_MAX)),
+            vol.Optional(
+                CONF_MODULATION,
+                default=defaults.get(CONF_MODULATION) or MODULATION_NONE,
+            ): selector.selector({"select": {"options": modulation_options}}),
+            vol.Optional(
+                CONF_MODULATION_PERIOD,
+                default=float(defaults.get(CONF_MODULATION_PERIOD) or DEFAULT_MODULATION_PERIOD),
+            ): vol.All(
+                vol.Coerce(float),
+                vol.Range(min=MODULATION_PERIOD_MIN, max=MODULATION_PERIOD_MAX),
+            ),
+            vol.Optional(
+                CONF_MODULATION_DEPTH,
+                default=float(defaults.get(CONF_MODULATION_DEPTH, DEFAULT_MODULATION_DEPTH)),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=1.0)),
+        }
+    )
+
+
+def _modulation_supported(user_input: Mapping[str, Any]) -> bool:
+    """Return whether the chosen modulation fits the chosen profile.
+
+    Cutoff and slope drifts move the custom colour's filter, so other
+    profiles can only swell.
+    """
+
+    if user_input.get(CONF_MODULATION) not in MODULATION_FILTER_PRESETS:
+        return True
+    return normalize_subtype(user_input[CONF_PROFILE_SUBTYPE]) == "custom"
+
+
+def _settings_defaults(options: Mapping[str, Any] | None = None) -> dict[str, Any]:
+    options = options or {}
+    return {
+        CONF_MAX_WORKERS: int(options.get(CONF_MAX_WORKERS, DEFAULT_MAX_WORKERS)),
+        CONF_MAX_WORKERS_PER_PROFILE: int(
+            options.get(CONF_MAX_WORKERS_PER_PROFILE, DEFAULT_MAX_WORKERS_PER_PROFILE)
+        ),
+        CONF_SPLICE_RELAY: bool(options.get(CONF_SPLICE_RELAY, False)),
+        CONF_WORKER_NICE: int(options.get(CONF_WORKER_NICE, DEFAULT_WORKER_NICE)),
+        CONF_WORKER_CPUS: str(options.get(CONF_WORKER_CPUS) or ""),
+        CONF_ALARM_NORMAL_PRIORITY: bool(options.get(CONF_ALARM_NORMAL_PRIORITY, True)),
+    }
+
+
+def _settings_schema(defaults: Mapping[str, Any]) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(
+                CONF_MAX_WORKERS,
+                default=defaults[CONF_MAX_WORKERS],
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_WORKERS_LIMIT)),
+            vol.Required(
+                CONF_MAX_WORKERS_PER_PROFILE,
+                default=defaults[CONF_MAX_WORKERS_PER_PROFILE],
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_WORKERS_LIMIT)),
+            vol.Required(
+                CONF_SPLICE_RELAY,
+                default=defaults[CONF_SPLICE_RELAY],
+            ): bool,
+            vol.Required(
+                CONF_WORKER_NICE,
+                default=defaults[CONF_WORKER_NICE],
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=WORKER_NICE_MAX)),
+            vol.Optional(
+                CONF_WORKER_CPUS,
+                default=defaults[CONF_WORKER_CPUS],
+            ): str,
+            vol.Required(
+                CONF_ALARM_NORMAL_PRIORITY,
+                default=defaults[CONF_ALARM_NORMAL_PRIORITY],
+            ): bool,
         }
     )
 
@@ -207,6 +480,20 @@ def _profile_from_user_input(user_input: Mapping[str, Any]) -> dict[str, Any]:
     seed = user_input.get(CONF_SEED)
     if seed not in (None, ""):
         profile[CONF_PROFILE_PARAMETERS][CONF_SEED] = seed
+    if user_input.get(CONF_DURATION):
+        profile[CONF_PROFILE_PARAMETERS][CONF_DURATION] = float(user_input[CONF_DURATION])
+        profile[CONF_PROFILE_PARAMETERS][CONF_FADE_OUT] = float(
+            user_input.get(CONF_FADE_OUT) or 0.0
+        )
+    modulation = user_input.get(CONF_MODULATION) or MODULATION_NONE
+    if modulation != MODULATION_NONE:
+        profile[CONF_PROFILE_PARAMETERS][CONF_MODULATION] = modulation
+        profile[CONF_PROFILE_PARAMETERS][CONF_MODULATION_PERIOD] = float(
+            user_input.get(CONF_MODULATION_PERIOD, DEFAULT_MODULATION_PERIOD)
+        )
+        profile[CONF_PROFILE_PARAMETERS][CONF_MODULATION_DEPTH] = float(
+            user_input.get(CONF_MODULATION_DEPTH, DEFAULT_MODULATION_DEPTH)
+        )
 
     if profile_type == "color_noise":
         if subtype == "custom":
@@ -219,6 +506,17 @@ def _profile_from_user_input(user_input: Mapping[str, Any]) -> dict[str, Any]:
             profile[CONF_PROFILE_PARAMETERS][CONF_CUSTOM_HIGH_CUTOFF] = float(
                 user_input.get(CONF_CUSTOM_HIGH_CUTOFF, DEFAULT_CUSTOM_HIGH_CUTOFF)
             )
+        elif subtype == "eq":
+            profile[CONF_PROFILE_PARAMETERS][CONF_EQ_BASE] = user_input.get(
+                CONF_EQ_BASE, DEFAULT_EQ_BASE
+            )
+            profile[CONF_PROFILE_PARAMETERS][CONF_EQ_BANDS] = list(
+                user_input.get(CONF_EQ_BANDS) or []
+            )
+    elif profile_type == "mix":
+        profile[CONF_PROFILE_PARAMETERS][CONF_MIX_LAYERS] = list(
+            user_input.get(CONF_MIX_LAYERS) or []
+        )
     else:
         if subtype != TONAL_CUSTOM:
             profile[CONF_PROFILE_PARAMETERS].update(
@@ -262,6 +560,7 @@ class NoiseGeneratorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         self._pending_profile_base: dict[str, Any] | None = None
         self._pending_color_defaults: dict[str, float] | None = None
         self._pending_tonal_defaults: dict[str, Any] | None = None
+        self._pending_eq_defaults: dict[str, Any] | None = None
 
     async def async_step_user(self, user_input: Mapping[str, Any] | None = None):
         """Configure the integration via the UI."""
@@ -270,8 +569,10 @@ class NoiseGeneratorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             return self.async_abort(reason="single_instance_allowed")
 
         errors: dict[str, str] = {}
+        if user_input is not None and not _modulation_supported(user_input):
+            errors[CONF_MODULATION] = "modulation_needs_custom"
 
-        if user_input is not None:
+        if user_input is not None and not errors:
             user_input = dict(user_input)
             subtype = normalize_subtype(user_input[CONF_PROFILE_SUBTYPE])
             profile_type = _resolve_profile_type(subtype)
@@ -279,6 +580,10 @@ class NoiseGeneratorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 self._pending_profile_base = user_input
                 self._pending_color_defaults = _color_custom_defaults()
                 return await self.async_step_user_custom()
+            if profile_type == "color_noise" and subtype == "eq":
+                self._pending_profile_base = user_input
+                self._pending_eq_defaults = _eq_defaults()
+                return await self.async_step_user_eq()
             if profile_type == "tonal_noise" and subtype == TONAL_CUSTOM:
                 self._pending_profile_base = user_input
                 self._pending_tonal_defaults = _tonal_defaults()
@@ -317,6 +622,36 @@ class NoiseGeneratorConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
+    async def async_step_user_eq(self, user_input: Mapping[str, Any] | None = None):
+        """Collect EQ bands for the first profile."""
+
+        if not self._pending_profile_base:
+            return await self.async_step_user()
+
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                bands = _parse_eq_bands(user_input.get(CONF_EQ_BANDS, ""))
+            except vol.Invalid:
+                errors[CONF_EQ_BANDS] = "invalid_eq_bands"
+                self._pending_eq_defaults = dict(user_input)
+            else:
+                merged = {**self._pending_profile_base, **user_input, CONF_EQ_BANDS: bands}
+                profile = _profile_from_user_input(merged)
+                self._pending_profile_base = None
+                self._pending_eq_defaults = None
+                return self.async_create_entry(
+                    title="Noise Generator",
+                    data={CONF_PROFILES: [profile]},
+                )
+
+        return self.async_show_form(
+            step_id="user_eq",
+            data_schema=_eq_schema(self._pending_eq_defaults),
+            errors=errors,
+        )
+
     async def async_step_user_tonal(self, user_input: Mapping[str, Any] | None = None):
         """Collect custom tonal parameters for the first profile."""
 
@@ -353,11 +688,14 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
     def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
         self._config_entry = config_entry
         self._profiles: list[dict[str, Any]] = []
+        self._settings: dict[str, Any] = {}
         self._selected_index: int | None = None
         self._action: str | None = None
         self._pending_profile_base: dict[str, Any] | None = None
         self._pending_color_defaults: dict[str, float] | None = None
         self._pending_tonal_defaults: dict[str, Any] | None = None
+        self._pending_eq_defaults: dict[str, Any] | None = None
+        self._pending_mix_layers = ""
 
     async def async_step_init(self, user_input: Mapping[str, Any] | None = None):
         self._profiles = [
@@ -370,11 +708,13 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
                 self._config_entry.data.get(CONF_PROFILES, []),
             )
         ]
+        self._settings = _settings_defaults(self._config_entry.options)
         self._selected_index = None
         self._action = None
         self._pending_profile_base = None
         self._pending_color_defaults = None
         self._pending_tonal_defaults = None
+        self._pending_eq_defaults = None
         return await self.async_step_action()
 
     async def async_step_action(self, user_input: Mapping[str, Any] | None = None):
@@ -384,6 +724,7 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
             ACTION_ADD: "Add profile",
             ACTION_EDIT: "Edit profile",
             ACTION_REMOVE: "Remove profile",
+            ACTION_SETTINGS: "Stream settings",
             ACTION_FINISH: "Save changes",
         }
         if not self._profiles:
@@ -402,11 +743,14 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
             if action == ACTION_REMOVE:
                 self._action = ACTION_REMOVE
                 return await self.async_step_select_profile()
+            if action == ACTION_SETTINGS:
+                return await self.async_step_settings()
             if action == ACTION_FINISH:
                 return self.async_create_entry(
                     title="",
                     data={
                         CONF_PROFILES: self._profiles,
+                        **self._settings,
                     },
                 )
 
@@ -431,6 +775,13 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
                 CONF_PROFILE_SUBTYPE: profile.get(CONF_PROFILE_SUBTYPE, DEFAULT_PROFILE_SUBTYPE),
                 CONF_VOLUME: params[CONF_VOLUME],
                 CONF_SEED: seed_default,
+                CONF_DURATION: params.get(CONF_DURATION, 0.0),
+                CONF_FADE_OUT: params.get(CONF_FADE_OUT, 0.0),
+                CONF_MODULATION: params.get(CONF_MODULATION, MODULATION_NONE),
+                CONF_MODULATION_PERIOD: params.get(
+                    CONF_MODULATION_PERIOD, DEFAULT_MODULATION_PERIOD
+                ),
+                CONF_MODULATION_DEPTH: params.get(CONF_MODULATION_DEPTH, DEFAULT_MODULATION_DEPTH),
             }
             if profile.get(CONF_PROFILE_TYPE) == "color_noise" and profile.get(CONF_PROFILE_SUBTYPE) == "custom":
                 color_defaults = _color_custom_defaults(params)
@@ -450,6 +801,19 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
                 if profile[CONF_PROFILE_NAME].casefold() == lower_name:
                     errors[CONF_PROFILE_NAME] = "duplicate"
                     break
+            if not _modulation_supported(user_input):
+                errors[CONF_MODULATION] = "modulation_needs_custom"
+            if (
+                self._action == ACTION_EDIT
+                and self._selected_index is not None
+                and _resolve_profile_type(normalize_subtype(user_input[CONF_PROFILE_SUBTYPE]))
+                == "mix"
+                and _mixes_using(
+                    self._profiles, self._profiles[self._selected_index][CONF_PROFILE_NAME]
+                )
+            ):
+                # Mixes cannot nest, so a layer of a mix cannot become one.
+                errors[CONF_PROFILE_SUBTYPE] = "layer_cannot_be_mix"
 
             if not errors:
                 subtype = normalize_subtype(user_input[CONF_PROFILE_SUBTYPE])
@@ -462,6 +826,24 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
                     else:
                         self._pending_color_defaults = _color_custom_defaults()
                     return await self.async_step_profile_custom()
+                if profile_type == "color_noise" and subtype == "eq":
+                    self._pending_profile_base = dict(user_input)
+                    if self._action == ACTION_EDIT and self._selected_index is not None:
+                        params = self._profiles[self._selected_index][CONF_PROFILE_PARAMETERS]
+                        self._pending_eq_defaults = _eq_defaults(params)
+                    else:
+                        self._pending_eq_defaults = _eq_defaults()
+                    return await self.async_step_profile_eq()
+                if profile_type == "mix":
+                    self._pending_profile_base = dict(user_input)
+                    self._pending_mix_layers = ""
+                    if self._action == ACTION_EDIT and self._selected_index is not None:
+                        params = self._profiles[self._selected_index][CONF_PROFILE_PARAMETERS]
+                        self._pending_mix_layers = "\n".join(
+                            f"{layer[CONF_MIX_PROFILE]}, {layer[CONF_MIX_GAIN]:g}"
+                            for layer in params.get(CONF_MIX_LAYERS, [])
+                        )
+                    return await self.async_step_profile_mix()
                 if profile_type == "tonal_noise" and subtype == TONAL_CUSTOM:
                     self._pending_profile_base = dict(user_input)
                     if self._action == ACTION_EDIT and self._selected_index is not None:
@@ -471,66 +853,182 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
                         self._pending_tonal_defaults = _tonal_defaults()
                     return await self.async_step_profile_tonal()
                 profile = _profile_from_user_input(user_input)
-                if self._action == ACTION_EDIT and self._selected_index is not None:
-                    self._profiles[self._selected_index] = profile
-                else:
-                    self._profiles.append(profile)
+                self._store_profile(profile)
                 return await self.async_step_action()
 
         return self.async_show_form(
             step_id="profile",
-            data_schema=_profile_schema(defaults),
+            data_schema=_profile_schema(defaults, include_mix=True),
             errors=errors,
         )
 
     async def async_step_profile_custom(self, user_input: Mapping[str, Any] | None = None):
         errors: dict[str, str] = {}
+        preview = ""
 
         if not self._pending_profile_base:
             return await self.async_step_profile()
 
         if user_input is not None:
+            user_input = dict(user_input)
             merged = {**self._pending_profile_base, **user_input}
             profile = _profile_from_user_input(merged)
-            if self._action == ACTION_EDIT and self._selected_index is not None:
-                self._profiles[self._selected_index] = profile
+            if user_input.pop(CONF_PREVIEW, False):
+                self._pending_color_defaults = _color_custom_defaults(user_input)
+                preview = await self._async_preview(profile)
             else:
-                self._profiles.append(profile)
-            self._pending_profile_base = None
-            self._pending_color_defaults = None
-            return await self.async_step_action()
+                self._store_profile(profile)
+                self._pending_profile_base = None
+                self._pending_color_defaults = None
+                return await self.async_step_action()
 
         return self.async_show_form(
             step_id="profile_custom",
-            data_schema=_color_custom_schema(self._pending_color_defaults),
+            data_schema=_color_custom_schema(self._pending_color_defaults, preview=True),
+            description_placeholders={"preview": preview},
+            errors=errors,
+        )
+
+    async def async_step_profile_eq(self, user_input: Mapping[str, Any] | None = None):
+        errors: dict[str, str] = {}
+
+        if not self._pending_profile_base:
+            return await self.async_step_profile()
+
+        if user_input is not None:
+            try:
+                bands = _parse_eq_bands(user_input.get(CONF_EQ_BANDS, ""))
+            except vol.Invalid:
+                errors[CONF_EQ_BANDS] = "invalid_eq_bands"
+                self._pending_eq_defaults = dict(user_input)
+            else:
+                merged = {**self._pending_profile_base, **user_input, CONF_EQ_BANDS: bands}
+                profile = _profile_from_user_input(merged)
+                self._store_profile(profile)
+                self._pending_profile_base = None
+                self._pending_eq_defaults = None
+                return await self.async_step_action()
+
+        return self.async_show_form(
+            step_id="profile_eq",
+            data_schema=_eq_schema(self._pending_eq_defaults),
+            errors=errors,
+        )
+
+    async def async_step_profile_mix(self, user_input: Mapping[str, Any] | None = None):
+        errors: dict[str, str] = {}
+
+        if not self._pending_profile_base:
+            return await self.async_step_profile()
+
+        # Mixes layer plain profiles only; they cannot include other mixes.
+        available = [
+            profile[CONF_PROFILE_NAME]
+            for index, profile in enumerate(self._profiles)
+            if index != self._selected_index and profile.get(CONF_PROFILE_TYPE) != "mix"
+        ]
+
+        if user_input is not None:
+            self._pending_mix_layers = user_input.get(CONF_MIX_LAYERS, "")
+            try:
+                layers = _parse_mix_layers(self._pending_mix_layers, available)
+            except vol.Invalid:
+                errors[CONF_MIX_LAYERS] = "invalid_mix_layers"
+            else:
+                merged = {**self._pending_profile_base, CONF_MIX_LAYERS: layers}
+                profile = _profile_from_user_input(merged)
+                self._store_profile(profile)
+                self._pending_profile_base = None
+                self._pending_mix_layers = ""
+                return await self.async_step_action()
+
+        return self.async_show_form(
+            step_id="profile_mix",
+            data_schema=_mix_schema(self._pending_mix_layers, available),
+            description_placeholders={"profiles": ", ".join(available) or "-"},
             errors=errors,
         )
 
     async def async_step_profile_tonal(self, user_input: Mapping[str, Any] | None = None):
         errors: dict[str, str] = {}
+        preview = ""
 
         if not self._pending_profile_base:
             return await self.async_step_profile()
 
         if user_input is not None:
+            user_input = dict(user_input)
             merged = {**self._pending_profile_base, **user_input}
             profile = _profile_from_user_input(merged)
-            if self._action == ACTION_EDIT and self._selected_index is not None:
-                self._profiles[self._selected_index] = profile
+            if user_input.pop(CONF_PREVIEW, False):
+                self._pending_tonal_defaults = _tonal_defaults(user_input)
+                preview = await self._async_preview(profile)
             else:
-                self._profiles.append(profile)
-            self._pending_profile_base = None
-            self._pending_tonal_defaults = None
-            return await self.async_step_action()
+                self._store_profile(profile)
+                self._pending_profile_base = None
+                self._pending_tonal_defaults = None
+                return await self.async_step_action()
 
         return self.async_show_form(
             step_id="profile_tonal",
-            data_schema=_tonal_params_schema(self._pending_tonal_defaults),
+            data_schema=_tonal_params_schema(self._pending_tonal_defaults, preview=True),
+            description_placeholders={"preview": preview},
+            errors=errors,
+        )
+
+    def _store_profile(self, profile: dict[str, Any]) -> None:
+        """Add the profile, or replace the one being edited.
+
+        Mixes refer to their layers by name, so renaming a profile renames
+        it in every mix too.
+        """
+
+        if self._action != ACTION_EDIT or self._selected_index is None:
+            self._profiles.append(profile)
+            return
+        old_name = self._profiles[self._selected_index][CONF_PROFILE_NAME]
+        self._profiles[self._selected_index] = profile
+        if old_name == profile[CONF_PROFILE_NAME]:
+            return
+        for mix in self._profiles:
+            if mix.get(CONF_PROFILE_TYPE) != "mix":
+                continue
+            for layer in mix[CONF_PROFILE_PARAMETERS].get(CONF_MIX_LAYERS, []):
+                if layer[CONF_MIX_PROFILE].casefold() == old_name.casefold():
+                    layer[CONF_MIX_PROFILE] = profile[CONF_PROFILE_NAME]
+
+    async def _async_preview(self, profile: dict[str, Any]) -> str:
+        """Render ``profile`` and return a Markdown link to the preview."""
+
+        previews = self.hass.data.get(DOMAIN, {}).get("previews")
+        if previews is None:
+            return ""
+        url = await previews.async_preview_url(self.hass, profile)
+        return f"[▶ Play a {PREVIEW_DURATION:g}-second preview]({url})"
+
+    async def async_step_settings(self, user_input: Mapping[str, Any] | None = None):
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            # A cleared CPU list is left out of the input, so default it here.
+            cpus = str(user_input.get(CONF_WORKER_CPUS) or "").strip()
+            try:
+                parse_cpu_list(cpus)
+            except ValueError:
+                errors[CONF_WORKER_CPUS] = "invalid_cpus"
+            else:
+                self._settings.update({**user_input, CONF_WORKER_CPUS: cpus})
+                return await self.async_step_action()
+
+        return self.async_show_form(
+            step_id="settings",
+            data_schema=_settings_schema({**self._settings, **(user_input or {})}),
             errors=errors,
         )
 
     async def async_step_select_profile(self, user_input: Mapping[str, Any] | None = None):
         errors: dict[str, str] = {}
+        placeholders = {"mixes": ""}
         options: list[dict[str, str]] = []
         for idx, profile in enumerate(self._profiles):
             name = profile.get(CONF_PROFILE_NAME) or f"Profile {idx + 1}"
@@ -546,11 +1044,17 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
             except (TypeError, ValueError):
                 errors["base"] = "unknown"
             else:
-                if self._action == ACTION_REMOVE:
+                if self._action != ACTION_REMOVE:
+                    return await self.async_step_profile()
+                mixes = _mixes_using(
+                    self._profiles, self._profiles[self._selected_index][CONF_PROFILE_NAME]
+                )
+                if not mixes:
                     self._profiles.pop(self._selected_index)
                     self._selected_index = None
                     return await self.async_step_action()
-                return await self.async_step_profile()
+                errors[CONF_PROFILE_NAME] = "profile_in_use"
+                placeholders["mixes"] = ", ".join(mixes)
 
         return self.async_show_form(
             step_id="select_profile",
@@ -561,5 +1065,6 @@ class NoiseGeneratorOptionsFlowHandler(config_entries.OptionsFlow):
                     )
                 }
             ),
+            description_placeholders=placeholders,
             errors=errors,
         )
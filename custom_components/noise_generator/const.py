@@ -12,10 +12,26 @@ CONF_PROFILE_PARAMETERS = "parameters"
 
 CONF_VOLUME = "volume"
 CONF_SEED = "seed"
+CONF_DURATION = "duration"
+CONF_FADE_OUT = "fade_out"
+CONF_OFFSET = "offset"
+CONF_VERSION = "v"
 CONF_CUSTOM_SLOPE = "Custom slope"
 CONF_CUSTOM_LOW_CUTOFF = "Custom low cutoff"
 CONF_CUSTOM_HIGH_CUTOFF = "Custom high cutoff"
 
+CONF_EQ_BASE = "eq_base"
+CONF_EQ_BANDS = "eq_bands"
+CONF_EQ_TYPE = "type"
+CONF_EQ_FREQUENCY = "frequency"
+CONF_EQ_GAIN = "gain"
+CONF_EQ_Q = "q"
+
+CONF_MIX_LAYERS = "layers"
+CONF_MIX_PROFILE = "profile"
+CONF_MIX_GAIN = "gain"
+CONF_MIX_DEFINITION = "definition"
+
 CONF_TONAL_WAVEFORM = "tonal_waveform"
 CONF_TONAL_BASE_FREQUENCY = "tonal_base_frequency"
 CONF_TONAL_SECONDARY_RATIO = "tonal_secondary_ratio"
@@ -25,6 +41,24 @@ CONF_TONAL_ATTACK = "tonal_attack"
 CONF_TONAL_DECAY = "tonal_decay"
 
 CONF_ACTION = "action"
+CONF_MAX_WORKERS = "max_workers"
+CONF_MAX_WORKERS_PER_PROFILE = "max_workers_per_profile"
+CONF_SPLICE_RELAY = "splice_relay"
+CONF_WORKER_NICE = "worker_nice"
+CONF_WORKER_CPUS = "worker_cpus"
+CONF_ALARM_NORMAL_PRIORITY = "alarm_normal_priority"
+CONF_PREVIEW = "preview"
+CONF_MODULATION = "modulation"
+CONF_MODULATION_PERIOD = "modulation_period"
+CONF_MODULATION_DEPTH = "modulation_depth"
+
+ATTR_PROFILE = "profile"
+ATTR_CUSTOM_SLOPE = "custom_slope"
+ATTR_CUSTOM_LOW_CUTOFF = "custom_low_cutoff"
+ATTR_CUSTOM_HIGH_CUTOFF = "custom_high_cutoff"
+ATTR_FILTER_ORDER = "filter_order"
+
+SERVICE_SET_PARAMETERS = "set_parameters"
 
 DEFAULT_PROFILE_NAME = "White noise"
 DEFAULT_PROFILE_TYPE = "color_noise"
@@ -36,11 +70,64 @@ DEFAULT_CUSTOM_HIGH_CUTOFF = 16000.0
 CUSTOM_SLOPE_MIN = -12.0
 CUSTOM_SLOPE_MAX = 12.0
 CUSTOM_LOW_CUTOFF_MIN = 1.0
+FILTER_ORDER_MIN = 1
+FILTER_ORDER_MAX = 8
+DURATION_MAX = 86400.0
+FADE_OUT_MAX = 3600.0
 TONAL_WAVEFORMS = ["sine", "triangle", "square", "saw"]
 
+EQ_BAND_PEAK = "peak"
+EQ_BAND_LOW_SHELF = "low_shelf"
+EQ_BAND_HIGH_SHELF = "high_shelf"
+EQ_BAND_NOTCH = "notch"
+EQ_BAND_TYPES = [EQ_BAND_PEAK, EQ_BAND_LOW_SHELF, EQ_BAND_HIGH_SHELF, EQ_BAND_NOTCH]
+EQ_MAX_BANDS = 8
+EQ_BASE_SUBTYPES = ["white", "pink", "brown"]
+DEFAULT_EQ_BASE = "pink"
+EQ_FREQUENCY_MIN = 20.0
+EQ_GAIN_MIN = -24.0
+EQ_GAIN_MAX = 24.0
+EQ_Q_MIN = 0.1
+EQ_Q_MAX = 30.0
+DEFAULT_EQ_Q = 1.0
+MIX_MAX_LAYERS = 4
+MIX_LIMITER_KNEE = 0.8
+
+MODULATION_NONE = "none"
+MODULATION_WAVES = "waves"
+MODULATION_CUTOFF_DRIFT = "cutoff_drift"
+MODULATION_SLOPE_DRIFT = "slope_drift"
+MODULATION_PRESETS = [
+    MODULATION_NONE,
+    MODULATION_WAVES,
+    MODULATION_CUTOFF_DRIFT,
+    MODULATION_SLOPE_DRIFT,
+]
+# Presets that move the custom colour's filter, so only custom noise has them.
+MODULATION_FILTER_PRESETS = [MODULATION_CUTOFF_DRIFT, MODULATION_SLOPE_DRIFT]
+MODULATION_DISPLAY_LABELS = {
+    MODULATION_NONE: "None",
+    MODULATION_WAVES: "Ocean waves (volume swells)",
+    MODULATION_CUTOFF_DRIFT: "Cutoff drift (custom colored noise)",
+    MODULATION_SLOPE_DRIFT: "Slope drift (custom colored noise)",
+}
+DEFAULT_MODULATION_PERIOD = 10.0
+MODULATION_PERIOD_MIN = 2.0
+MODULATION_PERIOD_MAX = 600.0
+DEFAULT_MODULATION_DEPTH = 0.5
+# Modulators are evaluated once per interval and interpolated in between.
+MODULATION_CONTROL_INTERVAL = 1024
+# Full depth moves the cutoffs by this many octaves and the slope by this
+# many dB/oct either way; steps are coarse so filter designs stay cached.
+MODULATION_CUTOFF_OCTAVES = 2.0
+MODULATION_CUTOFF_STEP = 1 / 12
+MODULATION_SLOPE_RANGE = 3.0
+MODULATION_SLOPE_STEP = 0.25
+
 PROFILE_TYPES = [
     "color_noise",
     "tonal_noise",
+    "mix",
 ]
 
 COLOR_NOISE_SUBTYPES = [
@@ -48,8 +135,12 @@ COLOR_NOISE_SUBTYPES = [
     "pink",
     "brown",
     "custom",
+    "eq",
 ]
 
+MIX_SUBTYPE = "mix"
+MIX_SUBTYPES = [MIX_SUBTYPE]
+
 TONAL_CUSTOM = "custom_tonal"
 
 TONAL_PRESET_PARAMETERS = {
@@ -166,10 +257,13 @@ COLOR_DISPLAY_LABELS = {
     "pink": "Pink noise",
     "brown": "Brown noise",
     "custom": "Custom colored noise",
+    "eq": "Parametric EQ noise",
 }
 
 TONAL_DISPLAY_LABELS = {**TONAL_PRESET_LABELS, TONAL_CUSTOM: "Custom tonal sound"}
 
+MIX_DISPLAY_LABELS = {MIX_SUBTYPE: "Layered mix"}
+
 
 def normalize_subtype(value: str) -> str:
     """Return canonical subtype from UI label or raw value."""
@@ -177,13 +271,17 @@ def normalize_subtype(value: str) -> str:
     if not isinstance(value, str):
         return value
     candidate = value.strip()
-    if candidate in COLOR_NOISE_SUBTYPES or candidate in TONAL_SUBTYPES:
+    if candidate in (*COLOR_NOISE_SUBTYPES, *TONAL_SUBTYPES, *MIX_SUBTYPES):
         return candidate
     # If label contains category separator, take the part after it
     if "·" in candidate:
         candidate = candidate.split("·", 1)[-1].strip()
     lower = candidate.lower()
-    for key, label in {**COLOR_DISPLAY_LABELS, **TONAL_DISPLAY_LABELS}.items():
+    for key, label in {
+        **COLOR_DISPLAY_LABELS,
+        **TONAL_DISPLAY_LABELS,
+        **MIX_DISPLAY_LABELS,
+    }.items():
         if lower == label.lower():
             return key
     return candidate
@@ -191,12 +289,93 @@ def normalize_subtype(value: str) -> str:
 MEDIA_MIME_TYPE = "audio/wav"
 SAMPLE_RATE = 44100
 STREAM_CHUNK_DURATION = 0.5
+STREAM_START_CHUNK_DURATION = 0.02
+STREAM_CHUNK_GROWTH = 2.0
 STREAM_URL_PATH = f"/api/{DOMAIN}"
 STDOUT_READ_SIZE = 32768
+SPLICE_CHUNK_SIZE = 262144
+STREAM_CACHE_MAX_AGE = 86400
+WAV_HEADER_SIZE = 44
+PARAMETER_RAMP_DURATION = 0.05
+SPECTRAL_BLOCK_SIZE = 4096
+# Finer bins for EQ noise, so narrow bands down to about 20 Hz keep their shape.
+EQ_SPECTRAL_BLOCK_SIZE = 16384
+SPECTRAL_OUTPUT_RMS = 0.2
+SPECTRAL_RESPONSE_CACHE_SIZE = 16
+SEEK_WARMUP_SAMPLES = 16384
+STREAM_ENGINE_VERSION = 4
+RENDER_SEGMENT_DURATION = 60.0
+RENDER_BIT_DEPTHS = (16, 24)
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_WORKERS_PER_PROFILE = 4
+MAX_WORKERS_LIMIT = 64
+DEFAULT_WORKER_NICE = 0
+WORKER_NICE_MAX = 19
+ADMISSION_QUEUE_TIMEOUT = 3.0
+ADMISSION_RETRY_AFTER = 5
+# An ambient GET must stay connected this long after the WAV header, and
+# have received it, before a worker starts; cast devices often open and drop
+# the stream once to probe it. Clients that never take the header give up.
+STREAM_PROBE_WINDOW = 0.5
+STREAM_PROBE_TIMEOUT = 3.0
+STREAM_PROBE_POLL = 0.05
+
+WATCHDOG_INTERVAL = 5
+WATCHDOG_STALL_TIMEOUT = 30.0
+WATCHDOG_RATE_WINDOW = 60.0
+WATCHDOG_MIN_REALTIME_RATIO = 0.25
+WORKER_REALTIME_COST_LIMIT = 0.9
+
+# Ambient streams get cheaper, level by level, while the host is overloaded:
+# 1 renders rate-independent colours at half rate, 2 replays a recorded loop.
+DEGRADE_LEVEL_HALF_RATE = 1
+DEGRADE_LEVEL_LOOP = 2
+DEGRADE_HALF_RATE_SUBTYPES = ["white", "pink", "brown"]
+DEGRADE_LOOP_DURATION = 10.0
+DEGRADE_LOOP_CROSSFADE = 1.0
+# Load average per CPU above which the host counts as overloaded, and below
+# which it counts as calm again.
+DEGRADE_LOAD_HIGH = 1.0
+DEGRADE_LOAD_LOW = 0.6
+# Watchdog intervals of sustained overload before degrading one more level,
+# and of calm before recovering one.
+DEGRADE_OVERLOAD_TICKS = 2
+DEGRADE_RECOVERY_TICKS = 12
+
+METRICS_URL_PATH = f"{STREAM_URL_PATH}/metrics"
+METRICS_SPAWN_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+METRICS_TTFB_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+METRICS_CHUNK_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# Speakers are assumed to buffer this much audio when estimating underruns.
+METRICS_UNDERRUN_BUFFER = 2.0
+WORKER_STATS_PREFIX = "@stats "
+WORKER_STATS_INTERVAL = 5.0
+
+# A separate prefix: two segments under STREAM_URL_PATH would match the stream view.
+PREVIEW_URL_PATH = f"/api/{DOMAIN}_preview"
+PREVIEW_DURATION = 5.0
+PREVIEW_FADE_OUT = 0.05
+# Unseeded previews use this seed, so the same parameters always sound the same.
+PREVIEW_SEED = "preview"
+PREVIEW_CACHE_SIZE = 8
+
+PRIORITY_AMBIENT = "ambient"
+PRIORITY_ALARM = "alarm"
+PROFILE_TYPE_PRIORITIES = {
+    "color_noise": PRIORITY_AMBIENT,
+    "tonal_noise": PRIORITY_ALARM,
+    "mix": PRIORITY_AMBIENT,
+}
+PROFILE_CROSSFADE_DURATION = 1.0
+# Key of the precomputed filter design in the profile handed to workers.
+PROFILE_DESIGN = "design"
+COMPILED_PROFILE_CACHE_SIZE = 64
 CUSTOM_HIGH_CUTOFF_MAX = SAMPLE_RATE / 2 - 200
 
 ACTION_ADD = "add"
 ACTION_EDIT = "edit"
 ACTION_REMOVE = "remove"
 ACTION_FINISH = "finish"
+ACTION_SETTINGS = "settings"
 PROFILE_ROUTE = "profile"
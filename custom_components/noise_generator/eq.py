@@ -0,0 +1,98 @@
+"""Parametric equaliser built from cascaded biquad sections.
+
+The sections are not run sample by sample: EQ noise multiplies their
+magnitude response into a ``SpectralShaper`` response, so a whole block is
+filtered by one FFT.
+"""
+
+from __future__ import annotations
+
+import cmath
+import math
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from .const import (
+    CONF_EQ_FREQUENCY,
+    CONF_EQ_GAIN,
+    CONF_EQ_Q,
+    CONF_EQ_TYPE,
+    EQ_BAND_HIGH_SHELF,
+    EQ_BAND_LOW_SHELF,
+    EQ_BAND_NOTCH,
+    EQ_BAND_PEAK,
+    SAMPLE_RATE,
+)
+
+Coefficients = tuple[float, float, float, float, float]
+
+
+def design_biquad(
+    kind: str,
+    frequency: float,
+    gain_db: float,
+    q: float,
+    sample_rate: int = SAMPLE_RATE,
+) -> Coefficients:
+    """Return normalised ``(b0, b1, b2, a1, a2)`` using the RBJ cookbook formulas."""
+
+    amp = 10 ** (gain_db / 40)
+    w0 = 2 * math.pi * frequency / sample_rate
+    cos_w0 = math.cos(w0)
+    alpha = math.sin(w0) / (2 * q)
+
+    if kind == EQ_BAND_NOTCH:
+        b0, b1, b2 = 1.0, -2 * cos_w0, 1.0
+        a0, a1, a2 = 1 + alpha, -2 * cos_w0, 1 - alpha
+    elif kind == EQ_BAND_LOW_SHELF:
+        root = 2 * math.sqrt(amp) * alpha
+        b0 = amp * ((amp + 1) - (amp - 1) * cos_w0 + root)
+        b1 = 2 * amp * ((amp - 1) - (amp + 1) * cos_w0)
+        b2 = amp * ((amp + 1) - (amp - 1) * cos_w0 - root)
+        a0 = (amp + 1) + (amp - 1) * cos_w0 + root
+        a1 = -2 * ((amp - 1) + (amp + 1) * cos_w0)
+        a2 = (amp + 1) + (amp - 1) * cos_w0 - root
+    elif kind == EQ_BAND_HIGH_SHELF:
+        root = 2 * math.sqrt(amp) * alpha
+        b0 = amp * ((amp + 1) + (amp - 1) * cos_w0 + root)
+        b1 = -2 * amp * ((amp - 1) + (amp + 1) * cos_w0)
+        b2 = amp * ((amp + 1) + (amp - 1) * cos_w0 - root)
+        a0 = (amp + 1) - (amp - 1) * cos_w0 + root
+        a1 = 2 * ((amp - 1) - (amp + 1) * cos_w0)
+        a2 = (amp + 1) - (amp - 1) * cos_w0 - root
+    elif kind == EQ_BAND_PEAK:
+        b0, b1, b2 = 1 + alpha * amp, -2 * cos_w0, 1 - alpha * amp
+        a0, a1, a2 = 1 + alpha / amp, -2 * cos_w0, 1 - alpha / amp
+    else:
+        raise ValueError(f"Unknown EQ band type: {kind}")
+
+    return (b0 / a0, b1 / a0, b2 / a0, a1 / a0, a2 / a0)
+
+
+def design_bands(
+    bands: Iterable[Mapping[str, Any]], sample_rate: int = SAMPLE_RATE
+) -> list[Coefficients]:
+    """Design coefficients for normalised band definitions."""
+
+    return [
+        design_biquad(
+            band[CONF_EQ_TYPE],
+            float(band[CONF_EQ_FREQUENCY]),
+            float(band.get(CONF_EQ_GAIN, 0.0)),
+            float(band[CONF_EQ_Q]),
+            sample_rate,
+        )
+        for band in bands
+    ]
+
+
+def cascade_gain(
+    coefficients: Iterable[Coefficients], frequency: float, sample_rate: int = SAMPLE_RATE
+) -> float:
+    """Return the magnitude response of a biquad cascade at ``frequency``."""
+
+    z = cmath.exp(-2j * math.pi * frequency / sample_rate)
+    gain = 1.0
+    for b0, b1, b2, a1, a2 in coefficients:
+        gain *= abs((b0 + b1 * z + b2 * z * z) / (1 + a1 * z + a2 * z * z))
+    return gain
@@ -0,0 +1,172 @@
+"""Optional Numba-compiled kernels for the per-sample noise recursions.
+
+Numba is not a requirement. ``load()`` returns ``None`` when it is missing
+and the generators keep their pure Python loops. The kernels perform the
+same floating point operations in the same order, so both paths produce
+identical samples, and a generator can switch to the kernels mid-stream.
+Compiled code is cached on disk next to this module (or in
+``NUMBA_CACHE_DIR``), so only the first worker after an upgrade pays for
+compilation.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Any
+
+from .rng import _GAMMA, _MASK, _MIX1, _MIX2, _SCALE, CounterRandom
+
+_LOGGER = logging.getLogger(__name__)
+
+_LOAD_LOCK = threading.Lock()
+_LOADED = False
+_KERNELS: Kernels | None = None
+
+
+def _counter_uniform(key: Any, position: Any, constants: Any, out: Any) -> None:
+    """Fill ``out`` with ``CounterRandom.uniform(-1.0, 1.0)`` values from ``position``.
+
+    Every integer, shift counts included, comes in as uint64 so the hash
+    wraps like the ``& _MASK`` in ``CounterRandom`` instead of being
+    promoted to float.
+    """
+
+    gamma, mix1, mix2, one = constants[0], constants[1], constants[2], constants[3]
+    shift30, shift27, shift31, shift11 = constants[4], constants[5], constants[6], constants[7]
+    counter = position
+    for index in range(out.shape[0]):
+        z = key + counter * gamma
+        counter += one
+        z = (z ^ (z >> shift30)) * mix1
+        z = (z ^ (z >> shift27)) * mix2
+        out[index] = -1.0 + 2.0 * (float((z ^ (z >> shift31)) >> shift11) * _SCALE)
+
+
+def _pink(white: Any, state: Any, out: Any) -> None:
+    s0, s1, s2, s3, s4, s5, s6 = state[0], state[1], state[2], state[3], state[4], state[5], state[6]
+    for index in range(white.shape[0]):
+        w = white[index]
+        s0 = 0.99886 * s0 + w * 0.0555179
+        s1 = 0.99332 * s1 + w * 0.0750759
+        s2 = 0.96900 * s2 + w * 0.1538520
+        s3 = 0.86650 * s3 + w * 0.3104856
+        s4 = 0.55000 * s4 + w * 0.5329522
+        s5 = -0.7616 * s5 - w * 0.0168980
+        pink = (s0 + s1 + s2 + s3 + s4 + s5 + s6 + w * 0.5362) * 0.11
+        s6 = w * 0.115926
+        if pink < -1.0:
+            pink = -1.0
+        elif pink > 1.0:
+            pink = 1.0
+        out[index] = pink
+    state[0], state[1], state[2], state[3], state[4], state[5], state[6] = s0, s1, s2, s3, s4, s5, s6
+
+
+def _brown(white: Any, value: float, out: Any) -> float:
+    for index in range(white.shape[0]):
+        value += white[index] * 0.02
+        if value < -1.0:
+            value = -1.0
+        elif value > 1.0:
+            value = 1.0
+        value *= 0.98
+        out[index] = value
+    return value
+
+
+class Kernels:
+    """Compiled recursions operating on the generators' own Python state."""
+
+    def __init__(self, numba: Any, np: Any) -> None:
+        self._np = np
+        compile_kernel = numba.njit(cache=True, nogil=True)
+        self._hash_constants = np.array(
+            [_GAMMA, _MIX1, _MIX2, 1, 30, 27, 31, 11], dtype=np.uint64
+        )
+        self._counter_uniform = compile_kernel(_counter_uniform)
+        self._pink = compile_kernel(_pink)
+        self._brown = compile_kernel(_brown)
+
+    def warm_up(self) -> None:
+        """Compile (or load from the cache) every kernel for the types used.
+
+        ``njit`` compiles on the first call, so without this the render
+        thread would stall mid-stream when it first uses a kernel.
+        """
+
+        np = self._np
+        white = np.zeros(4)
+        self._counter_uniform(np.uint64(0), np.uint64(0), self._hash_constants, white)
+        self._pink(white, np.zeros(7), np.empty(4))
+        self._brown(white, 0.0, np.empty(4))
+
+    def white(self, rng: Any, count: int) -> Any:
+        """Return ``count`` values of ``rng.uniform(-1.0, 1.0)`` as an array."""
+
+        np = self._np
+        out = np.empty(count)
+        if isinstance(rng, CounterRandom):
+            self._counter_uniform(
+                np.uint64(rng.key), np.uint64(rng.position & _MASK), self._hash_constants, out
+            )
+            rng.position += count
+        else:
+            uniform = rng.uniform
+            out[:] = [uniform(-1.0, 1.0) for _ in range(count)]
+        return out
+
+    def pink(self, rng: Any, count: int, state: list[float]) -> list[float]:
+        """Render pink noise, updating the seven filter states in ``state``."""
+
+        np = self._np
+        packed = np.array(state)
+        out = np.empty(count)
+        self._pink(self.white(rng, count), packed, out)
+        state[:] = packed.tolist()
+        return out.tolist()
+
+    def brown(self, rng: Any, count: int, value: float) -> tuple[list[float], float]:
+        """Render brown noise from ``value``; return the samples and the new value."""
+
+        out = self._np.empty(count)
+        value = self._brown(self.white(rng, count), value, out)
+        return out.tolist(), value
+
+
+def current() -> Kernels | None:
+    """Return the kernels if ``load()`` has finished, without blocking."""
+
+    return _KERNELS
+
+
+def load() -> Kernels | None:
+    """Load the compiled kernels; return ``None`` when Numba is not installed.
+
+    Importing Numba takes a few hundred milliseconds, so it is deferred to
+    here: Home Assistant itself never pays for it, and a streaming worker
+    calls this from a background thread once its first chunk is out. The
+    kernels are compiled before they are published, so rendering never waits
+    for the compiler. Setting ``NUMBA_DISABLE_JIT=1`` keeps the Python loops.
+    """
+
+    global _KERNELS, _LOADED
+    with _LOAD_LOCK:
+        if _LOADED:
+            return _KERNELS
+        _LOADED = True
+        if os.environ.get("NUMBA_DISABLE_JIT", "0") not in ("", "0"):
+            return None
+        try:
+            import numba
+            import numpy as np
+        except ImportError:
+            return None
+        try:
+            kernels = Kernels(numba, np)
+            kernels.warm_up()
+            _KERNELS = kernels
+        except Exception:  # pragma: no cover - broken Numba installs
+            _LOGGER.exception("Numba kernels are unavailable; using the Python loops")
+        return _KERNELS
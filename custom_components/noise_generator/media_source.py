@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from typing import Any
-from urllib.parse import quote, unquote
+from urllib.parse import parse_qsl, quote, unquote
 
 from homeassistant.components.media_source import (
     MediaSource,
@@ -78,7 +78,7 @@ class NoiseGeneratorMediaSource(MediaSource):
     async def async_resolve_media(self, item: MediaSourceItem) -> PlayMedia:
         """Return a playable media payload for the requested profile."""
 
-        slug = self._parse_slug(item.identifier or "")
+        slug, options = self._parse_identifier(item.identifier or "")
         entry = self._single_entry()
         if entry is None:
             raise MediaSourceError("Noise Generator is not configured")
@@ -88,17 +88,23 @@ class NoiseGeneratorMediaSource(MediaSource):
         if profile is None:
             raise MediaSourceError("Unknown profile")
 
-        stream_url = await manager.async_build_stream_url(profile.slug)
+        stream_url = await manager.async_build_stream_url(profile.slug, options)
         return PlayMedia(stream_url, MEDIA_MIME_TYPE)
 
     def _parse_slug(self, identifier: str) -> str:
+        return self._parse_identifier(identifier)[0]
+
+    def _parse_identifier(self, identifier: str) -> tuple[str, dict[str, str]]:
+        """Split ``slug?duration=...&fade_out=...`` into slug and stream options."""
+
+        identifier, _, query = identifier.partition("?")
         identifier = identifier.strip("/")
         domain_prefix = f"{self.domain}/"
         if identifier.startswith(domain_prefix):
             identifier = identifier[len(domain_prefix) :]
         if not identifier:
             raise MediaSourceError("Profile identifier missing")
-        return unquote(identifier)
+        return unquote(identifier), dict(parse_qsl(query))
 
     def _build_identifier(self, slug: str) -> str:
         return quote(slug)
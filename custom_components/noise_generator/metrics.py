@@ -0,0 +1,163 @@
+"""Prometheus text-format metrics for the noise streams."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable
+
+from .const import (
+    METRICS_CHUNK_BUCKETS,
+    METRICS_SPAWN_BUCKETS,
+    METRICS_TTFB_BUCKETS,
+)
+
+PROFILE_LABELS = ("type", "subtype")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """A monotonically increasing value per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: tuple[str, ...] = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        labels: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._bounds = tuple(sorted(buckets))
+        # Per label set: one count per bucket plus +Inf, then the sum.
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self._bounds) + 1), [0.0])
+        counts, total = entry
+        counts[bisect_left(self._bounds, value)] += 1
+        total[0] += value
+
+    def samples(self) -> Iterable[str]:
+        bucket_labels = (*self.labels, "le")
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip((*self._bounds, float("inf")), counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket"
+                    f"{_format_labels(bucket_labels, (*labels, _format_value(bound)))} "
+                    f"{cumulative}"
+                )
+            rendered = _format_labels(self.labels, labels)
+            yield f"{self.name}_sum{rendered} {_format_value(total[0])}"
+            yield f"{self.name}_count{rendered} {cumulative}"
+
+
+class NoiseMetrics:
+    """Counters and histograms shared by every stream manager of the instance."""
+
+    def __init__(self) -> None:
+        self.streams_started = Counter(
+            "noise_generator_streams_started_total",
+            "Streams whose response started.",
+            PROFILE_LABELS,
+        )
+        self.streams_ended = Counter(
+            "noise_generator_streams_ended_total",
+            "Streams that ended, for any reason.",
+            PROFILE_LABELS,
+        )
+        self.worker_spawns = Counter(
+            "noise_generator_worker_spawns_total",
+            "Worker processes started.",
+            PROFILE_LABELS,
+        )
+        self.worker_spawn_failures = Counter(
+            "noise_generator_worker_spawn_failures_total",
+            "Worker processes that failed to start.",
+            PROFILE_LABELS,
+        )
+        self.probes = Counter(
+            "noise_generator_probes_total",
+            "HEAD requests and GETs closed before a worker was started.",
+            PROFILE_LABELS,
+        )
+        self.bytes_served = Counter(
+            "noise_generator_served_bytes_total",
+            "Bytes of WAV data written to clients.",
+            PROFILE_LABELS,
+        )
+        self.underruns = Counter(
+            "noise_generator_underruns_total",
+            "Times a client buffer would have run dry, estimated from delivery timing.",
+            PROFILE_LABELS,
+        )
+        self.spawn_latency = Histogram(
+            "noise_generator_spawn_latency_seconds",
+            "Time to start a worker process.",
+            METRICS_SPAWN_BUCKETS,
+            PROFILE_LABELS,
+        )
+        self.time_to_first_byte = Histogram(
+            "noise_generator_time_to_first_byte_seconds",
+            "Time from the request to the first audio after the WAV header.",
+            METRICS_TTFB_BUCKETS,
+            PROFILE_LABELS,
+        )
+        self.chunk_generation = Histogram(
+            "noise_generator_chunk_generation_seconds",
+            "Time a worker spends synthesising one chunk.",
+            METRICS_CHUNK_BUCKETS,
+            PROFILE_LABELS,
+        )
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+
+        lines: list[str] = []
+        for metric in vars(self).values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,155 @@
+"""Slow control-rate modulation for evolving soundscapes."""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Any
+
+from .const import (
+    CONF_MODULATION,
+    CONF_MODULATION_DEPTH,
+    CONF_MODULATION_PERIOD,
+    CUSTOM_HIGH_CUTOFF_MAX,
+    CUSTOM_LOW_CUTOFF_MIN,
+    CUSTOM_SLOPE_MAX,
+    CUSTOM_SLOPE_MIN,
+    DEFAULT_MODULATION_DEPTH,
+    DEFAULT_MODULATION_PERIOD,
+    MODULATION_CONTROL_INTERVAL,
+    MODULATION_CUTOFF_DRIFT,
+    MODULATION_CUTOFF_OCTAVES,
+    MODULATION_CUTOFF_STEP,
+    MODULATION_FILTER_PRESETS,
+    MODULATION_NONE,
+    MODULATION_PERIOD_MAX,
+    MODULATION_PERIOD_MIN,
+    MODULATION_PRESETS,
+    MODULATION_SLOPE_RANGE,
+    MODULATION_SLOPE_STEP,
+    MODULATION_WAVES,
+    SAMPLE_RATE,
+)
+from .rng import CounterRandom
+
+_TAU = 2 * math.pi
+# Irrational ratio between the two swells, so the pattern never repeats exactly.
+_GOLDEN = (1 + math.sqrt(5)) / 2
+
+
+def _clamp(value: float, minimum: float, maximum: float) -> float:
+    return max(minimum, min(value, maximum))
+
+
+class Modulation:
+    """A slow parameter source evaluated at a low control rate.
+
+    The value at any sample is computed directly from the sample position, so
+    seeking costs nothing and a seeded stream modulates identically every
+    time. Volume swells are interpolated linearly between control points;
+    filter drifts are sampled once per spectral block and the shaper's
+    overlap-add blends consecutive designs.
+    """
+
+    def __init__(self, preset: str, period: float, depth: float, seed: Any | None) -> None:
+        self.preset = preset
+        period = _clamp(period, MODULATION_PERIOD_MIN, MODULATION_PERIOD_MAX)
+        self.period = int(period * SAMPLE_RATE)
+        self.depth = _clamp(depth, 0.0, 1.0)
+        self.position = 0
+        # Drifts wander between random knots one period apart.
+        self._rng = CounterRandom(random.random() if seed is None else f"{seed}:modulation")
+        self._knots: dict[int, float] = {}
+
+    @property
+    def filter(self) -> bool:
+        """Whether the modulation moves the custom colour's filter."""
+
+        return self.preset in MODULATION_FILTER_PRESETS
+
+    def seek(self, position: int) -> None:
+        self.position = position
+
+    def value(self, position: int) -> float:
+        """Return the modulator at sample ``position``, between -1 and 1."""
+
+        if self.preset == MODULATION_WAVES:
+            cycles = position / self.period
+            return 0.7 * math.sin(_TAU * cycles) + 0.3 * math.sin(_TAU * cycles / _GOLDEN + 1.3)
+        index, offset = divmod(position, self.period)
+        # Cosine interpolation keeps the drift smooth at every knot.
+        weight = (1 - math.cos(math.pi * offset / self.period)) / 2
+        return self._knot(index) * (1 - weight) + self._knot(index + 1) * weight
+
+    def _knot(self, index: int) -> float:
+        knot = self._knots.get(index)
+        if knot is None:
+            if len(self._knots) > 8:
+                self._knots.clear()
+            self._rng.seek(index)
+            knot = self._knots[index] = 2 * self._rng.random() - 1
+        return knot
+
+    def _gain(self, position: int) -> float:
+        return 1 - self.depth * (1 - self.value(position)) / 2
+
+    def apply_gain(self, samples: list[float]) -> list[float]:
+        """Scale the next samples by the volume swell, advancing the position.
+
+        The gain swings between ``1 - depth`` and 1 and is interpolated
+        linearly between control points.
+        """
+
+        interval = MODULATION_CONTROL_INTERVAL
+        position = self.position
+        end = position + len(samples)
+        self.position = end
+        scaled: list[float] = []
+        index = 0
+        while position < end:
+            point = position - position % interval
+            stop = min(end, point + interval)
+            start = self._gain(point)
+            step = (self._gain(point + interval) - start) / interval
+            count = stop - position
+            ramp = [start + step * (offset + position - point) for offset in range(count)]
+            scaled.extend(map(float.__mul__, samples[index : index + count], ramp))
+            index += count
+            position = stop
+        return scaled
+
+    def design(
+        self, base: tuple[float, float, float, int], position: int
+    ) -> tuple[float, float, float, int]:
+        """Return the custom colour design ``base`` moved to sample ``position``.
+
+        Offsets are rounded to coarse steps so consecutive blocks mostly reuse
+        a cached response instead of designing a new one.
+        """
+
+        slope, low, high, order = base
+        offset = self.value(position) * self.depth
+        if self.preset == MODULATION_CUTOFF_DRIFT:
+            steps = round(offset * MODULATION_CUTOFF_OCTAVES / MODULATION_CUTOFF_STEP)
+            factor = 2.0 ** (steps * MODULATION_CUTOFF_STEP)
+            low = _clamp(low * factor, CUSTOM_LOW_CUTOFF_MIN, CUSTOM_HIGH_CUTOFF_MAX - 1.0)
+            high = _clamp(high * factor, low + 1.0, CUSTOM_HIGH_CUTOFF_MAX)
+        else:
+            steps = round(offset * MODULATION_SLOPE_RANGE / MODULATION_SLOPE_STEP)
+            slope += steps * MODULATION_SLOPE_STEP
+            slope = _clamp(slope, CUSTOM_SLOPE_MIN, CUSTOM_SLOPE_MAX)
+        return slope, low, high, order
+
+
+def create_modulation(params: dict[str, Any], seed: Any | None) -> Modulation | None:
+    """Build the modulation configured in profile ``params``, if any."""
+
+    preset = params.get(CONF_MODULATION)
+    if preset not in MODULATION_PRESETS or preset == MODULATION_NONE:
+        return None
+    return Modulation(
+        preset,
+        float(params.get(CONF_MODULATION_PERIOD, DEFAULT_MODULATION_PERIOD)),
+        float(params.get(CONF_MODULATION_DEPTH, DEFAULT_MODULATION_DEPTH)),
+        seed,
+    )
@@ -2,16 +2,40 @@
 
 from __future__ import annotations
 
+import cmath
+import hashlib
+import json
+import logging
 import random
 import struct
 import math
+import sys
+from array import array
+from functools import lru_cache, partial
 from typing import Any
 
 from .const import (
+    ATTR_FILTER_ORDER,
     COLOR_NOISE_SUBTYPES,
     CONF_CUSTOM_HIGH_CUTOFF,
     CONF_CUSTOM_LOW_CUTOFF,
     CONF_CUSTOM_SLOPE,
+    CONF_DURATION,
+    CONF_EQ_BANDS,
+    CONF_EQ_BASE,
+    CONF_EQ_FREQUENCY,
+    CONF_EQ_GAIN,
+    CONF_EQ_Q,
+    CONF_EQ_TYPE,
+    CONF_FADE_OUT,
+    CONF_MIX_DEFINITION,
+    CONF_MIX_GAIN,
+    CONF_MIX_LAYERS,
+    CONF_MIX_PROFILE,
+    CONF_MODULATION,
+    CONF_MODULATION_DEPTH,
+    CONF_MODULATION_PERIOD,
+    CONF_PROFILE_NAME,
     CONF_PROFILE_PARAMETERS,
     CONF_PROFILE_SUBTYPE,
     CONF_PROFILE_TYPE,
@@ -31,18 +55,72 @@ from .const import (
     DEFAULT_CUSTOM_HIGH_CUTOFF,
     DEFAULT_CUSTOM_LOW_CUTOFF,
     DEFAULT_CUSTOM_SLOPE,
+    DEFAULT_EQ_BASE,
+    DEFAULT_EQ_Q,
+    DEFAULT_MODULATION_DEPTH,
+    DEFAULT_MODULATION_PERIOD,
     DEFAULT_PROFILE_SUBTYPE,
     DEFAULT_PROFILE_TYPE,
     DEFAULT_TONAL_SUBTYPE,
     DEFAULT_VOLUME,
+    DEGRADE_LEVEL_HALF_RATE,
+    DEGRADE_LEVEL_LOOP,
+    DEGRADE_LOOP_CROSSFADE,
+    DEGRADE_LOOP_DURATION,
+    DURATION_MAX,
+    EQ_BAND_PEAK,
+    EQ_BAND_TYPES,
+    EQ_BASE_SUBTYPES,
+    EQ_FREQUENCY_MIN,
+    EQ_GAIN_MAX,
+    EQ_GAIN_MIN,
+    EQ_MAX_BANDS,
+    EQ_Q_MAX,
+    EQ_Q_MIN,
+    EQ_SPECTRAL_BLOCK_SIZE,
+    FADE_OUT_MAX,
+    FILTER_ORDER_MAX,
+    FILTER_ORDER_MIN,
+    MIX_LIMITER_KNEE,
+    MIX_MAX_LAYERS,
+    MIX_SUBTYPE,
+    MODULATION_FILTER_PRESETS,
+    MODULATION_NONE,
+    MODULATION_PERIOD_MAX,
+    MODULATION_PERIOD_MIN,
+    MODULATION_PRESETS,
+    PARAMETER_RAMP_DURATION,
     PROFILE_TYPES,
     SAMPLE_RATE,
+    SEEK_WARMUP_SAMPLES,
+    SPECTRAL_RESPONSE_CACHE_SIZE,
     TONAL_CUSTOM,
     TONAL_PRESET_PARAMETERS,
     TONAL_SUBTYPES,
     TONAL_WAVEFORMS,
     normalize_subtype,
 )
+from .eq import Coefficients, cascade_gain, design_bands
+from .kernels import current as current_kernels
+from .modulation import Modulation, create_modulation
+from .rng import CounterRandom
+from .spectral import SpectralShaper
+
+try:  # pragma: no cover - numpy is optional and only speeds up packing
+    import numpy as np
+except ImportError:  # pragma: no cover - pure Python fallback
+    np = None
+
+_LOGGER = logging.getLogger(__name__)
+
+# Parameters that change the custom colour's filter design.
+_CUSTOM_DESIGN_KEYS = (
+    CONF_CUSTOM_SLOPE,
+    CONF_CUSTOM_LOW_CUTOFF,
+    CONF_CUSTOM_HIGH_CUTOFF,
+    ATTR_FILTER_ORDER,
+)
+
 
 class UnknownNoiseTypeError(ValueError):
     """Error raised when an unsupported noise type is requested."""
@@ -60,20 +138,184 @@ def _normalise(value: float) -> int:
     return int(_clamp(value, -1.0, 1.0) * 32767)
 
 
-def _alpha_lowpass(cutoff_hz: float) -> float:
-    if cutoff_hz <= 0:
-        return 1.0
-    rc = 1.0 / (2 * math.pi * cutoff_hz)
-    dt = 1.0 / SAMPLE_RATE
-    return dt / (rc + dt)
+def _ramp_samples() -> int:
+    return max(1, int(PARAMETER_RAMP_DURATION * SAMPLE_RATE))
+
+
+class _Smoothed:
+    """Linearly ramp a parameter towards its target to avoid clicks."""
+
+    __slots__ = ("value", "target", "_step", "_remaining")
+
+    def __init__(self, value: float) -> None:
+        self.value = value
+        self.target = value
+        self._step = 0.0
+        self._remaining = 0
+
+    @property
+    def ramping(self) -> bool:
+        return self._remaining > 0
+
+    def set(self, target: float, samples: int = 0) -> None:
+        self.target = target
+        if samples <= 0 or target == self.value:
+            self.value = target
+            self._remaining = 0
+            return
+        self._step = (target - self.value) / samples
+        self._remaining = samples
+
+    def advance(self) -> float:
+        if self._remaining:
+            self._remaining -= 1
+            if self._remaining:
+                self.value += self._step
+            else:
+                self.value = self.target
+        return self.value
+
+
+def _render_samples(generator: Any, sample_count: int) -> list[float]:
+    """Return samples from a generator, applying its (possibly ramping) gain."""
+
+    next_sample = generator._next_sample
+    gain = generator._gain
+    if gain.ramping:
+        return [next_sample() * gain.advance() for _ in range(sample_count)]
+
+    volume = gain.value
+    return [next_sample() * volume for _ in range(sample_count)]
+
 
+def _apply_gain(samples: list[float], gain: _Smoothed) -> list[float]:
+    """Scale a rendered block by a (possibly ramping) gain."""
 
-def _alpha_highpass(cutoff_hz: float) -> float:
-    if cutoff_hz <= 0:
-        return 0.0
-    rc = 1.0 / (2 * math.pi * cutoff_hz)
-    dt = 1.0 / SAMPLE_RATE
-    return rc / (rc + dt)
+    if gain.ramping:
+        return [sample * gain.advance() for sample in samples]
+    volume = gain.value
+    return [sample * volume for sample in samples]
+
+
+def pack_samples(samples: list[float], bits_per_sample: int = 16) -> bytes:
+    """Convert float samples to little-endian 16-bit (or 24-bit) PCM."""
+
+    if bits_per_sample == 24:
+        return _pack_samples_24(samples)
+    if np is not None:
+        # Clipping, scaling and truncating towards zero match the loop below.
+        scaled = np.clip(np.array(samples, dtype=np.float64), -1.0, 1.0) * 32767
+        return scaled.astype("<i2").tobytes()
+    # Same values as ``_normalise``, inlined because this runs for every sample.
+    pcm = array(
+        "h",
+        [
+            int(sample * 32767) if -1.0 <= sample <= 1.0 else (32767 if sample > 0 else -32767)
+            for sample in samples
+        ],
+    )
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    return pcm.tobytes()
+
+
+def _pack_samples_24(samples: list[float]) -> bytes:
+    pcm = array("i", [int(_clamp(sample, -1.0, 1.0) * 8388607) for sample in samples])
+    if sys.byteorder == "big":
+        pcm.byteswap()
+    # Keep the low three bytes of every little-endian 32-bit value.
+    raw = pcm.tobytes()
+    packed = bytearray(len(samples) * 3)
+    packed[0::3] = raw[0::4]
+    packed[1::3] = raw[1::4]
+    packed[2::3] = raw[2::4]
+    return bytes(packed)
+
+
+def apply_fade_out(samples: list[float], remaining: int, fade_samples: int) -> None:
+    """Scale samples in place so the stream reaches silence as ``remaining`` hits zero.
+
+    ``remaining`` is the number of samples left in the stream at the start of
+    ``samples``; only the part inside the final ``fade_samples`` is touched.
+    """
+
+    if fade_samples <= 0:
+        return
+    start = max(0, remaining - fade_samples)
+    for index in range(start, min(len(samples), remaining)):
+        # Quadratic curve: sounds more even than a linear amplitude ramp.
+        level = (remaining - index) / fade_samples
+        samples[index] *= level * level
+
+
+def _color_gain(subtype: str, frequency: float) -> float:
+    """Return the magnitude response of a colour's recursion at ``frequency``.
+
+    It matches ``NoiseGenerator._next_sample`` applied to uniform white noise.
+    """
+
+    z = cmath.exp(-2j * math.pi * frequency / SAMPLE_RATE)
+    if subtype == "pink":
+        sections = (
+            (0.99886, 0.0555179),
+            (0.99332, 0.0750759),
+            (0.96900, 0.1538520),
+            (0.86650, 0.3104856),
+            (0.55000, 0.5329522),
+            (-0.7616, -0.0168980),
+        )
+        total = 0.5362 + 0.115926 * z + sum(gain / (1 - pole * z) for pole, gain in sections)
+        return 0.11 * abs(total)
+    if subtype == "brown":
+        return abs(0.98 * 0.02 / (1 - 0.98 * z))
+    return 1.0
+
+
+@lru_cache(maxsize=SPECTRAL_RESPONSE_CACHE_SIZE)
+def _eq_response(
+    base: str, coefficients: tuple[Coefficients, ...], size: int = EQ_SPECTRAL_BLOCK_SIZE
+) -> tuple[float, ...]:
+    """Return shaper amplitudes for ``base`` noise through an EQ cascade.
+
+    Uniform spectrum bins have a variance of 1/6 against 1/3 for uniform
+    white samples, so a scale of ``2 / sqrt(size)`` gives the same spectrum
+    (and level) as running the base recursion and the biquads in time.
+    """
+
+    scale = 2 / math.sqrt(size)
+    response = [0.0] * size
+    for k in range(1, size // 2 + 1):
+        freq = k * SAMPLE_RATE / size
+        gain = scale * _color_gain(base, freq) * cascade_gain(coefficients, freq)
+        response[k] = gain
+        response[size - k] = gain
+    return tuple(response)
+
+
+def custom_design(params: dict[str, Any]) -> tuple[float, float, float, int]:
+    """Return the clamped ``(slope, low, high, order)`` of a custom colour."""
+
+    slope = _clamp(
+        float(params.get(CONF_CUSTOM_SLOPE, DEFAULT_CUSTOM_SLOPE)),
+        CUSTOM_SLOPE_MIN,
+        CUSTOM_SLOPE_MAX,
+    )
+    low = _clamp(
+        float(params.get(CONF_CUSTOM_LOW_CUTOFF, DEFAULT_CUSTOM_LOW_CUTOFF)),
+        CUSTOM_LOW_CUTOFF_MIN,
+        CUSTOM_HIGH_CUTOFF_MAX,
+    )
+    high = _clamp(
+        float(params.get(CONF_CUSTOM_HIGH_CUTOFF, DEFAULT_CUSTOM_HIGH_CUTOFF)),
+        low + 1.0,
+        CUSTOM_HIGH_CUTOFF_MAX,
+    )
+    if high <= low:
+        high = min(max(low + 50.0, CUSTOM_LOW_CUTOFF_MIN + 1.0), CUSTOM_HIGH_CUTOFF_MAX)
+
+    order = int(params.get(ATTR_FILTER_ORDER, 4))
+    order = max(FILTER_ORDER_MIN, min(order, FILTER_ORDER_MAX))  # practical cap
+    return slope, low, high, order
 
 
 class NoiseGenerator:
@@ -86,60 +328,128 @@ class NoiseGenerator:
         seed: Any | None = None,
         *,
         custom_params: dict[str, Any] | None = None,
+        eq_params: dict[str, Any] | None = None,
+        design: dict[str, Any] | None = None,
+        modulation: Modulation | None = None,
     ) -> None:
         if noise_subtype not in COLOR_NOISE_SUBTYPES:
             raise UnknownNoiseTypeError(noise_subtype)
 
         self.noise_type = noise_subtype
         self.volume = _clamp(float(volume), 0.0, 1.0)
-        self._rng = random.Random(seed)
+        self._gain = _Smoothed(self.volume)
+        # Seeded streams draw from a counter-based source so they can seek.
+        self._rng = random.Random() if seed is None else CounterRandom(seed)
         self._brown_value = 0.0
         self._pink_state = [0.0] * 7
-        self._custom_state: dict[str, float] | None = None
+        # Unseeded white noise gains nothing from the compiled kernels because
+        # its values still come from random.Random.
+        self._compiled = self.noise_type in ("pink", "brown") or (
+            self.noise_type == "white" and seed is not None
+        )
+        self._custom_params: dict[str, Any] = {}
+        self._shaper: SpectralShaper | None = None
+        self._eq_base = DEFAULT_EQ_BASE
         if self.noise_type == "custom":
-            params = custom_params or {}
-            slope = _clamp(
-                float(params.get(CONF_CUSTOM_SLOPE, DEFAULT_CUSTOM_SLOPE)),
-                CUSTOM_SLOPE_MIN,
-                CUSTOM_SLOPE_MAX,
-            )
-            low = _clamp(
-                float(params.get(CONF_CUSTOM_LOW_CUTOFF, DEFAULT_CUSTOM_LOW_CUTOFF)),
-                CUSTOM_LOW_CUTOFF_MIN,
-                CUSTOM_HIGH_CUTOFF_MAX,
-            )
-            high = _clamp(
-                float(params.get(CONF_CUSTOM_HIGH_CUTOFF, DEFAULT_CUSTOM_HIGH_CUTOFF)),
-                low + 1.0,
-                CUSTOM_HIGH_CUTOFF_MAX,
+            self._configure_custom(custom_params or {}, (design or {}).get("custom"))
+        elif self.noise_type == "eq":
+            params = eq_params or {}
+            base = params.get(CONF_EQ_BASE, DEFAULT_EQ_BASE)
+            if base in EQ_BASE_SUBTYPES:
+                self._eq_base = base
+            coefficients = (design or {}).get("eq")
+            if coefficients is None:
+                coefficients = design_bands(params.get(CONF_EQ_BANDS, []))
+            self._shaper = SpectralShaper(
+                self._rng,
+                0.0,
+                0.0,
+                math.inf,
+                1,
+                response=self._eq_shape(coefficients),
+                size=EQ_SPECTRAL_BLOCK_SIZE,
             )
-            print(f"slope={slope}, low={low}, high={high}")
-            if high <= low:
-                high = min(max(low + 50.0, CUSTOM_LOW_CUTOFF_MIN + 1.0), CUSTOM_HIGH_CUTOFF_MAX)
-
-            order = int(params.get("filter_order", 4))
-            order = max(1, min(order, 8))  # practical cap
-
-            self._custom_state = {
-                "tilt": slope / max(abs(CUSTOM_SLOPE_MIN), CUSTOM_SLOPE_MAX),
-                "order": order,
-
-                "hp_alpha": _alpha_highpass(low),
-                "lp_alpha": _alpha_lowpass(high),
-
-                # HP state (arrays)
-                "hp_prev": [0.0] * order,
-                "hp_prev_input": [0.0] * order,
-
-                # LP state (arrays)
-                "lp_prev": [0.0] * order,
-
-                # noise shaping
-                "prev_white": 0.0,
-                "brown": 0.0,
-            }
+        # Filter drifts steer the shaper block by block; swells scale the output.
+        self._modulation: Modulation | None = None
+        if modulation is not None and modulation.filter:
+            if self.noise_type == "custom":
+                self._shaper.on_block = partial(self._modulate_filter, modulation)
+        else:
+            self._modulation = modulation
 
-            print(self._custom_state)
+    def _configure_custom(
+        self, params: dict[str, Any], design: list[Any] | None = None
+    ) -> None:
+        """Design (or redesign) the spectral shaper for the custom colour."""
+
+        merged = {**self._custom_params, **params}
+        self._custom_params = merged
+        slope, low, high, order = design or custom_design(merged)
+        self._custom_design = (slope, low, high, order)
+        _LOGGER.debug("Custom noise slope=%s low=%s high=%s order=%s", slope, low, high, order)
+
+        # Overlap-add blends consecutive blocks, so a redesigned response
+        # fades in over one hop without a separate ramp.
+        if self._shaper is None:
+            self._shaper = SpectralShaper(self._rng, slope, low, high, order)
+        else:
+            self._shaper.configure(slope, low, high, order)
+
+    def _eq_shape(self, coefficients: list[Any]) -> tuple[float, ...]:
+        return _eq_response(self._eq_base, tuple(tuple(section) for section in coefficients))
+
+    def _modulate_filter(self, modulation: Modulation, position: int) -> None:
+        """Move the custom colour's design before the block at ``position``."""
+
+        assert self._shaper is not None
+        self._shaper.configure(*modulation.design(self._custom_design, position))
+
+    @property
+    def _kernels(self) -> Any | None:
+        """The compiled kernels, once the worker has loaded them."""
+
+        return current_kernels() if self._compiled else None
+
+    def update_parameters(self, params: dict[str, Any]) -> None:
+        """Apply new parameters to the running generator with short ramps."""
+
+        ramp = _ramp_samples()
+        if CONF_VOLUME in params:
+            self.volume = _clamp(float(params[CONF_VOLUME]), 0.0, 1.0)
+            self._gain.set(self.volume, ramp)
+        if self.noise_type == "custom" and not params.keys().isdisjoint(_CUSTOM_DESIGN_KEYS):
+            self._configure_custom(params)
+        elif self.noise_type == "eq" and CONF_EQ_BANDS in params:
+            assert self._shaper is not None
+            self._shaper.set_response(self._eq_shape(design_bands(params[CONF_EQ_BANDS])))
+
+    def seek(self, position: int) -> None:
+        """Continue a seeded stream from sample ``position``.
+
+        Recursive colours restart from a short warm-up window that their
+        filters forget within quantisation error, instead of replaying the
+        whole skipped range. Unseeded streams have no position to reproduce.
+        """
+
+        if not isinstance(self._rng, CounterRandom):
+            return
+        if self._modulation is not None:
+            self._modulation.seek(position)
+        if self._shaper is not None:
+            self._shaper.seek(position)
+        elif self.noise_type == "white":
+            self._rng.seek(position)
+        else:
+            start = max(0, position - SEEK_WARMUP_SAMPLES)
+            self._brown_value = 0.0
+            self._pink_state = [0.0] * 7
+            self._rng.seek(start)
+            if self._kernels is not None:
+                self._next_block(position - start)
+                return
+            next_sample = self._next_sample
+            for _ in range(position - start):
+                next_sample()
 
     def _next_sample(self) -> float:
         if self.noise_type == "white":
@@ -171,82 +481,69 @@ class NoiseGenerator:
             self._pink_state[6] = white * 0.115926
             return _clamp(pink * 0.11, -1.0, 1.0)
 
-        if self.noise_type == "custom":
-            return self._next_custom_sample()
+        if self.noise_type in ("custom", "eq"):
+            return self._next_block(1)[0]
 
         raise UnknownNoiseTypeError(self.noise_type)
 
-    def _next_custom_sample(self) -> float:
-        assert self._custom_state is not None
-        s = self._custom_state
-
-        # ---- base noise ----
-        white = self._rng.uniform(-1.0, 1.0)
+    def next_chunk(self, sample_count: int) -> bytes:
+        """Return the next PCM chunk for the configured noise profile."""
 
-        brown = s["brown"] + white * 0.02
-        brown = _clamp(brown, -1.0, 1.0)
-        s["brown"] = brown * 0.98
+        return pack_samples(self.next_samples(sample_count))
 
-        blue = _clamp(white - s["prev_white"], -1.0, 1.0)
-        s["prev_white"] = white
+    def next_samples(self, sample_count: int) -> list[float]:
+        """Return the next float samples, volume applied."""
 
-        tilt = s["tilt"]
-        if tilt >= 0:
-            shaped = (1.0 - tilt) * white + tilt * blue
+        if self.noise_type in ("custom", "eq") or self._kernels is not None:
+            samples = _apply_gain(self._next_block(sample_count), self._gain)
         else:
-            shaped = (1.0 + tilt) * white - tilt * brown
-
-        # ---- N-pole high-pass ----
-        x = shaped
-        a = s["hp_alpha"]
-
-        for i in range(s["order"]):
-            y = a * (s["hp_prev"][i] + x - s["hp_prev_input"][i])
-            s["hp_prev"][i] = y
-            s["hp_prev_input"][i] = x
-            x = y
-
-        hp = _clamp(x, -1.5, 1.5)
-
-        # ---- N-pole low-pass ----
-        x = hp
-        a = s["lp_alpha"]
-
-        for i in range(s["order"]):
-            y = s["lp_prev"][i] + a * (x - s["lp_prev"][i])
-            s["lp_prev"][i] = y
-            x = y
-
-        return _clamp(x, -1.0, 1.0)
-
-    def next_chunk(self, sample_count: int) -> bytes:
-        """Return the next PCM chunk for the configured noise profile."""
-
-        frames = bytearray()
-        for _ in range(sample_count):
-            sample = self._next_sample() * self.volume
-            frames.extend(struct.pack("<h", _normalise(sample)))
-        return bytes(frames)
+            samples = _render_samples(self, sample_count)
+        if self._modulation is not None:
+            return self._modulation.apply_gain(samples)
+        return samples
+
+    def _next_block(self, sample_count: int) -> list[float]:
+        """Render block-based (or compiled) colours before volume is applied."""
+
+        kernels = self._kernels
+        if kernels is not None:
+            if self.noise_type == "pink":
+                return kernels.pink(self._rng, sample_count, self._pink_state)
+            if self.noise_type == "brown":
+                samples, self._brown_value = kernels.brown(
+                    self._rng, sample_count, self._brown_value
+                )
+                return samples
+            return kernels.white(self._rng, sample_count).tolist()
+        assert self._shaper is not None
+        return self._shaper.render(sample_count)
 
     def next_chunk_raw(self, sample_count: int) -> list[int]:
         out = []
         for _ in range(sample_count):
-            out.append(_normalise(self._next_sample() * self.volume))
+            out.append(_normalise(self._next_sample() * self._gain.advance()))
         return out
 
 
 
-def build_wav_header(sample_rate: int = SAMPLE_RATE) -> bytes:
-    """Return a WAV header suitable for indefinite streaming."""
+def build_wav_header(
+    sample_rate: int = SAMPLE_RATE,
+    data_size: int | None = None,
+    bits_per_sample: int = 16,
+) -> bytes:
+    """Return a WAV header for a stream of ``data_size`` bytes.
+
+    Without a size the header describes an indefinite stream.
+    """
 
     channels = 1
-    bits_per_sample = 16
     byte_rate = sample_rate * channels * bits_per_sample // 8
     block_align = channels * bits_per_sample // 8
+    riff_size = 0xFFFFFFFF if data_size is None else 36 + data_size
     return struct.pack(
         "<4sI4s4sIHHIIHH4sI",
         b"RIFF",
-        0xFFFFFFFF,
+        riff_size,
         b"WAVE",
         b"fmt ",
         16,
@@ -257,7 +554,7 @@ def build_wav_header(sample_rate: int = SAMPLE_RATE) -> bytes:
         block_align,
         bits_per_sample,
         b"data",
-        0xFFFFFFFF,
+        0xFFFFFFFF if data_size is None else data_size,
     )
 
 
@@ -281,6 +578,8 @@ def coerce_profile(raw_profile: dict[str, Any]) -> dict[str, Any]:
     if profile_type == "color_noise":
         if profile_subtype not in COLOR_NOISE_SUBTYPES:
             profile_subtype = DEFAULT_PROFILE_SUBTYPE
+    elif profile_type == "mix":
+        profile_subtype = MIX_SUBTYPE
     else:
         if profile_subtype not in TONAL_SUBTYPES:
             profile_subtype = DEFAULT_TONAL_SUBTYPE
@@ -297,6 +596,37 @@ def coerce_profile(raw_profile: dict[str, Any]) -> dict[str, Any]:
     else:
         parameters[CONF_SEED] = seed
 
+    duration = _clamp(float(parameters.get(CONF_DURATION) or 0.0), 0.0, DURATION_MAX)
+    if duration > 0:
+        parameters[CONF_DURATION] = duration
+        parameters[CONF_FADE_OUT] = _clamp(
+            float(parameters.get(CONF_FADE_OUT) or 0.0), 0.0, min(duration, FADE_OUT_MAX)
+        )
+    else:
+        parameters.pop(CONF_DURATION, None)
+        parameters.pop(CONF_FADE_OUT, None)
+
+    modulation = parameters.get(CONF_MODULATION)
+    if (
+        modulation not in MODULATION_PRESETS
+        or modulation == MODULATION_NONE
+        or (
+            modulation in MODULATION_FILTER_PRESETS
+            and (profile_type, profile_subtype) != ("color_noise", "custom")
+        )
+    ):
+        parameters.pop(CONF_MODULATION, None)
+        parameters.pop(CONF_MODULATION_PERIOD, None)
+        parameters.pop(CONF_MODULATION_DEPTH, None)
+    else:
+        period = float(parameters.get(CONF_MODULATION_PERIOD) or DEFAULT_MODULATION_PERIOD)
+        depth = parameters.get(CONF_MODULATION_DEPTH)
+        depth = DEFAULT_MODULATION_DEPTH if depth is None else float(depth)
+        parameters[CONF_MODULATION_PERIOD] = _clamp(
+            period, MODULATION_PERIOD_MIN, MODULATION_PERIOD_MAX
+        )
+        parameters[CONF_MODULATION_DEPTH] = _clamp(depth, 0.0, 1.0)
+
     if profile_type == "color_noise":
         if profile_subtype == "custom":
             slope = float(parameters.get(CONF_CUSTOM_SLOPE, DEFAULT_CUSTOM_SLOPE))
@@ -314,6 +644,15 @@ def coerce_profile(raw_profile: dict[str, Any]) -> dict[str, Any]:
             parameters.pop(CONF_CUSTOM_SLOPE, None)
             parameters.pop(CONF_CUSTOM_LOW_CUTOFF, None)
             parameters.pop(CONF_CUSTOM_HIGH_CUTOFF, None)
+        if profile_subtype == "eq":
+            base = parameters.get(CONF_EQ_BASE)
+            parameters[CONF_EQ_BASE] = base if base in EQ_BASE_SUBTYPES else DEFAULT_EQ_BASE
+            parameters[CONF_EQ_BANDS] = _coerce_eq_bands(parameters.get(CONF_EQ_BANDS))
+        else:
+            parameters.pop(CONF_EQ_BASE, None)
+            parameters.pop(CONF_EQ_BANDS, None)
+    elif profile_type == "mix":
+        parameters[CONF_MIX_LAYERS] = _coerce_mix_layers(parameters.get(CONF_MIX_LAYERS))
     else:
         fallback = TONAL_PRESET_PARAMETERS.get(profile_subtype, {})
         for key in (
@@ -337,6 +676,178 @@ def coerce_profile(raw_profile: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _coerce_eq_bands(raw_bands: Any) -> list[dict[str, Any]]:
+    """Return at most ``EQ_MAX_BANDS`` clamped band definitions."""
+
+    if not isinstance(raw_bands, list):
+        return []
+    bands: list[dict[str, Any]] = []
+    for raw in raw_bands[:EQ_MAX_BANDS]:
+        if not isinstance(raw, dict):
+            continue
+        kind = raw.get(CONF_EQ_TYPE, EQ_BAND_PEAK)
+        if kind not in EQ_BAND_TYPES:
+            continue
+        try:
+            frequency = float(raw[CONF_EQ_FREQUENCY])
+            gain = float(raw.get(CONF_EQ_GAIN, 0.0))
+            q = float(raw.get(CONF_EQ_Q, DEFAULT_EQ_Q))
+        except (KeyError, TypeError, ValueError):
+            continue
+        bands.append(
+            {
+                CONF_EQ_TYPE: kind,
+                CONF_EQ_FREQUENCY: _clamp(frequency, EQ_FREQUENCY_MIN, CUSTOM_HIGH_CUTOFF_MAX),
+                CONF_EQ_GAIN: _clamp(gain, EQ_GAIN_MIN, EQ_GAIN_MAX),
+                CONF_EQ_Q: _clamp(q, EQ_Q_MIN, EQ_Q_MAX),
+            }
+        )
+    return bands
+
+
+def _coerce_mix_layers(raw_layers: Any) -> list[dict[str, Any]]:
+    """Return at most ``MIX_MAX_LAYERS`` layers with clamped gains.
+
+    Layers name another profile; once the stream manager has resolved that
+    name, the layer also carries the referenced audio definition.
+    """
+
+    if not isinstance(raw_layers, list):
+        return []
+    layers: list[dict[str, Any]] = []
+    for raw in raw_layers[:MIX_MAX_LAYERS]:
+        if not isinstance(raw, dict) or not raw.get(CONF_MIX_PROFILE):
+            continue
+        try:
+            gain = float(raw.get(CONF_MIX_GAIN, 1.0))
+        except (TypeError, ValueError):
+            continue
+        layer: dict[str, Any] = {
+            CONF_MIX_PROFILE: str(raw[CONF_MIX_PROFILE]),
+            CONF_MIX_GAIN: _clamp(gain, 0.0, 1.0),
+        }
+        definition = raw.get(CONF_MIX_DEFINITION)
+        if isinstance(definition, dict) and definition.get(CONF_PROFILE_TYPE) != "mix":
+            layer[CONF_MIX_DEFINITION] = coerce_profile(definition)
+        layers.append(layer)
+    return layers
+
+
+def profile_digest(profile: dict[str, Any]) -> str:
+    """Return a stable content hash of a normalised profile definition.
+
+    The display name is ignored so renaming a profile keeps its hash.
+    """
+
+    payload = json.dumps(
+        {key: value for key, value in profile.items() if key != CONF_PROFILE_NAME},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+_TAU = 2 * math.pi
+# Widens the scan for samples near a waveform edge past float rounding.
+_EDGE_MARGIN = 1e-9
+
+
+def _polyblep(t: float, dt: float) -> float:
+    """Residual that band-limits a step of height 2 at phase ``t == 0``."""
+
+    if t < dt:
+        x = t / dt
+        return x + x - x * x - 1.0
+    if t > 1.0 - dt:
+        x = (t - 1.0) / dt
+        return x * x + x + x + 1.0
+    return 0.0
+
+
+def _polyblamp(t: float, dt: float) -> float:
+    """Residual that band-limits a corner (a step in slope) at phase ``t == 0``."""
+
+    if t < dt:
+        x = t / dt - 1.0
+        return -x * x * x / 3.0
+    if t > 1.0 - dt:
+        x = (t - 1.0) / dt + 1.0
+        return x * x * x / 3.0
+    return 0.0
+
+
+def _band_limit(waveform: str, t: float, dt: float) -> float:
+    """Return the correction that band-limits a naive ``waveform`` at phase ``t``.
+
+    ``dt`` is the phase step per sample. The correction is zero more than one
+    sample away from a jump (square, saw) or corner (triangle).
+    """
+
+    if waveform == "saw":
+        return -_polyblep(t, dt)
+    half = (t + 0.5) % 1.0
+    if waveform == "square":
+        return _polyblep(t, dt) - _polyblep(half, dt)
+    if waveform == "triangle":
+        return 4.0 * dt * (_polyblamp(half, dt) - _polyblamp(t, dt))
+    return 0.0
+
+
+def _oscillate(waveform: str, phases: list[float], freq: float) -> list[float]:
+    """Return band-limited ``waveform`` values for a block of phases (in cycles).
+
+    The naive waveform is computed for the whole block and PolyBLEP/PolyBLAMP
+    corrections are added only to the few samples next to an edge, so a clean
+    tone costs about as much as the naive one.
+    """
+
+    ts = [phase % 1.0 for phase in phases]
+    if waveform == "square":
+        values = [1.0 if t < 0.5 else -1.0 for t in ts]
+    elif waveform == "triangle":
+        values = [4.0 * abs(t - 0.5) - 1.0 for t in ts]
+    elif waveform == "saw":
+        values = [2.0 * (t - 0.5) for t in ts]
+    else:
+        return [math.sin(_TAU * t) for t in ts]
+
+    dt = min(freq / SAMPLE_RATE, 0.5)
+    low = dt + _EDGE_MARGIN
+    high = 1.0 - dt - _EDGE_MARGIN
+    if waveform == "saw":
+        edges = [index for index, t in enumerate(ts) if t < low or t > high]
+    else:
+        mid_low = 0.5 - low
+        mid_high = 0.5 + low
+        edges = [
+            index
+            for index, t in enumerate(ts)
+            if t < low or t > high or mid_low < t < mid_high
+        ]
+    for index in edges:
+        values[index] += _band_limit(waveform, ts[index], dt)
+    return values
+
+
+def tonal_timing(params: dict[str, Any]) -> tuple[int, int, int, int]:
+    """Return the pulse, pause, attack and decay lengths in samples."""
+
+    pulse_samples = max(
+        1, int(float(params.get(CONF_TONAL_PULSE_DURATION, 400.0)) / 1000 * SAMPLE_RATE)
+    )
+    pause_samples = max(
+        0, int(float(params.get(CONF_TONAL_PAUSE_DURATION, 300.0)) / 1000 * SAMPLE_RATE)
+    )
+    attack_samples = max(
+        1, int(float(params.get(CONF_TONAL_ATTACK, 10.0)) / 1000 * SAMPLE_RATE)
+    )
+    decay_samples = max(
+        1, int(float(params.get(CONF_TONAL_DECAY, 150.0)) / 1000 * SAMPLE_RATE)
+    )
+    return pulse_samples, pause_samples, attack_samples, decay_samples
+
+
 class TonalGenerator:
     """Generate deterministic tonal alarm-like audio."""
 
@@ -347,53 +858,91 @@ class TonalGenerator:
         seed: Any | None = None,
         *,
         params: dict[str, Any] | None = None,
+        design: dict[str, Any] | None = None,
+        modulation: Modulation | None = None,
     ) -> None:
         if subtype not in TONAL_SUBTYPES:
             raise UnknownNoiseTypeError(subtype)
 
         self.subtype = subtype
         self.volume = _clamp(float(volume), 0.0, 1.0)
+        self._gain = _Smoothed(self.volume)
         self._rng = random.Random(seed)
         merged = dict(TONAL_PRESET_PARAMETERS.get(subtype, {}))
         if params:
             merged.update(params)
-
+        self._params = merged
+        self._pending_waveform: str | None = None
+        self._freq = _Smoothed(0.0)
+        self._position = 0
+        self._phase = 0.0
+        self._secondary_phase = 0.0
+        # Phases are origin + count * step, rebased whenever the step changes,
+        # so the phase at any sample can also be computed directly (see seek).
+        self._phase_origin = (0.0, 0.0)
+        self._phase_key: tuple[float, float] | None = None
+        self._pulse_count = 0
+        # Tones have no filter to drift, so only volume swells apply.
+        self._modulation = None if modulation is None or modulation.filter else modulation
+        self._configure(merged, timing=(design or {}).get("tonal"))
+
+    def _configure(
+        self,
+        merged: dict[str, Any],
+        ramp_samples: int = 0,
+        timing: list[int] | None = None,
+    ) -> None:
         waveform = merged.get(CONF_TONAL_WAVEFORM, TONAL_WAVEFORMS[0])
         if waveform not in TONAL_WAVEFORMS:
             waveform = TONAL_WAVEFORMS[0]
-        self.waveform = waveform
+        if ramp_samples and waveform != self.waveform:
+            # Switching shapes mid-pulse clicks; wait for the next cycle start.
+            self._pending_waveform = waveform
+        else:
+            self.waveform = waveform
         self.base_freq = max(20.0, float(merged.get(CONF_TONAL_BASE_FREQUENCY, 880.0)))
+        self._freq.set(self.base_freq, ramp_samples)
         self.secondary_ratio = max(0.0, float(merged.get(CONF_TONAL_SECONDARY_RATIO, 0.0)))
-        self.pulse_samples = max(
-            1, int(float(merged.get(CONF_TONAL_PULSE_DURATION, 400.0)) / 1000 * SAMPLE_RATE)
-        )
-        self.pause_samples = max(
-            0, int(float(merged.get(CONF_TONAL_PAUSE_DURATION, 300.0)) / 1000 * SAMPLE_RATE)
-        )
-        self.attack_samples = max(
-            1, int(float(merged.get(CONF_TONAL_ATTACK, 10.0)) / 1000 * SAMPLE_RATE)
-        )
-        self.decay_samples = max(
-            1, int(float(merged.get(CONF_TONAL_DECAY, 150.0)) / 1000 * SAMPLE_RATE)
-        )
+        (
+            self.pulse_samples,
+            self.pause_samples,
+            self.attack_samples,
+            self.decay_samples,
+        ) = timing or tonal_timing(merged)
         self._cycle_samples = self.pulse_samples + self.pause_samples
         if self._cycle_samples <= 0:
             self._cycle_samples = self.pulse_samples
-        self._position = 0
-        self._phase = 0.0
-        self._secondary_phase = 0.0
+        self._position %= self._cycle_samples
+
+    def update_parameters(self, params: dict[str, Any]) -> None:
+        """Apply new parameters to the running generator with short ramps."""
+
+        ramp = _ramp_samples()
+        if CONF_VOLUME in params:
+            self.volume = _clamp(float(params[CONF_VOLUME]), 0.0, 1.0)
+            self._gain.set(self.volume, ramp)
+        tonal = {key: value for key, value in params.items() if key.startswith("tonal_")}
+        if tonal:
+            self._params = {**self._params, **tonal}
+            self._configure(self._params, ramp)
+
+    def seek(self, position: int) -> None:
+        """Continue from sample ``position`` of a stream started at zero."""
+
+        if self._modulation is not None:
+            self._modulation.seek(position)
+        cycles, offset = divmod(position, self._cycle_samples)
+        pulses = cycles * self.pulse_samples + min(offset, self.pulse_samples)
+        self._phase_origin = (0.0, 0.0)
+        self._phase_key = (self.base_freq, self.secondary_ratio)
+        self._pulse_count = pulses
+        self._phase = pulses * self.base_freq / SAMPLE_RATE
+        self._secondary_phase = pulses * self.base_freq * self.secondary_ratio / SAMPLE_RATE
+        self._position = offset
 
     def _osc(self, phase: float, freq: float) -> float:
-        t = phase % 1.0
-        if self.waveform == "sine":
-            return math.sin(2 * math.pi * t)
-        if self.waveform == "square":
-            return 1.0 if t < 0.5 else -1.0
-        if self.waveform == "triangle":
-            return 4.0 * abs(t - 0.5) - 1.0
-        if self.waveform == "saw":
-            return 2.0 * (t - 0.5)
-        return math.sin(2 * math.pi * t)
+        # Same arithmetic as the block path, so both render identical samples.
+        return _oscillate(self.waveform, [phase], freq)[0]
 
     def _next_sample(self) -> float:
         if self._cycle_samples <= 0:
@@ -402,16 +951,28 @@ class TonalGenerator:
         cycle_pos = self._position % self._cycle_samples
         self._position = (self._position + 1) % self._cycle_samples
 
+        if cycle_pos == 0 and self._pending_waveform is not None:
+            self.waveform = self._pending_waveform
+            self._pending_waveform = None
+
+        freq = self._freq.advance()
         if cycle_pos >= self.pulse_samples:
             return 0.0
 
-        freq = self.base_freq
-        self._phase += freq / SAMPLE_RATE
+        key = (freq, self.secondary_ratio)
+        if key != self._phase_key:
+            self._phase_origin = (self._phase, self._secondary_phase)
+            self._phase_key = key
+            self._pulse_count = 0
+        self._pulse_count += 1
+        self._phase = self._phase_origin[0] + self._pulse_count * freq / SAMPLE_RATE
         sample = self._osc(self._phase, freq)
 
         if self.secondary_ratio > 0:
             sec_freq = freq * self.secondary_ratio
-            self._secondary_phase += sec_freq / SAMPLE_RATE
+            self._secondary_phase = (
+                self._phase_origin[1] + self._pulse_count * sec_freq / SAMPLE_RATE
+            )
             sample = 0.6 * sample + 0.4 * self._osc(self._secondary_phase, sec_freq)
 
         if cycle_pos < self.attack_samples:
@@ -422,11 +983,344 @@ class TonalGenerator:
 
         return sample
 
+    def _next_run(self, limit: int) -> list[float]:
+        """Render up to ``limit`` samples without crossing a pulse or pause edge.
+
+        Only valid while the frequency is not ramping. The arithmetic matches
+        ``_next_sample`` exactly.
+        """
+
+        start = self._position
+        if start == 0 and self._pending_waveform is not None:
+            self.waveform = self._pending_waveform
+            self._pending_waveform = None
+
+        if start >= self.pulse_samples:
+            count = min(limit, self._cycle_samples - start)
+            self._position = (start + count) % self._cycle_samples
+            return [0.0] * count
+
+        count = min(limit, self.pulse_samples - start)
+        self._position = (start + count) % self._cycle_samples
+        freq = self._freq.value
+        key = (freq, self.secondary_ratio)
+        if key != self._phase_key:
+            self._phase_origin = (self._phase, self._secondary_phase)
+            self._phase_key = key
+            self._pulse_count = 0
+        pulses = range(self._pulse_count + 1, self._pulse_count + count + 1)
+        self._pulse_count += count
+
+        origin = self._phase_origin[0]
+        phases = [origin + pulse * freq / SAMPLE_RATE for pulse in pulses]
+        self._phase = phases[-1]
+        samples = _oscillate(self.waveform, phases, freq)
+
+        if self.secondary_ratio > 0:
+            sec_freq = freq * self.secondary_ratio
+            origin = self._phase_origin[1]
+            phases = [origin + pulse * sec_freq / SAMPLE_RATE for pulse in pulses]
+            self._secondary_phase = phases[-1]
+            samples = [
+                0.6 * primary + 0.4 * secondary
+                for primary, secondary in zip(
+                    samples, _oscillate(self.waveform, phases, sec_freq)
+                )
+            ]
+
+        end = start + count
+        attack = max(self.attack_samples, 1)
+        for cycle_pos in range(start, min(end, self.attack_samples)):
+            samples[cycle_pos - start] *= cycle_pos / attack
+        decay = max(self.decay_samples, 1)
+        decay_start = max(start, self.attack_samples, self.pulse_samples - self.decay_samples + 1)
+        for cycle_pos in range(decay_start, end):
+            samples[cycle_pos - start] *= (self.pulse_samples - cycle_pos) / decay
+        return samples
+
     def next_chunk(self, sample_count: int) -> bytes:
-        frames = bytearray()
-        for _ in range(sample_count):
-            frames.extend(struct.pack("<h", _normalise(self._next_sample() * self.volume)))
-        return bytes(frames)
+        return pack_samples(self.next_samples(sample_count))
+
+    def next_samples(self, sample_count: int) -> list[float]:
+        if self._freq.ramping:
+            # A frequency ramp changes the phase step on every sample.
+            samples = _render_samples(self, sample_count)
+        else:
+            samples = []
+            while len(samples) < sample_count:
+                samples.extend(self._next_run(sample_count - len(samples)))
+            samples = _apply_gain(samples, self._gain)
+        if self._modulation is not None:
+            return self._modulation.apply_gain(samples)
+        return samples
+
+
+class CrossfadeGenerator:
+    """Blend an outgoing generator into its replacement with an equal-power fade."""
+
+    def __init__(self, source: Any, target: Any, duration: float) -> None:
+        self.source = source
+        self.target = target
+        self._total = max(1, int(duration * SAMPLE_RATE))
+        self._position = 0
+
+    @property
+    def finished(self) -> bool:
+        return self._position >= self._total
+
+    def update_parameters(self, params: dict[str, Any]) -> None:
+        self.target.update_parameters(params)
+
+    def next_samples(self, sample_count: int) -> list[float]:
+        samples = self.target.next_samples(sample_count)
+        span = min(sample_count, self._total - self._position)
+        if span <= 0:
+            return samples
+
+        outgoing = self.source.next_samples(span)
+        scale = math.pi / 2 / self._total
+        for index in range(span):
+            angle = (self._position + index) * scale
+            samples[index] = outgoing[index] * math.cos(angle) + samples[index] * math.sin(angle)
+        self._position += span
+        return samples
+
+    def next_chunk(self, sample_count: int) -> bytes:
+        return pack_samples(self.next_samples(sample_count))
+
+
+def _unpack_samples(data: bytes) -> list[float]:
+    """Return 16-bit little-endian PCM as float samples."""
+
+    values = array("h", data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return [value / 32767 for value in values]
+
+
+class DegradedRenderer:
+    """Render a generator more cheaply while the host is overloaded.
+
+    At ``DEGRADE_LEVEL_HALF_RATE`` colours that sound alike at any sample
+    rate (``half_rate``) are synthesised at half rate and interpolated
+    linearly. At ``DEGRADE_LEVEL_LOOP`` the output is also recorded once and
+    then replayed as a loop whose seam is an equal-power crossfade. Level 0
+    renders exactly as the generator alone would.
+    """
+
+    def __init__(self, level: int = 0, *, half_rate: bool = False) -> None:
+        self.level = 0
+        self.half_rate = half_rate
+        self._pending: list[float] = []
+        self._previous = 0.0
+        self._recorded = array("d")
+        self._loop = b""
+        self._position = 0
+        self._tail: list[float] = []
+        self._tail_total = 0
+        self.set_level(level)
+
+    def set_level(self, level: int) -> None:
+        level = max(0, min(int(level), DEGRADE_LEVEL_LOOP))
+        if level < DEGRADE_LEVEL_LOOP:
+            self._drop_loop()
+        self.level = level
+
+    def reset(self, *, half_rate: bool) -> None:
+        """Drop the recorded loop after the sound changed; a new one is recorded."""
+
+        self.half_rate = half_rate
+        self._drop_loop()
+
+    def render(self, generator: Any, sample_count: int) -> list[float]:
+        """Return the next float samples of ``generator`` at the current level."""
+
+        if self._loop:
+            return _unpack_samples(self._replay(sample_count))
+        samples = self._render_live(generator, sample_count)
+        if self.level >= DEGRADE_LEVEL_LOOP:
+            samples = self._record(samples)
+        if self._tail:
+            self._fade_from_tail(samples)
+        return samples
+
+    def render_chunk(self, generator: Any, sample_count: int) -> bytes:
+        """Return the next PCM chunk; a replayed loop is never unpacked."""
+
+        if self._loop:
+            return self._replay(sample_count)
+        if not self.level and not self._pending and not self._tail:
+            return generator.next_chunk(sample_count)
+        return pack_samples(self.render(generator, sample_count))
+
+    def _render_live(self, generator: Any, sample_count: int) -> list[float]:
+        pending = self._pending
+        needed = sample_count - len(pending)
+        if needed > 0 and self.half_rate and self.level >= DEGRADE_LEVEL_HALF_RATE:
+            previous = self._previous
+            for sample in generator.next_samples((needed + 1) // 2):
+                pending.append((previous + sample) * 0.5)
+                pending.append(sample)
+                previous = sample
+            self._previous = previous
+        elif needed > 0:
+            samples = generator.next_samples(needed)
+            if not pending:
+                self._previous = samples[-1] if samples else self._previous
+                return samples
+            pending.extend(samples)
+        self._pending = pending[sample_count:]
+        samples = pending[:sample_count]
+        if samples:
+            self._previous = samples[-1]
+        return samples
+
+    def _record(self, samples: list[float]) -> list[float]:
+        """Record live output until the loop is complete, then switch to replaying it.
+
+        Samples past the loop length are faded out against the loop's start
+        and played that way, so the first replay continues seamlessly.
+        """
+
+        length = int(DEGRADE_LOOP_DURATION * SAMPLE_RATE)
+        fade = max(1, int(DEGRADE_LOOP_CROSSFADE * SAMPLE_RATE))
+        recorded = self._recorded
+        start = len(recorded)
+        recorded.extend(samples)
+        end = min(len(recorded), length + fade)
+        scale = math.pi / 2 / fade
+        for index in range(max(start, length), end):
+            angle = (index - length) * scale
+            value = recorded[index] * math.cos(angle) + recorded[index - length] * math.sin(angle)
+            recorded[index] = value
+            samples[index - start] = value
+        if len(recorded) < length + fade:
+            return samples
+
+        self._loop = pack_samples(recorded[length:end].tolist() + recorded[fade:length].tolist())
+        self._position = fade
+        self._recorded = array("d")
+        played = end - start
+        return samples[:played] + _unpack_samples(self._replay(len(samples) - played))
+
+    def _replay(self, sample_count: int) -> bytes:
+        loop = self._loop
+        size = len(loop) // 2
+        position = self._position
+        parts = []
+        while sample_count > 0:
+            take = min(sample_count, size - position)
+            parts.append(loop[position * 2 : (position + take) * 2])
+            position = (position + take) % size
+            sample_count -= take
+        self._position = position
+        return b"".join(parts)
+
+    def _drop_loop(self) -> None:
+        if self._loop:
+            # Fade from the loop into the live generator instead of jumping.
+            self._tail = _unpack_samples(self._replay(_ramp_samples()))
+            self._tail_total = len(self._tail)
+        self._recorded = array("d")
+        self._loop = b""
+        self._position = 0
+
+    def _fade_from_tail(self, samples: list[float]) -> None:
+        tail = self._tail
+        total = self._tail_total
+        done = total - len(tail)
+        span = min(len(tail), len(samples))
+        for index in range(span):
+            weight = (done + index + 1) / total
+            samples[index] = tail[index] * (1.0 - weight) + samples[index] * weight
+        self._tail = tail[span:]
+
+
+def soft_limit(samples: list[float], knee: float = MIX_LIMITER_KNEE) -> list[float]:
+    """Pass samples below ``knee`` unchanged and squash peaks above it with tanh.
+
+    The curve is continuous in value and slope at the knee and never exceeds
+    full scale, so summed layers saturate gently instead of clipping.
+    """
+
+    headroom = 1.0 - knee
+    tanh = math.tanh
+    limited = []
+    append = limited.append
+    for sample in samples:
+        if sample > knee:
+            sample = knee + headroom * tanh((sample - knee) / headroom)
+        elif sample < -knee:
+            sample = -knee - headroom * tanh((-sample - knee) / headroom)
+        append(sample)
+    return limited
+
+
+class MixGenerator:
+    """Sum several generators block-wise with per-layer gain and a soft limiter."""
+
+    def __init__(
+        self,
+        volume: float,
+        seed: Any | None,
+        params: dict[str, Any],
+        design: dict[str, Any] | None = None,
+        modulation: Modulation | None = None,
+    ) -> None:
+        self._gain = _Smoothed(_clamp(volume, 0.0, 1.0))
+        # Layers modulate themselves; the mix itself can only swell.
+        self._modulation = None if modulation is None or modulation.filter else modulation
+        self._layers: list[tuple[Any, _Smoothed]] = []
+        layers = params.get(CONF_MIX_LAYERS) or []
+        designs = (design or {}).get("layers") or [None] * len(layers)
+        for index, (layer, layer_design) in enumerate(zip(layers, designs)):
+            definition = layer.get(CONF_MIX_DEFINITION)
+            if not definition:
+                _LOGGER.warning("Skipping unresolved mix layer %s", layer.get(CONF_MIX_PROFILE))
+                continue
+            layer_params = definition.get(CONF_PROFILE_PARAMETERS) or {}
+            layer_seed = layer_params.get(CONF_SEED)
+            if layer_seed is None and seed is not None:
+                # Derive distinct per-layer seeds so a seeded mix stays repeatable.
+                layer_seed = f"{seed}:{index}"
+            generator = create_generator(
+                definition[CONF_PROFILE_TYPE],
+                definition[CONF_PROFILE_SUBTYPE],
+                layer_params.get(CONF_VOLUME, DEFAULT_VOLUME),
+                layer_seed,
+                layer_params,
+                layer_design,
+            )
+            self._layers.append((generator, _Smoothed(float(layer.get(CONF_MIX_GAIN, 1.0)))))
+
+    def update_parameters(self, params: dict[str, Any]) -> None:
+        ramp = _ramp_samples()
+        if CONF_VOLUME in params:
+            self._gain.set(_clamp(float(params[CONF_VOLUME]), 0.0, 1.0), ramp)
+        layers = params.get(CONF_MIX_LAYERS)
+        if isinstance(layers, list) and len(layers) == len(self._layers):
+            for (_, gain), layer in zip(self._layers, layers):
+                gain.set(_clamp(float(layer.get(CONF_MIX_GAIN, 1.0)), 0.0, 1.0), ramp)
+
+    def seek(self, position: int) -> None:
+        if self._modulation is not None:
+            self._modulation.seek(position)
+        for generator, _ in self._layers:
+            generator.seek(position)
+
+    def next_samples(self, sample_count: int) -> list[float]:
+        mixed = [0.0] * sample_count
+        for generator, gain in self._layers:
+            block = _apply_gain(generator.next_samples(sample_count), gain)
+            mixed = list(map(float.__add__, mixed, block))
+        samples = _apply_gain(soft_limit(mixed), self._gain)
+        if self._modulation is not None:
+            return self._modulation.apply_gain(samples)
+        return samples
+
+    def next_chunk(self, sample_count: int) -> bytes:
+        return pack_samples(self.next_samples(sample_count))
+
 
 def create_generator(
     profile_type: str,
@@ -434,12 +1328,33 @@ def create_generator(
     volume: float,
     seed: Any | None,
     params: dict[str, Any],
+    design: dict[str, Any] | None = None,
 ) -> Any:
+    """Build the generator for a profile.
+
+    ``design`` is the precomputed filter design of a compiled profile; without
+    it the generator designs its own filters from ``params``.
+    """
+
+    modulation = create_modulation(params, seed)
     if profile_type == "color_noise":
         custom_params = params if subtype == "custom" else None
-        return NoiseGenerator(subtype, volume, seed, custom_params=custom_params)
+        eq_params = params if subtype == "eq" else None
+        return NoiseGenerator(
+            subtype,
+            volume,
+            seed,
+            custom_params=custom_params,
+            eq_params=eq_params,
+            design=design,
+            modulation=modulation,
+        )
     if profile_type == "tonal_noise":
         if subtype != TONAL_CUSTOM:
             params = TONAL_PRESET_PARAMETERS.get(subtype, {})
-        return TonalGenerator(subtype, volume, seed, params=params)
+        return TonalGenerator(
+            subtype, volume, seed, params=params, design=design, modulation=modulation
+        )
+    if profile_type == "mix":
+        return MixGenerator(volume, seed, params, design, modulation)
     raise UnknownNoiseTypeError(profile_type)
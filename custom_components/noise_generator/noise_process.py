@@ -1,16 +1,57 @@
-"""Subprocess entry-point that streams noise as WAV PCM data."""
+"""Subprocess entry-point that streams noise as WAV PCM data.
+
+With ``--output`` it renders a fixed duration to a WAV file instead, split
+into segments that a process pool renders in parallel.
+"""
 
 from __future__ import annotations
 
 import argparse
 import json
 import logging
+import math
+import os
+import queue
+import random
 import signal
 import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from typing import Any
 
-from .const import PROFILE_TYPES, SAMPLE_RATE, STREAM_CHUNK_DURATION
-from .noise import create_generator, build_wav_header
+from .const import (
+    CONF_PROFILE_PARAMETERS,
+    CONF_PROFILE_SUBTYPE,
+    CONF_PROFILE_TYPE,
+    CONF_SEED,
+    CONF_VOLUME,
+    DEFAULT_VOLUME,
+    DEGRADE_HALF_RATE_SUBTYPES,
+    PROFILE_CROSSFADE_DURATION,
+    PROFILE_DESIGN,
+    PROFILE_TYPES,
+    RENDER_BIT_DEPTHS,
+    RENDER_SEGMENT_DURATION,
+    SAMPLE_RATE,
+    STREAM_CHUNK_DURATION,
+    STREAM_CHUNK_GROWTH,
+    STREAM_START_CHUNK_DURATION,
+    WORKER_STATS_INTERVAL,
+    WORKER_STATS_PREFIX,
+)
+from .kernels import load as load_kernels
+from .noise import (
+    CrossfadeGenerator,
+    DegradedRenderer,
+    apply_fade_out,
+    build_wav_header,
+    create_generator,
+    pack_samples,
+)
+from .scheduling import apply_worker_scheduling, parse_cpu_list
 
 _STOP_REQUESTED = False
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
@@ -24,14 +65,68 @@ def _handle_signal(_: int, __) -> None:
 
 def _parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Noise generator streaming process")
-    parser.add_argument("--mode", required=True, choices=PROFILE_TYPES)
-    parser.add_argument("--subtype", required=True)
+    parser.add_argument(
+        "--profile",
+        default=None,
+        help="compiled profile JSON; replaces --mode, --subtype, --volume, --seed "
+        "and --parameters",
+    )
+    parser.add_argument("--mode", choices=PROFILE_TYPES)
+    parser.add_argument("--subtype")
     parser.add_argument("--volume", type=float, default=0.5)
     parser.add_argument("--seed", default=None)
     parser.add_argument("--sample-rate", type=int, default=SAMPLE_RATE)
     parser.add_argument("--chunk-duration", type=float, default=STREAM_CHUNK_DURATION)
+    parser.add_argument(
+        "--start-chunk-duration", type=float, default=STREAM_START_CHUNK_DURATION
+    )
     parser.add_argument("--parameters", default="{}")
-    return parser.parse_args(argv)
+    parser.add_argument("--duration", type=float, default=0.0)
+    parser.add_argument("--fade-out", type=float, default=0.0)
+    parser.add_argument("--offset", type=float, default=0.0)
+    parser.add_argument(
+        "--degrade", type=int, default=0, help="start at this degradation level"
+    )
+    parser.add_argument(
+        "--stats", action="store_true", help="report chunk render times on stderr"
+    )
+    parser.add_argument("--output", default=None, help="render to this WAV file and exit")
+    parser.add_argument("--bit-depth", type=int, default=16, choices=RENDER_BIT_DEPTHS)
+    parser.add_argument(
+        "--jobs", type=int, default=0, help="render processes for --output, 0 = one per CPU"
+    )
+    parser.add_argument("--nice", type=int, default=0, help="run at this niceness or lower")
+    parser.add_argument("--cpus", default="", help="CPU list to run on, such as 2-3")
+    args = parser.parse_args(argv)
+    args.design = None
+    if args.profile:
+        try:
+            profile = json.loads(args.profile)
+        except json.JSONDecodeError as err:
+            parser.error(f"--profile is not valid JSON: {err}")
+        parameters = profile.get(CONF_PROFILE_PARAMETERS) or {}
+        args.mode = profile.get(CONF_PROFILE_TYPE)
+        args.subtype = profile.get(CONF_PROFILE_SUBTYPE)
+        args.volume = float(parameters.get(CONF_VOLUME, DEFAULT_VOLUME))
+        args.seed = parameters.get(CONF_SEED)
+        args.parameters = parameters
+        args.design = profile.get(PROFILE_DESIGN)
+    else:
+        try:
+            args.parameters = json.loads(args.parameters)
+        except json.JSONDecodeError:
+            args.parameters = {}
+    if not args.mode or not args.subtype:
+        parser.error("--mode and --subtype are required without --profile")
+    if args.output and args.duration <= 0:
+        parser.error("--output requires a positive --duration")
+    if not all(map(math.isfinite, (args.duration, args.fade_out, args.offset))):
+        parser.error("--duration, --fade-out and --offset must be finite")
+    try:
+        args.cpus = parse_cpu_list(args.cpus)
+    except ValueError as err:
+        parser.error(str(err))
+    return args
 
 
 def _coerce_seed(seed: Any | None) -> Any | None:
@@ -43,14 +138,295 @@ def _coerce_seed(seed: Any | None) -> Any | None:
         return seed
 
 
+def _chunk_schedule(
+    sample_rate: int, start_duration: float, steady_duration: float
+) -> Iterator[int]:
+    """Yield chunk sizes that start tiny and grow towards the steady-state size.
+
+    Small leading chunks keep time-to-first-byte low, while the larger steady
+    chunks amortise the per-write overhead for long running streams.
+    """
+
+    steady = max(1, int(sample_rate * max(steady_duration, 0.05)))
+    current = max(1, int(sample_rate * max(start_duration, 0.005)))
+    while current < steady:
+        yield current
+        current = int(current * STREAM_CHUNK_GROWTH) + 1
+    while True:
+        yield steady
+
+
+class _ChunkStats:
+    """Batch chunk render times and report them on stderr for the metrics view."""
+
+    max_batch = 256
+
+    def __init__(self) -> None:
+        self._times: list[float] = []
+        self._due = time.monotonic() + WORKER_STATS_INTERVAL
+
+    def record(self, seconds: float) -> None:
+        self._times.append(seconds)
+        if len(self._times) >= self.max_batch or time.monotonic() >= self._due:
+            self.flush()
+
+    def flush(self) -> None:
+        self._due = time.monotonic() + WORKER_STATS_INTERVAL
+        if not self._times:
+            return
+        payload = json.dumps({"chunk_seconds": [round(value, 6) for value in self._times]})
+        self._times.clear()
+        try:
+            sys.stderr.write(f"{WORKER_STATS_PREFIX}{payload}\n")
+            sys.stderr.flush()
+        except OSError:
+            pass
+
+
+def _read_controls(messages: queue.Queue[dict[str, Any]]) -> None:
+    """Forward JSON control messages from stdin to the render loop."""
+
+    for line in sys.stdin.buffer:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            _LOGGER.warning("Ignoring malformed control message: %s", line[:200])
+            continue
+        if isinstance(message, dict):
+            messages.put(message)
+
+
+def _half_rate(profile_type: Any, subtype: Any) -> bool:
+    """Return True if the profile sounds alike when synthesised at half rate."""
+
+    return profile_type == "color_noise" and subtype in DEGRADE_HALF_RATE_SUBTYPES
+
+
+def _apply_controls(
+    generator: Any, messages: queue.Queue[dict[str, Any]], degraded: DegradedRenderer
+) -> Any:
+    """Apply pending control messages and return the generator to render from."""
+
+    if isinstance(generator, CrossfadeGenerator) and generator.finished:
+        generator = generator.target
+
+    while True:
+        try:
+            message = messages.get_nowait()
+        except queue.Empty:
+            return generator
+        profile = message.get("profile")
+        if isinstance(profile, dict):
+            generator = _switch_profile(
+                generator, profile, float(message.get("crossfade", PROFILE_CROSSFADE_DURATION))
+            )
+            degraded.reset(
+                half_rate=_half_rate(
+                    profile.get(CONF_PROFILE_TYPE), profile.get(CONF_PROFILE_SUBTYPE)
+                )
+            )
+        parameters = message.get("parameters")
+        if isinstance(parameters, dict):
+            _LOGGER.info("Updating parameters %s", parameters)
+            generator.update_parameters(parameters)
+            degraded.reset(half_rate=degraded.half_rate)
+        level = message.get("degrade")
+        if isinstance(level, int) and level != degraded.level:
+            _LOGGER.info("Degradation level %s", level)
+            degraded.set_level(level)
+
+
+def _switch_profile(generator: Any, profile: dict[str, Any], crossfade: float) -> Any:
+    """Crossfade from the running generator into one built from a new profile."""
+
+    parameters = profile.get(CONF_PROFILE_PARAMETERS) or {}
+    _LOGGER.info(
+        "Switching to mode=%s subtype=%s params=%s",
+        profile.get(CONF_PROFILE_TYPE),
+        profile.get(CONF_PROFILE_SUBTYPE),
+        parameters,
+    )
+    try:
+        replacement = create_generator(
+            profile.get(CONF_PROFILE_TYPE),
+            profile.get(CONF_PROFILE_SUBTYPE),
+            parameters.get(CONF_VOLUME, DEFAULT_VOLUME),
+            _coerce_seed(parameters.get(CONF_SEED)),
+            parameters,
+            profile.get(PROFILE_DESIGN),
+        )
+    except ValueError:
+        _LOGGER.exception("Ignoring invalid profile switch")
+        return generator
+    return CrossfadeGenerator(generator, replacement, crossfade)
+
+
+@dataclass(frozen=True)
+class _RenderSegment:
+    """A slice of an offline render that can be produced by any process."""
+
+    mode: str
+    subtype: str
+    volume: float
+    seed: Any
+    parameters: dict[str, Any]
+    position: int
+    count: int
+    remaining: int
+    fade_samples: int
+    chunk_samples: int
+    bits_per_sample: int
+    design: dict[str, Any] | None = None
+
+
+def _render_segment(segment: _RenderSegment) -> bytes:
+    """Render one segment from a fresh generator seeked to where it starts."""
+
+    load_kernels()
+    generator = create_generator(
+        segment.mode,
+        segment.subtype,
+        segment.volume,
+        segment.seed,
+        segment.parameters,
+        segment.design,
+    )
+    if segment.position:
+        generator.seek(segment.position)
+    data = bytearray()
+    rendered = 0
+    while rendered < segment.count:
+        count = min(segment.chunk_samples, segment.count - rendered)
+        samples = generator.next_samples(count)
+        apply_fade_out(samples, segment.remaining - rendered, segment.fade_samples)
+        data += pack_samples(samples, segment.bits_per_sample)
+        rendered += count
+    return bytes(data)
+
+
+def _render_segments(segments: Iterable[_RenderSegment], jobs: int) -> Iterator[bytes]:
+    """Yield rendered segments in order, keeping at most ``2 * jobs`` in flight."""
+
+    if jobs <= 1:
+        for segment in segments:
+            yield _render_segment(segment)
+        return
+
+    # Imported here: streaming workers never need a pool, and the import
+    # would add to every stream's start-up time.
+    from concurrent.futures import Future, ProcessPoolExecutor
+
+    pool = ProcessPoolExecutor(max_workers=jobs)
+    pending: deque[Future[bytes]] = deque()
+    try:
+        for segment in segments:
+            pending.append(pool.submit(_render_segment, segment))
+            if len(pending) >= 2 * jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _render_file(args: argparse.Namespace, parameters: dict[str, Any]) -> int:
+    """Write ``--duration`` seconds of the profile to ``--output``.
+
+    Each segment seeks a new generator to its start, so segments join
+    seamlessly and can be rendered on separate cores. Seeking only
+    reproduces seeded streams; an unseeded profile gets a random seed here.
+    """
+
+    # Loaded before the pool starts so forked render processes inherit them.
+    load_kernels()
+    seed = _coerce_seed(args.seed)
+    if seed is None:
+        seed = random.getrandbits(63)
+        _LOGGER.info("Rendering with random seed %s", seed)
+
+    offset = int(max(args.offset, 0.0) * args.sample_rate)
+    total_samples = max(0, int(args.duration * args.sample_rate) - offset)
+    fade_samples = int(min(max(args.fade_out, 0.0), args.duration) * args.sample_rate)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    segment_samples = int(RENDER_SEGMENT_DURATION * args.sample_rate)
+    if jobs > 1:
+        # Shorter renders still spread over every job.
+        segment_samples = max(args.sample_rate, min(segment_samples, -(-total_samples // jobs)))
+    chunk_samples = max(1, int(args.sample_rate * args.chunk_duration))
+
+    segments = (
+        _RenderSegment(
+            args.mode,
+            args.subtype,
+            args.volume,
+            seed,
+            parameters,
+            offset + start,
+            min(segment_samples, total_samples - start),
+            total_samples - start,
+            fade_samples,
+            chunk_samples,
+            args.bit_depth,
+            args.design,
+        )
+        for start in range(0, total_samples, segment_samples)
+    )
+
+    _LOGGER.info(
+        "Rendering %.1f s of mode=%s subtype=%s to %s with %d job(s)",
+        total_samples / args.sample_rate,
+        args.mode,
+        args.subtype,
+        args.output,
+        jobs,
+    )
+    started = time.monotonic()
+    partial = f"{args.output}.part"
+    try:
+        with open(partial, "wb") as output:
+            output.write(
+                build_wav_header(
+                    args.sample_rate, total_samples * args.bit_depth // 8, args.bit_depth
+                )
+            )
+            for data in _render_segments(segments, jobs):
+                if _STOP_REQUESTED:
+                    raise InterruptedError("Render cancelled")
+                output.write(data)
+        os.replace(partial, args.output)
+    except BaseException:
+        try:
+            os.unlink(partial)
+        except OSError:
+            pass
+        if _STOP_REQUESTED:
+            _LOGGER.info("Render of %s cancelled", args.output)
+            return 1
+        raise
+
+    elapsed = time.monotonic() - started
+    _LOGGER.info(
+        "Rendered %s in %.1f s (%.1fx real time)",
+        args.output,
+        elapsed,
+        total_samples / args.sample_rate / max(elapsed, 1e-9),
+    )
+    return 0
+
+
 def run(argv: list[str]) -> int:
     args = _parse_args(argv)
+    apply_worker_scheduling(args.nice, args.cpus)
+    parameters = args.parameters
+    if args.output:
+        return _render_file(args, parameters)
 
-    chunk_samples = max(1, int(args.sample_rate * max(args.chunk_duration, 0.05)))
-    try:
-        parameters = json.loads(args.parameters)
-    except json.JSONDecodeError:
-        parameters = {}
+    schedule = _chunk_schedule(
+        args.sample_rate, args.start_chunk_duration, args.chunk_duration
+    )
     _LOGGER.info(
         "Starting noise_process mode=%s subtype=%s volume=%s params=%s",
         args.mode,
@@ -64,18 +440,63 @@ def run(argv: list[str]) -> int:
         args.volume,
         _coerce_seed(args.seed),
         parameters,
+        args.design,
     )
 
+    degraded = DegradedRenderer(args.degrade, half_rate=_half_rate(args.mode, args.subtype))
+    controls: queue.Queue[dict[str, Any]] = queue.Queue()
+    threading.Thread(
+        target=_read_controls, args=(controls,), name="controls", daemon=True
+    ).start()
+
+    offset = int(max(args.offset, 0.0) * args.sample_rate)
+    if offset:
+        seek = getattr(generator, "seek", None)
+        if seek is not None:
+            seek(offset)
+
+    total_samples = int(args.duration * args.sample_rate) if args.duration > 0 else None
+    if total_samples is not None:
+        # The fade keeps its place relative to the end of the full render.
+        total_samples = max(0, total_samples - offset)
+    fade_samples = int(min(max(args.fade_out, 0.0), max(args.duration, 0.0)) * args.sample_rate)
+    rendered = 0
+    stats = _ChunkStats() if args.stats else None
+
     buffer = sys.stdout.buffer
     try:
-        buffer.write(build_wav_header(args.sample_rate))
+        data_size = None if total_samples is None else total_samples * 2
+        buffer.write(build_wav_header(args.sample_rate, data_size))
         buffer.flush()
 
         while not _STOP_REQUESTED:
-            buffer.write(generator.next_chunk(chunk_samples))
+            generator = _apply_controls(generator, controls, degraded)
+            count = next(schedule)
+            started = time.perf_counter()
+            if total_samples is not None:
+                remaining = total_samples - rendered
+                if remaining <= 0:
+                    break
+                count = min(count, remaining)
+                samples = degraded.render(generator, count)
+                apply_fade_out(samples, remaining, fade_samples)
+                data = pack_samples(samples)
+            else:
+                data = degraded.render_chunk(generator, count)
+            if stats is not None:
+                stats.record(time.perf_counter() - started)
+            buffer.write(data)
             buffer.flush()
+            if not rendered:
+                # Generators switch to the compiled kernels once they are loaded;
+                # loading in the background keeps them off the first chunk.
+                threading.Thread(target=load_kernels, name="kernels", daemon=True).start()
+            rendered += count
     except BrokenPipeError:
         return 0
+    finally:
+        if stats is not None:
+            stats.flush()
 
     _LOGGER.info("Exiting noise_process mode=%s subtype=%s", args.mode, args.subtype)
     return 0
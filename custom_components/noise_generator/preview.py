@@ -0,0 +1,92 @@
+"""Short previews rendered inside Home Assistant for the options flow."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .compiled import CompiledProfile, compile_profile
+from .const import (
+    CONF_MODULATION,
+    CONF_SEED,
+    CONF_VOLUME,
+    DEFAULT_VOLUME,
+    PREVIEW_CACHE_SIZE,
+    PREVIEW_DURATION,
+    PREVIEW_FADE_OUT,
+    PREVIEW_SEED,
+    PREVIEW_URL_PATH,
+    SAMPLE_RATE,
+)
+from .noise import (
+    apply_fade_out,
+    build_wav_header,
+    coerce_profile,
+    create_generator,
+    pack_samples,
+    profile_digest,
+)
+
+
+def render_preview(compiled: CompiledProfile, duration: float = PREVIEW_DURATION) -> bytes:
+    """Return a complete WAV file with the first ``duration`` seconds of a profile.
+
+    Tonal profiles repeat every pulse and pause, so unless they are modulated
+    only one cycle is rendered and packed, then repeated. A short fade at the end avoids a click when
+    playback stops.
+    """
+
+    parameters = dict(compiled.parameters)
+    seed = parameters.get(CONF_SEED)
+    generator = create_generator(
+        compiled.profile_type,
+        compiled.subtype,
+        parameters.get(CONF_VOLUME, DEFAULT_VOLUME),
+        PREVIEW_SEED if seed is None else seed,
+        parameters,
+        dict(compiled.design),
+    )
+    count = int(duration * SAMPLE_RATE)
+    period = count
+    if "tonal" in compiled.design and CONF_MODULATION not in parameters:
+        pulse, pause = compiled.design["tonal"][:2]
+        period = max(1, min(count, pulse + pause))
+    block = generator.next_samples(period)
+
+    body = max(0, count - int(PREVIEW_FADE_OUT * SAMPLE_RATE))
+    tail = [block[index % period] for index in range(body, count)]
+    apply_fade_out(tail, len(tail), len(tail))
+    pcm = pack_samples(block) * -(-body // period)
+    return build_wav_header(SAMPLE_RATE, count * 2) + pcm[: body * 2] + pack_samples(tail)
+
+
+class PreviewCache:
+    """The most recently rendered previews, keyed by profile digest."""
+
+    def __init__(self) -> None:
+        self._previews: OrderedDict[str, bytes] = OrderedDict()
+
+    def get(self, key: str) -> bytes | None:
+        return self._previews.get(key)
+
+    async def async_preview_url(self, hass: HomeAssistant, definition: dict[str, Any]) -> str:
+        """Render the profile unless it is cached and return its preview URL.
+
+        Rendering runs in the executor; the URL is relative to Home Assistant.
+        Preview compiles stay out of the shared compiled-profile cache, which
+        holds the profiles being streamed.
+        """
+
+        definition = coerce_profile(definition)
+        key = profile_digest(definition)
+        if key in self._previews:
+            self._previews.move_to_end(key)
+        else:
+            compiled = compile_profile(definition, cache=False)
+            data = await hass.async_add_executor_job(render_preview, compiled)
+            self._previews[key] = data
+            while len(self._previews) > PREVIEW_CACHE_SIZE:
+                self._previews.popitem(last=False)
+        return f"{PREVIEW_URL_PATH}/{key}"
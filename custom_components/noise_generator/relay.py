@@ -0,0 +1,176 @@
+"""Zero-copy relay from a worker pipe to a client socket using ``os.splice``."""
+
+from __future__ import annotations
+
+import asyncio
+import errno
+import os
+import sys
+from typing import Any
+
+from .const import SPLICE_CHUNK_SIZE
+
+try:  # pragma: no cover - POSIX only; the relay and the send queue need ioctl
+    import fcntl
+    import termios
+except ImportError:  # pragma: no cover - the copy loop is used instead
+    fcntl = termios = None
+
+SPLICE_AVAILABLE = (
+    sys.platform.startswith("linux") and hasattr(os, "splice") and fcntl is not None
+)
+
+_SPLICE_FLAGS = getattr(os, "SPLICE_F_MOVE", 0) | getattr(os, "SPLICE_F_NONBLOCK", 0)
+
+
+def splice_socket_fd(transport: asyncio.BaseTransport | None) -> int | None:
+    """Return a duplicate of the client socket fd, or ``None`` if splice can't be used.
+
+    TLS connections are excluded because their bytes must be encrypted in
+    userspace. The duplicate lets the relay wait on the socket without
+    touching the selector registration owned by the transport.
+    """
+
+    if not SPLICE_AVAILABLE or transport is None:
+        return None
+    if transport.get_extra_info("sslcontext") is not None:
+        return None
+    sock = transport.get_extra_info("socket")
+    if sock is None:
+        return None
+    try:
+        return os.dup(sock.fileno())
+    except OSError:
+        return None
+
+
+class SpliceRelay:
+    """Move bytes from a non-blocking pipe to a socket inside the kernel.
+
+    With ``chunked`` set, every batch is framed as an HTTP/1.1 chunk; only the
+    few bytes of chunk framing are written from Python.
+    """
+
+    def __init__(self, pipe_fd: int, socket_fd: int, *, chunked: bool) -> None:
+        self._pipe_fd = pipe_fd
+        self._socket_fd = socket_fd
+        self._chunked = chunked
+        self._loop = asyncio.get_running_loop()
+
+    async def read_exact(self, size: int) -> bytes:
+        """Read ``size`` bytes from the pipe into userspace (e.g. a file header)."""
+
+        data = b""
+        while len(data) < size:
+            try:
+                chunk = os.read(self._pipe_fd, size - len(data))
+            except BlockingIOError:
+                await self._wait(self._pipe_fd, readable=True)
+                continue
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+    async def relay(self, activity: Any) -> int:
+        """Relay until the pipe reaches EOF and return the number of bytes moved.
+
+        ``activity`` is the handle's ``StreamActivity``; writes are reported to
+        it so the watchdog can still spot stalled clients.
+        """
+
+        total = 0
+        while True:
+            available = await self._wait_available()
+            if not available:
+                return total
+            activity.begin_write(self._loop.time())
+            if self._chunked:
+                await self._write_all(f"{available:x}\r\n".encode())
+            remaining = available
+            while remaining:
+                try:
+                    moved = os.splice(
+                        self._pipe_fd, self._socket_fd, remaining, flags=_SPLICE_FLAGS
+                    )
+                except BlockingIOError:
+                    await self._wait(self._socket_fd, readable=False)
+                    continue
+                if moved == 0:
+                    raise ConnectionResetError(errno.EPIPE, "Worker pipe closed mid-chunk")
+                remaining -= moved
+            if self._chunked:
+                await self._write_all(b"\r\n")
+            activity.end_write(available)
+            total += available
+            # A fast worker and client may never block; let other tasks run.
+            await asyncio.sleep(0)
+
+    async def _wait_available(self) -> int:
+        """Wait for pipe data; return the buffered byte count, 0 at EOF."""
+
+        while True:
+            available = _pipe_bytes(self._pipe_fd)
+            if available:
+                return min(available, SPLICE_CHUNK_SIZE)
+            await self._wait(self._pipe_fd, readable=True)
+            if not _pipe_bytes(self._pipe_fd):
+                # Readable with nothing buffered means the writer has exited.
+                return 0
+
+    async def _write_all(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self._socket_fd, view)
+            except BlockingIOError:
+                await self._wait(self._socket_fd, readable=False)
+                continue
+            view = view[written:]
+
+    async def _wait(self, fd: int, *, readable: bool) -> None:
+        future = self._loop.create_future()
+
+        def _ready() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        if readable:
+            self._loop.add_reader(fd, _ready)
+        else:
+            self._loop.add_writer(fd, _ready)
+        try:
+            await future
+        finally:
+            if readable:
+                self._loop.remove_reader(fd)
+            else:
+                self._loop.remove_writer(fd)
+
+
+def unacknowledged_bytes(transport: asyncio.BaseTransport | None) -> int | None:
+    """Return how many bytes sent on ``transport`` the peer has not acknowledged.
+
+    Counts the transport's own buffer plus the kernel send queue. Returns
+    ``None`` where the kernel queue can't be read (non-Linux, TLS, no socket).
+    """
+
+    if not sys.platform.startswith("linux") or fcntl is None or transport is None:
+        return None
+    if transport.get_extra_info("sslcontext") is not None:
+        return None
+    sock = transport.get_extra_info("socket")
+    if sock is None:
+        return None
+    buffer = bytearray(4)
+    try:
+        fcntl.ioctl(sock.fileno(), termios.TIOCOUTQ, buffer)
+    except OSError:
+        return None
+    return transport.get_write_buffer_size() + int.from_bytes(buffer, sys.byteorder)
+
+
+def _pipe_bytes(fd: int) -> int:
+    buffer = bytearray(4)
+    fcntl.ioctl(fd, termios.FIONREAD, buffer)
+    return int.from_bytes(buffer, sys.byteorder)
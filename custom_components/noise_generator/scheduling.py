@@ -0,0 +1,54 @@
+"""Scheduling priority and CPU affinity for worker processes."""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Iterable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_cpu_list(text: str) -> list[int]:
+    """Parse a CPU list such as ``"2-3"`` or ``"0,2,4-5"``.
+
+    Uses the syntax of Linux's ``taskset -c`` and ``cpuset``; an empty string
+    gives an empty list. Raises ``ValueError`` for anything else.
+    """
+
+    cpus: set[int] = set()
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        start = int(first)
+        end = int(last) if last else start
+        if start < 0 or end < start:
+            raise ValueError(f"Invalid CPU range: {part}")
+        cpus.update(range(start, end + 1))
+    if not cpus and text.strip():
+        raise ValueError(f"Invalid CPU list: {text}")
+    return sorted(cpus)
+
+
+def apply_worker_scheduling(nice: int, cpus: Iterable[int]) -> None:
+    """Run this process at niceness ``nice`` or lower priority, on ``cpus``.
+
+    Called by the worker before it starts any thread, so every thread and
+    render process inherits the settings. A niceness below the inherited one
+    needs privileges and is ignored, as is anything the platform lacks.
+    """
+
+    if nice > 0 and hasattr(os, "setpriority"):
+        try:
+            if nice > os.getpriority(os.PRIO_PROCESS, 0):
+                os.setpriority(os.PRIO_PROCESS, 0, nice)
+        except OSError as err:
+            _LOGGER.warning("Could not set worker niceness to %s: %s", nice, err)
+
+    cpus = set(cpus)
+    if cpus and hasattr(os, "sched_setaffinity"):
+        try:
+            os.sched_setaffinity(0, cpus)
+        except OSError as err:
+            _LOGGER.warning("Could not pin worker to CPUs %s: %s", sorted(cpus), err)
@@ -0,0 +1,237 @@
+"""Frequency-domain noise shaping for the custom and EQ colored noises."""
+
+from __future__ import annotations
+
+import cmath
+import functools
+import math
+import random
+from collections.abc import Callable
+from typing import Any
+
+from .const import (
+    SAMPLE_RATE,
+    SPECTRAL_BLOCK_SIZE,
+    SPECTRAL_OUTPUT_RMS,
+    SPECTRAL_RESPONSE_CACHE_SIZE,
+)
+from .rng import CounterRandom
+
+try:  # pragma: no cover - numpy is optional and only speeds up the FFT
+    import numpy as np
+except ImportError:  # pragma: no cover - pure Python fallback
+    np = None
+
+_TWIDDLES: dict[int, list[complex]] = {}
+
+
+def _twiddles(size: int) -> list[complex]:
+    factors = _TWIDDLES.get(size)
+    if factors is None:
+        factors = [cmath.exp(-2j * math.pi * k / size) for k in range(size // 2)]
+        _TWIDDLES[size] = factors
+    return factors
+
+
+def fft(values: list[complex]) -> list[complex]:
+    """Return the DFT of ``values``; the length must be a power of two >= 4."""
+
+    size = len(values)
+    if size == 4:
+        a, b, c, d = values
+        ac, amc = a + c, a - c
+        bd, bmd = b + d, (b - d) * -1j
+        return [ac + bd, amc + bmd, ac - bd, amc - bmd]
+    even = fft(values[0::2])
+    odd = list(map(complex.__mul__, _twiddles(size), fft(values[1::2])))
+    return list(map(complex.__add__, even, odd)) + list(map(complex.__sub__, even, odd))
+
+
+def magnitude_response(
+    slope: float,
+    low_cutoff: float,
+    high_cutoff: float,
+    order: int,
+    size: int = SPECTRAL_BLOCK_SIZE,
+    sample_rate: int = SAMPLE_RATE,
+) -> list[float]:
+    """Return per-bin amplitudes for a dB/octave tilt inside Butterworth corners.
+
+    The result covers all ``size`` FFT bins (negative frequencies mirrored) and
+    is not normalised.
+    """
+
+    exponent = slope / (20 * math.log10(2))
+    poles = 2 * order
+    response = [0.0] * size
+    for k in range(1, size // 2 + 1):
+        freq = k * sample_rate / size
+        gain = (freq / 1000.0) ** exponent
+        gain /= math.sqrt(1.0 + (low_cutoff / freq) ** poles)
+        gain /= math.sqrt(1.0 + (freq / high_cutoff) ** poles)
+        response[k] = gain
+        response[size - k] = gain
+    return response
+
+
+@functools.lru_cache(maxsize=SPECTRAL_RESPONSE_CACHE_SIZE)
+def _scaled_response(
+    slope: float,
+    low_cutoff: float,
+    high_cutoff: float,
+    order: int,
+    size: int,
+    sample_rate: int,
+    level: float,
+) -> tuple[float, ...]:
+    """Return the response scaled to output ``level``, shared by equal designs."""
+
+    response = magnitude_response(slope, low_cutoff, high_cutoff, order, size, sample_rate)
+    # Spectrum bins have a variance of 1/6, the real part of each output
+    # sample collects half of the total power.
+    power = sum(gain * gain for gain in response) / 12.0
+    scale = level / math.sqrt(power) if power > 0 else 0.0
+    return tuple(gain * scale for gain in response)
+
+
+@functools.lru_cache(maxsize=None)
+def _sine_window(size: int) -> tuple[float, ...]:
+    return tuple(math.sin(math.pi * (n + 0.5) / size) for n in range(size))
+
+
+class SpectralShaper:
+    """Shape white noise block-wise with a precomputed magnitude response.
+
+    Each FFT turns a random spectrum weighted by the response into two
+    independent noise blocks (its real and imaginary parts). Blocks are
+    sine-windowed and overlap-added at 50 %, which keeps the output power
+    constant and smooths any change of response between blocks.
+
+    ``on_block``, if set, is called with the position of the first output
+    sample of every synthesis before it runs, so it can reconfigure the
+    response at block rate. A precomputed ``response`` replaces the tilt and
+    corners design.
+    """
+
+    def __init__(
+        self,
+        rng: Any,
+        slope: float,
+        low_cutoff: float,
+        high_cutoff: float,
+        order: int,
+        *,
+        response: tuple[float, ...] | None = None,
+        size: int = SPECTRAL_BLOCK_SIZE,
+        level: float = SPECTRAL_OUTPUT_RMS,
+        sample_rate: int = SAMPLE_RATE,
+    ) -> None:
+        self._rng: random.Random = rng
+        self._size = size
+        self._hop = size // 2
+        self._level = level
+        self._sample_rate = sample_rate
+        self._window = _sine_window(size)
+        self._tail = [0.0] * self._hop
+        self._buffer: list[float] = []
+        self._response: tuple[float, ...] = ()
+        self._arrays: tuple[Any, Any] | None = None
+        self._block_start = 0
+        self.on_block: Callable[[int], None] | None = None
+        if response is None:
+            self.configure(slope, low_cutoff, high_cutoff, order)
+        else:
+            self.set_response(response)
+
+    def configure(self, slope: float, low_cutoff: float, high_cutoff: float, order: int) -> None:
+        """Redesign the magnitude response; takes effect from the next block."""
+
+        self.set_response(
+            _scaled_response(
+                slope, low_cutoff, high_cutoff, order, self._size, self._sample_rate, self._level
+            )
+        )
+
+    def set_response(self, response: tuple[float, ...]) -> None:
+        """Use per-bin amplitudes covering all ``size`` bins from the next block."""
+
+        self._response = response
+        if np is not None and isinstance(self._rng, CounterRandom):
+            self._arrays = (np.array(self._response), np.array(self._window))
+
+    def seek(self, position: int) -> None:
+        """Continue from output sample ``position``; needs a seekable ``rng``.
+
+        Each synthesis consumes ``2 * size`` random values and yields ``size``
+        samples, so only the block before ``position`` is re-synthesised to
+        restore the overlap tail.
+        """
+
+        size = self._size
+        block = position // size
+        self._tail = [0.0] * self._hop
+        self._rng.seek(max(0, block - 1) * 2 * size)
+        self._block_start = max(0, block - 1) * size
+        if block:
+            self._synthesize()
+        self._buffer = self._synthesize()[position - block * size :]
+
+    def render(self, count: int) -> list[float]:
+        """Return the next ``count`` shaped samples."""
+
+        buffer = self._buffer
+        while len(buffer) < count:
+            buffer.extend(self._synthesize())
+        self._buffer = buffer[count:]
+        return buffer[:count]
+
+    def _synthesize(self) -> list[float]:
+        """Produce two hops of output from one FFT."""
+
+        if self.on_block is not None:
+            self.on_block(self._block_start)
+        self._block_start += self._size
+        if self._arrays is not None:
+            return self._synthesize_array()
+        rand = self._rng.random
+        spectrum = [complex(rand() - 0.5, rand() - 0.5) * gain for gain in self._response]
+        if np is not None:
+            transformed = np.fft.fft(np.array(spectrum, dtype=complex))
+            blocks = (transformed.real.tolist(), transformed.imag.tolist())
+        else:
+            transformed = fft(spectrum)
+            blocks = (
+                [value.real for value in transformed],
+                [value.imag for value in transformed],
+            )
+
+        hop = self._hop
+        output: list[float] = []
+        tail = self._tail
+        for block in blocks:
+            windowed = list(map(float.__mul__, block, self._window))
+            output.extend(map(float.__add__, tail, windowed[:hop]))
+            tail = windowed[hop:]
+        self._tail = tail
+        return output
+
+    def _synthesize_array(self) -> list[float]:
+        """``_synthesize`` vectorised with NumPy for a counter-based source.
+
+        The random values, spectrum and overlap-add are computed with the same
+        operations in the same order, so the output is identical.
+        """
+
+        response, window = self._arrays
+        values = self._rng.random_array(2 * self._size) - 0.5
+        transformed = np.fft.fft((values[0::2] + 1j * values[1::2]) * response)
+
+        hop = self._hop
+        blocks = []
+        tail = np.array(self._tail)
+        for block in (transformed.real, transformed.imag):
+            windowed = block * window
+            blocks.append(tail + windowed[:hop])
+            tail = windowed[hop:]
+        self._tail = tail.tolist()
+        return np.concatenate(blocks).tolist()
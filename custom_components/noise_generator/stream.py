@@ -4,19 +4,26 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import functools
 import json
 import logging
+import math
+import os
 import sys
-from dataclasses import dataclass
+from collections import Counter, deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from typing import Any
-from urllib.parse import quote
+from urllib.parse import quote, urlencode
 
 from aiohttp import client_exceptions as aiohttp_client_exceptions
-from aiohttp import web
+from aiohttp import hdrs, web
 
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
 try:  # pragma: no cover - compatibility with older HA releases
     from homeassistant.helpers.network import async_get_url
 except ImportError:  # pragma: no cover - fallback for newer HA versions
@@ -29,23 +36,72 @@ except ImportError:  # pragma: no cover - fallback for newer HA versions
 from homeassistant.util import slugify
 
 from .const import (
+    ADMISSION_QUEUE_TIMEOUT,
+    ADMISSION_RETRY_AFTER,
+    CONF_ALARM_NORMAL_PRIORITY,
+    CONF_DURATION,
+    CONF_FADE_OUT,
+    CONF_MAX_WORKERS,
+    CONF_MAX_WORKERS_PER_PROFILE,
+    CONF_MIX_DEFINITION,
+    CONF_MIX_LAYERS,
+    CONF_MIX_PROFILE,
+    CONF_OFFSET,
     CONF_PROFILE_NAME,
     CONF_PROFILE_PARAMETERS,
     CONF_PROFILE_SUBTYPE,
     CONF_PROFILE_TYPE,
     CONF_SEED,
-    CONF_VOLUME,
+    CONF_SPLICE_RELAY,
+    CONF_VERSION,
+    CONF_WORKER_CPUS,
+    CONF_WORKER_NICE,
+    DEFAULT_MAX_WORKERS,
+    DEFAULT_MAX_WORKERS_PER_PROFILE,
     DEFAULT_PROFILE_NAME,
     DEFAULT_PROFILE_SUBTYPE,
     DEFAULT_PROFILE_TYPE,
+    DEFAULT_WORKER_NICE,
+    DEGRADE_LEVEL_LOOP,
+    DEGRADE_LOAD_HIGH,
+    DEGRADE_LOAD_LOW,
+    DEGRADE_OVERLOAD_TICKS,
+    DEGRADE_RECOVERY_TICKS,
     DOMAIN,
+    DURATION_MAX,
+    FADE_OUT_MAX,
     MEDIA_MIME_TYPE,
+    METRICS_UNDERRUN_BUFFER,
+    METRICS_URL_PATH,
+    PREVIEW_URL_PATH,
+    PRIORITY_ALARM,
+    PRIORITY_AMBIENT,
+    PROFILE_CROSSFADE_DURATION,
+    PROFILE_TYPE_PRIORITIES,
     SAMPLE_RATE,
+    STREAM_CACHE_MAX_AGE,
     STREAM_CHUNK_DURATION,
+    STREAM_ENGINE_VERSION,
+    STREAM_PROBE_POLL,
+    STREAM_PROBE_TIMEOUT,
+    STREAM_PROBE_WINDOW,
+    STREAM_START_CHUNK_DURATION,
     STREAM_URL_PATH,
     STDOUT_READ_SIZE,
+    WAV_HEADER_SIZE,
+    WATCHDOG_INTERVAL,
+    WATCHDOG_MIN_REALTIME_RATIO,
+    WATCHDOG_RATE_WINDOW,
+    WATCHDOG_STALL_TIMEOUT,
+    WORKER_REALTIME_COST_LIMIT,
+    WORKER_STATS_PREFIX,
 )
-from .noise import coerce_profile
+from .compiled import CompiledProfile, compile_profile
+from .metrics import NoiseMetrics
+from .noise import build_wav_header, coerce_profile
+from .preview import PreviewCache
+from .relay import SpliceRelay, splice_socket_fd, unacknowledged_bytes
+from .scheduling import parse_cpu_list
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,6 +113,221 @@ class NoiseStreamProfile:
     slug: str
     name: str
     definition: dict[str, Any]
+    digest: str = ""
+    compiled: CompiledProfile | None = None
+
+    @property
+    def metric_labels(self) -> tuple[str, str]:
+        """Return the ``(type, subtype)`` labels of the profile's metrics."""
+
+        return (
+            str(self.definition.get(CONF_PROFILE_TYPE, DEFAULT_PROFILE_TYPE)),
+            str(self.definition.get(CONF_PROFILE_SUBTYPE, DEFAULT_PROFILE_SUBTYPE)),
+        )
+
+    @property
+    def kind(self) -> str:
+        """Return ``type/subtype``, the key resource usage is aggregated by."""
+
+        return "/".join(self.metric_labels)
+
+    @property
+    def priority(self) -> str:
+        """Return the admission priority class of the profile."""
+
+        definitions = [self.definition, *self._layer_definitions()]
+        priorities = {
+            PROFILE_TYPE_PRIORITIES.get(
+                definition.get(CONF_PROFILE_TYPE, DEFAULT_PROFILE_TYPE), PRIORITY_AMBIENT
+            )
+            for definition in definitions
+        }
+        # A mix with an alarm layer is admitted like the alarm itself.
+        return PRIORITY_ALARM if PRIORITY_ALARM in priorities else PRIORITY_AMBIENT
+
+    @property
+    def deterministic(self) -> bool:
+        """Return True when every render of the profile is byte-identical."""
+
+        if self.definition.get(CONF_PROFILE_TYPE) == "tonal_noise":
+            return True
+        if self.definition[CONF_PROFILE_PARAMETERS].get(CONF_SEED) is not None:
+            return True
+        if self.definition.get(CONF_PROFILE_TYPE) == "mix":
+            return all(
+                NoiseStreamProfile("", "", definition).deterministic
+                for definition in self._layer_definitions()
+            )
+        return False
+
+    def _layer_definitions(self) -> list[dict[str, Any]]:
+        layers = self.definition[CONF_PROFILE_PARAMETERS].get(CONF_MIX_LAYERS) or []
+        return [layer[CONF_MIX_DEFINITION] for layer in layers if CONF_MIX_DEFINITION in layer]
+
+
+@dataclass
+class NoiseStreamOptions:
+    """Per-request playback options layered on top of a profile."""
+
+    duration: float = 0.0
+    fade_out: float = 0.0
+    offset: float = 0.0
+
+    @classmethod
+    def from_request(
+        cls, profile: NoiseStreamProfile, query: Mapping[str, str]
+    ) -> NoiseStreamOptions:
+        """Combine profile defaults with query string overrides."""
+
+        params = profile.definition[CONF_PROFILE_PARAMETERS]
+        try:
+            duration = float(query.get(CONF_DURATION, params.get(CONF_DURATION) or 0.0))
+            fade_out = float(query.get(CONF_FADE_OUT, params.get(CONF_FADE_OUT) or 0.0))
+            offset = float(query.get(CONF_OFFSET, 0.0))
+        except ValueError as err:
+            raise web.HTTPBadRequest(text=f"Invalid stream option: {err}") from err
+        if not all(map(math.isfinite, (duration, fade_out, offset))):
+            raise web.HTTPBadRequest(text="Invalid stream option: not a finite number")
+        duration = min(max(duration, 0.0), DURATION_MAX)
+        fade_out = min(max(fade_out, 0.0), FADE_OUT_MAX, duration)
+        # Only reproducible audio has a position to resume from.
+        offset = max(offset, 0.0) if profile.deterministic else 0.0
+        offset = min(offset, duration if duration > 0 else DURATION_MAX)
+        return cls(duration=duration, fade_out=fade_out, offset=offset)
+
+    @property
+    def content_length(self) -> int | None:
+        """Return the exact response size of a finite render."""
+
+        if self.duration <= 0:
+            return None
+        samples = int(self.duration * SAMPLE_RATE) - int(self.offset * SAMPLE_RATE)
+        return WAV_HEADER_SIZE + samples * 2
+
+    def cacheable(self, profile: NoiseStreamProfile) -> bool:
+        """Return True when the response is served with an ETag and cached."""
+
+        return self.content_length is not None and profile.deterministic
+
+    def degradable(self, profile: NoiseStreamProfile) -> bool:
+        """Return True if the stream may be degraded while the host is overloaded.
+
+        Cached renders must stay full quality, or a client could keep degraded
+        audio under the ETag of the real one.
+        """
+
+        return profile.priority == PRIORITY_AMBIENT and not self.cacheable(profile)
+
+    @property
+    def cache_key(self) -> str:
+        return f"{self.duration:g}-{self.fade_out:g}-{self.offset:g}-v{STREAM_ENGINE_VERSION}"
+
+
+@dataclass
+class StreamActivity:
+    """Track how fast a client consumes a stream."""
+
+    bytes_written: int = 0
+    write_started: float | None = None
+    underruns: int = 0
+    on_write: Callable[[int], None] | None = None
+    on_underrun: Callable[[], None] | None = None
+    _samples: deque[tuple[float, int]] = field(default_factory=deque)
+    _playing_since: float | None = None
+    _played_before: int = 0
+
+    def begin_write(self, now: float) -> None:
+        self.write_started = now
+        self._track_playback(now)
+
+    def end_write(self, size: int) -> None:
+        self.write_started = None
+        self.bytes_written += size
+        if self.on_write is not None:
+            self.on_write(size)
+
+    def _track_playback(self, now: float) -> None:
+        """Estimate underruns of a speaker that buffers, then plays in real time.
+
+        The model matches ``scripts/load_test.py``: playback starts once
+        ``METRICS_UNDERRUN_BUFFER`` seconds are buffered, and an underrun is
+        counted when more audio would have been played than was delivered.
+        """
+
+        realtime = SAMPLE_RATE * 2
+        if self._playing_since is None:
+            if self.bytes_written - self._played_before >= METRICS_UNDERRUN_BUFFER * realtime:
+                self._playing_since = now
+            return
+        played = self._played_before + (now - self._playing_since) * realtime
+        if played <= self.bytes_written:
+            return
+        # The speaker ran dry; it buffers again before playing on.
+        self.underruns += 1
+        self._played_before = self.bytes_written
+        self._playing_since = None
+        if self.on_underrun is not None:
+            self.on_underrun()
+
+    def stall_reason(self, now: float) -> str | None:
+        """Return why the client looks dead, or ``None`` while it keeps up."""
+
+        if self.write_started is not None:
+            stalled = now - self.write_started
+            if stalled > WATCHDOG_STALL_TIMEOUT:
+                return f"write blocked for {stalled:.0f}s"
+
+        samples = self._samples
+        samples.append((now, self.bytes_written))
+        # Keep exactly one sample older than the window as the rate baseline.
+        while len(samples) > 2 and now - samples[1][0] >= WATCHDOG_RATE_WINDOW:
+            samples.popleft()
+        since, bytes_then = samples[0]
+        if now - since < WATCHDOG_RATE_WINDOW:
+            return None
+        rate = (self.bytes_written - bytes_then) / (now - since)
+        realtime = SAMPLE_RATE * 2
+        if rate < realtime * WATCHDOG_MIN_REALTIME_RATIO:
+            return f"client reads {rate / realtime:.0%} of real time"
+        return None
+
+
+@dataclass
+class WorkerUsage:
+    """Resource usage of one worker process, sampled from ``/proc``."""
+
+    cpu_seconds: float = 0.0
+    rss_bytes: int = 0
+    voluntary_switches: int = 0
+    involuntary_switches: int = 0
+    cpu_load: float = 0.0
+    sampled_at: float | None = None
+    over_budget: bool = False
+
+    def update(self, now: float, sample: tuple[float, int, int, int]) -> None:
+        cpu_seconds, self.rss_bytes, self.voluntary_switches, self.involuntary_switches = sample
+        if self.sampled_at is not None and now > self.sampled_at:
+            # Cores busy since the previous sample.
+            self.cpu_load = (cpu_seconds - self.cpu_seconds) / (now - self.sampled_at)
+        self.cpu_seconds = cpu_seconds
+        self.sampled_at = now
+
+    def realtime_cost(self, bytes_written: int) -> float | None:
+        """Return CPU seconds spent per second of audio delivered so far."""
+
+        audio_seconds = bytes_written / (SAMPLE_RATE * 2)
+        if audio_seconds < WATCHDOG_INTERVAL:
+            return None
+        return self.cpu_seconds / audio_seconds
+
+
+@dataclass
+class UsageTotals:
+    """CPU spent and audio delivered by every worker of one profile kind."""
+
+    cpu_seconds: float = 0.0
+    audio_seconds: float = 0.0
+    workers: int = 0
 
 
 class NoiseStreamView(HomeAssistantView):
@@ -77,29 +348,119 @@ class NoiseStreamView(HomeAssistantView):
             raise web.HTTPNotFound()
 
         manager: NoiseStreamManager = stored["manager"]
-        profile = manager.get_profile(slug)
+        # A renamed profile is found by the version of its old URL; a bare
+        # digest is what stream URLs used to be.
+        profile = (
+            manager.get_profile(slug)
+            or manager.get_profile_by_digest(request.query.get(CONF_VERSION, ""))
+            or manager.get_profile_by_digest(slug)
+        )
         if profile is None:
             raise web.HTTPNotFound()
 
         return await manager.async_stream_profile(request, profile)
 
+    async def head(self, request: web.Request, entry_id: str, slug: str) -> web.StreamResponse:
+        """Answer probes with the headers of the stream; nothing is synthesised."""
+
+        return await self.get(request, entry_id, slug)
+
+
+class NoiseMetricsView(HomeAssistantView):
+    """Serve stream metrics in the Prometheus text format."""
+
+    url = METRICS_URL_PATH
+    name = "api:noise_generator:metrics"
+    requires_auth = True
+
+    def __init__(self, metrics: NoiseMetrics) -> None:
+        self.metrics = metrics
+
+    async def get(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.metrics.render().encode(),
+            headers={hdrs.CONTENT_TYPE: "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
+
+class NoisePreviewView(HomeAssistantView):
+    """Serve previews rendered by the options flow.
+
+    Only previews already in the cache are served, so requests never start
+    a render.
+    """
+
+    url = f"{PREVIEW_URL_PATH}/{{key}}"
+    name = "api:noise_generator:preview"
+    requires_auth = False
+
+    def __init__(self, previews: PreviewCache) -> None:
+        self.previews = previews
+
+    async def get(self, request: web.Request, key: str) -> web.Response:
+        data = self.previews.get(key)
+        if data is None:
+            raise web.HTTPNotFound()
+        return web.Response(
+            body=data,
+            headers={
+                hdrs.CONTENT_TYPE: "audio/wav",
+                hdrs.CACHE_CONTROL: f"private, max-age={STREAM_CACHE_MAX_AGE}",
+            },
+        )
+
 
 class NoiseStreamManager:
     """Manage runtime state for streaming noise profiles."""
 
-    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, metrics: NoiseMetrics | None = None
+    ) -> None:
         self.hass = hass
         self.entry_id = entry_id
+        self.metrics = metrics if metrics is not None else NoiseMetrics()
         self._profiles: dict[str, NoiseStreamProfile] = {}
         self._handles: set[_BaseStreamHandle] = set()
+        self._usage_totals: dict[str, UsageTotals] = {}
+        self._reserved: Counter[str] = Counter()
+        self._capacity = asyncio.Condition()
+        self._max_workers = DEFAULT_MAX_WORKERS
+        self._max_workers_per_profile = DEFAULT_MAX_WORKERS_PER_PROFILE
+        self._splice_relay = False
+        self._worker_nice = DEFAULT_WORKER_NICE
+        self._worker_cpus: list[int] = []
+        self._alarm_normal_priority = True
+        self._degradation = 0
+        self._overload_ticks = 0
+        self._calm_ticks = 0
+        self._recent_underruns = 0
         self._ha_stop_unsub = hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_STOP, self._async_handle_ha_shutdown
         )
+        self._watchdog_unsub = async_track_time_interval(
+            hass, self._async_watchdog, timedelta(seconds=WATCHDOG_INTERVAL)
+        )
+
+    def update_settings(self, settings: Mapping[str, Any]) -> None:
+        """Apply entry-level stream settings."""
+
+        self._max_workers = int(settings.get(CONF_MAX_WORKERS, DEFAULT_MAX_WORKERS))
+        self._max_workers_per_profile = int(
+            settings.get(CONF_MAX_WORKERS_PER_PROFILE, DEFAULT_MAX_WORKERS_PER_PROFILE)
+        )
+        self._splice_relay = bool(settings.get(CONF_SPLICE_RELAY, False))
+        self._worker_nice = int(settings.get(CONF_WORKER_NICE, DEFAULT_WORKER_NICE))
+        self._alarm_normal_priority = bool(settings.get(CONF_ALARM_NORMAL_PRIORITY, True))
+        try:
+            self._worker_cpus = parse_cpu_list(str(settings.get(CONF_WORKER_CPUS) or ""))
+        except ValueError as err:
+            _LOGGER.warning("Ignoring worker CPU list: %s", err)
+            self._worker_cpus = []
 
     def update_profiles(self, profiles: list[dict[str, Any]]) -> None:
         """Refresh the available profile definitions."""
 
-        new_profiles: dict[str, NoiseStreamProfile] = {}
+        definitions: dict[str, dict[str, Any]] = {}
         used_slugs: set[str] = set()
         for index, profile in enumerate(profiles):
             name = str(profile.get(CONF_PROFILE_NAME) or DEFAULT_PROFILE_NAME)
@@ -110,15 +471,54 @@ class NoiseStreamManager:
                 slug_candidate = f"{slug_base}-{suffix}"
                 suffix += 1
             used_slugs.add(slug_candidate)
-            definition = {CONF_PROFILE_NAME: name, **coerce_profile(profile)}
-            new_profiles[slug_candidate] = NoiseStreamProfile(
-                slug=slug_candidate,
-                name=name,
+            definitions[slug_candidate] = {CONF_PROFILE_NAME: name, **coerce_profile(profile)}
+
+        for definition in definitions.values():
+            if definition[CONF_PROFILE_TYPE] == "mix":
+                _resolve_mix_layers(definition, definitions)
+
+        new_profiles = {}
+        for slug, definition in definitions.items():
+            compiled = compile_profile(definition)
+            new_profiles[slug] = NoiseStreamProfile(
+                slug=slug,
+                name=definition[CONF_PROFILE_NAME],
                 definition=definition,
+                digest=compiled.digest,
+                compiled=compiled,
             )
 
+        previous = self._profiles
         self._profiles = new_profiles
 
+        changed = [
+            profile
+            for slug, profile in new_profiles.items()
+            if slug in previous and previous[slug].digest != profile.digest
+        ]
+        if changed and self._handles:
+            self.hass.async_create_task(
+                self._async_apply_profile_changes(changed),
+                name=f"noise_generator_profile_changes_{self.entry_id}",
+            )
+
+    async def _async_apply_profile_changes(self, profiles: list[NoiseStreamProfile]) -> None:
+        """Switch live streams of edited profiles over to the new definitions."""
+
+        by_slug = {profile.slug: profile for profile in profiles}
+        handles = [handle for handle in self._handles if handle.profile.slug in by_slug]
+        if not handles:
+            return
+        _LOGGER.debug(
+            "Crossfading %s live stream(s) to edited profiles %s",
+            len(handles),
+            sorted(by_slug),
+        )
+        await asyncio.gather(
+            *(handle.async_switch_profile(by_slug[handle.profile.slug]) for handle in handles),
+            return_exceptions=True,
+        )
+
     def iter_profiles(self) -> list[NoiseStreamProfile]:
         """Return all stored profiles sorted by display name."""
 
@@ -129,42 +529,169 @@ class NoiseStreamManager:
 
         return self._profiles.get(slug)
 
-    async def async_build_stream_url(self, slug: str) -> str:
-        """Return an absolute URL that streams the requested profile."""
+    def get_profile_by_digest(self, digest: str) -> NoiseStreamProfile | None:
+        """Return the profile whose normalised definition hashes to ``digest``."""
+
+        for profile in self._profiles.values():
+            if profile.digest == digest:
+                return profile
+        return None
+
+    def find_profile(self, name_or_slug: str) -> NoiseStreamProfile | None:
+        """Return a profile by slug or display name."""
+
+        profile = self._profiles.get(name_or_slug) or self._profiles.get(slugify(name_or_slug))
+        if profile is not None:
+            return profile
+        lowered = name_or_slug.casefold()
+        for candidate in self._profiles.values():
+            if candidate.name.casefold() == lowered:
+                return candidate
+        return None
+
+    async def async_update_parameters(self, slug: str, updates: dict[str, Any]) -> int:
+        """Push parameter changes to every live stream of a profile.
+
+        Returns the number of streams that received the update.
+        """
+
+        handles = [handle for handle in self._handles if handle.profile.slug == slug]
+        if handles:
+            await asyncio.gather(
+                *(handle.async_update_parameters(updates) for handle in handles),
+                return_exceptions=True,
+            )
+        return len(handles)
+
+    async def async_build_stream_url(
+        self, slug: str, options: Mapping[str, str] | None = None
+    ) -> str:
+        """Return an absolute URL that streams the requested profile.
+
+        The content hash goes in a version parameter, so the URL changes when
+        the audio does while the slug keeps it tied to the profile. A stale
+        version still plays the current definition.
+        """
 
         base_url = await async_get_url(self.hass, prefer_external=False)
         base = base_url.rstrip("/")
-        return f"{base}{STREAM_URL_PATH}/{self.entry_id}/{quote(slug)}"
+        query = dict(options or {})
+        profile = self._profiles.get(slug)
+        if profile is not None:
+            query[CONF_VERSION] = profile.digest
+        url = f"{base}{STREAM_URL_PATH}/{self.entry_id}/{quote(slug)}"
+        if query:
+            url = f"{url}?{urlencode(query)}"
+        return url
 
     async def async_stream_profile(
         self, request: web.Request, profile: NoiseStreamProfile
     ) -> web.StreamResponse:
-        """Stream audio generated by the active engine for the given profile."""
+        """Stream audio generated by the active engine for the given profile.
 
-        handle = await self._create_process_handle(profile)
+        HEAD requests only get the headers. A GET gets the headers and the WAV
+        header at once. Alarm profiles reserve and start their worker straight
+        away; an ambient stream only reserves a slot once the client has
+        received the header and stayed connected for ``STREAM_PROBE_WINDOW``,
+        so probing clients neither cost a worker nor hold one back.
+        """
 
-        response = web.StreamResponse(
-            status=200,
-            headers={
-                "Content-Type": MEDIA_MIME_TYPE,
-                "Cache-Control": "no-store",
-            },
-        )
-        response.enable_chunked_encoding()
-        await response.prepare(request)
+        loop = asyncio.get_running_loop()
+        requested = loop.time()
+        options = NoiseStreamOptions.from_request(profile, request.query)
+        headers = {
+            hdrs.CONTENT_TYPE: MEDIA_MIME_TYPE,
+            hdrs.CACHE_CONTROL: "no-store",
+        }
+        content_length = options.content_length
+        if options.cacheable(profile):
+            etag = f'"{profile.digest}-{options.cache_key}"'
+            headers[hdrs.ETAG] = etag
+            # Finite, reproducible renders are immutable for a URL that pins
+            # the current version; any other URL has to revalidate.
+            if request.query.get(CONF_VERSION) == profile.digest:
+                headers[hdrs.CACHE_CONTROL] = f"public, max-age={STREAM_CACHE_MAX_AGE}, immutable"
+            else:
+                headers[hdrs.CACHE_CONTROL] = "no-cache"
+            if _etag_matches(request.headers.get(hdrs.IF_NONE_MATCH), etag):
+                del headers[hdrs.CONTENT_TYPE]
+                return web.Response(status=304, headers=headers)
+
+        response = web.StreamResponse(status=200, headers=headers)
+        if content_length is not None:
+            response.content_length = content_length
+        else:
+            response.enable_chunked_encoding()
+        if request.method == hdrs.METH_HEAD:
+            await response.prepare(request)
+            self.metrics.probes.inc(profile.metric_labels)
+            return response
+
+        alarm = profile.priority == PRIORITY_ALARM
+        if alarm:
+            await self._async_acquire_slot(profile)
+        try:
+            await response.prepare(request)
+            # Workers write this same header first; it is skipped below.
+            data_size = None if content_length is None else content_length - WAV_HEADER_SIZE
+            await response.write(build_wav_header(SAMPLE_RATE, data_size))
+            self.metrics.bytes_served.inc(profile.metric_labels, WAV_HEADER_SIZE)
+            listening = alarm or await _async_client_listening(request)
+        except ConnectionError:
+            listening = False
+        except BaseException:
+            if alarm:
+                await self._async_cancel_reservation(profile.slug)
+            raise
+        if not listening:
+            _LOGGER.debug("Client left %s during the probe window", profile.slug)
+            self.metrics.probes.inc(profile.metric_labels)
+            if alarm:
+                await self._async_cancel_reservation(profile.slug)
+            return response
+        if not alarm:
+            try:
+                await self._async_acquire_slot(profile)
+            except web.HTTPServiceUnavailable:
+                # The status line is already out, so the stream just ends.
+                response.force_close()
+                return response
 
+        socket_fd = splice_socket_fd(request.transport) if self._splice_relay else None
         try:
+            handle = await self._create_process_handle(
+                profile, options, relay=socket_fd is not None
+            )
+        except BaseException:
+            if socket_fd is not None:
+                os.close(socket_fd)
+            raise
+        handle.requested = requested
+        handle.attach(request)
+        self.metrics.streams_started.inc(handle.labels)
+
+        activity = handle.activity
+        try:
+            if socket_fd is not None:
+                await self._async_splice(request, response, handle, socket_fd)
+            else:
+                await handle.read_header()
             while True:
                 chunk = await handle.read_chunk()
                 if not chunk:
                     break
+                activity.begin_write(loop.time())
                 await response.write(chunk)
+                activity.end_write(len(chunk))
         except asyncio.CancelledError:
             raise
-        except (ConnectionResetError, asyncio.IncompleteReadError):
+        except (ConnectionError, asyncio.IncompleteReadError):
             pass
         finally:
+            if socket_fd is not None:
+                os.close(socket_fd)
             await handle.close()
+            self.metrics.streams_ended.inc(handle.labels)
             with contextlib.suppress(
                 RuntimeError,
                 ConnectionError,
@@ -174,6 +701,28 @@ class NoiseStreamManager:
 
         return response
 
+    async def _async_splice(
+        self,
+        request: web.Request,
+        response: web.StreamResponse,
+        handle: _BaseStreamHandle,
+        socket_fd: int,
+    ) -> None:
+        """Relay the worker output to the client socket with ``os.splice``.
+
+        The HTTP headers and WAV header already went through aiohttp, so the
+        worker's copy of the WAV header is dropped; the audio after it never
+        enters userspace.
+        """
+
+        relay = SpliceRelay(handle.relay_fd, socket_fd, chunked=response.chunked)
+        if len(await relay.read_exact(WAV_HEADER_SIZE)) < WAV_HEADER_SIZE:
+            return
+        transport = request.transport
+        while transport is not None and transport.get_write_buffer_size():
+            await asyncio.sleep(0.01)
+        await relay.relay(handle.activity)
+
     async def async_shutdown(self) -> None:
         """Clean up any lingering stream handles."""
 
@@ -181,6 +730,9 @@ class NoiseStreamManager:
         if handles:
             await asyncio.gather(*(handle.close() for handle in handles), return_exceptions=True)
         self._handles.clear()
+        if self._watchdog_unsub is not None:
+            self._watchdog_unsub()
+            self._watchdog_unsub = None
         if self._ha_stop_unsub is not None:
             self._ha_stop_unsub()
             self._ha_stop_unsub = None
@@ -189,77 +741,394 @@ class NoiseStreamManager:
         self._ha_stop_unsub = None
         await self.async_shutdown()
 
-    async def _create_process_handle(self, profile: NoiseStreamProfile) -> _BaseStreamHandle:
-        process = await self._launch_process(profile)
+    async def _async_watchdog(self, _now: datetime) -> None:
+        """Tear down streams whose client stopped consuming audio."""
+
+        now = asyncio.get_running_loop().time()
+        for handle in list(self._handles):
+            if handle.closed:
+                continue
+            reason = handle.activity.stall_reason(now)
+            if reason is None:
+                continue
+            _LOGGER.warning(
+                "Reaping stalled stream %s (%s)", handle.profile.slug, reason
+            )
+            handle.abort()
+            await handle.close()
+
+        await self._async_sample_usage(asyncio.get_running_loop().time())
+        await self._async_update_degradation()
+
+    async def _async_sample_usage(self, now: float) -> None:
+        """Refresh CPU and memory figures of every live worker."""
+
+        handles = [handle for handle in self._handles if not handle.closed and handle.pid]
+        if not handles:
+            return
+        samples = await self.hass.async_add_executor_job(
+            _read_proc_usages, [handle.pid for handle in handles]
+        )
+        for handle, sample in zip(handles, samples):
+            if sample is None:
+                continue
+            usage = handle.usage
+            usage.update(now, sample)
+            cost = usage.realtime_cost(handle.activity.bytes_written)
+            if cost is None or usage.over_budget or cost <= WORKER_REALTIME_COST_LIMIT:
+                continue
+            usage.over_budget = True
+            _LOGGER.warning(
+                "Worker for %s (%s) needs %.2fs of CPU per second of audio and may "
+                "fall behind real time",
+                handle.profile.slug,
+                handle.profile.kind,
+                cost,
+            )
+        _LOGGER.debug("Worker usage: %s", self.usage_summary())
+
+    async def _async_update_degradation(self) -> None:
+        """Degrade ambient streams one level at a time while the host is overloaded.
+
+        Overload is any underrun since the previous check, a load average above
+        ``DEGRADE_LOAD_HIGH`` per CPU, or a worker busy for more than
+        ``WORKER_REALTIME_COST_LIMIT`` of a core. It must last for
+        ``DEGRADE_OVERLOAD_TICKS`` checks; recovery needs a much longer calm
+        below ``DEGRADE_LOAD_LOW``, so the level does not flap.
+        """
+
+        underruns, self._recent_underruns = self._recent_underruns, 0
+        load = os.getloadavg()[0] / (os.cpu_count() or 1) if hasattr(os, "getloadavg") else 0.0
+        busy = any(
+            handle.usage.cpu_load > WORKER_REALTIME_COST_LIMIT
+            for handle in self._handles
+            if not handle.closed
+        )
+        overloaded = bool(underruns) or busy or load > DEGRADE_LOAD_HIGH
+        calm = not overloaded and load < DEGRADE_LOAD_LOW
+        self._overload_ticks = self._overload_ticks + 1 if overloaded else 0
+        self._calm_ticks = self._calm_ticks + 1 if calm else 0
+
+        level = self._degradation
+        if self._overload_ticks >= DEGRADE_OVERLOAD_TICKS and level < DEGRADE_LEVEL_LOOP:
+            level += 1
+            _LOGGER.warning(
+                "Host overloaded (%s underruns, load %.2f per CPU); degrading ambient "
+                "streams to level %s",
+                underruns,
+                load,
+                level,
+            )
+        elif self._calm_ticks >= DEGRADE_RECOVERY_TICKS and level > 0:
+            level -= 1
+            _LOGGER.info("Host load recovered; ambient streams back to level %s", level)
+        else:
+            return
+        self._degradation = level
+        self._overload_ticks = self._calm_ticks = 0
+        handles = [handle for handle in self._handles if not handle.closed and handle.degradable]
+        await asyncio.gather(
+            *(handle.async_set_degradation(level) for handle in handles),
+            return_exceptions=True,
+        )
+
+    def _on_underrun(self, labels: tuple[str, str]) -> None:
+        self._recent_underruns += 1
+        self.metrics.underruns.inc(labels)
+
+    def _record_usage(self, handle: _BaseStreamHandle) -> None:
+        """Fold the final figures of a closing worker into the per-kind totals."""
+
+        totals = self._usage_totals.setdefault(handle.profile.kind, UsageTotals())
+        totals.cpu_seconds += handle.usage.cpu_seconds
+        totals.audio_seconds += handle.activity.bytes_written / (SAMPLE_RATE * 2)
+        totals.workers += 1
+
+    def usage_summary(self) -> dict[str, dict[str, float]]:
+        """Aggregate worker CPU and memory use by profile ``type/subtype``.
+
+        ``cpu_load``, ``rss_bytes`` and ``workers`` describe live workers;
+        ``cpu_seconds``, ``audio_seconds`` and ``realtime_cost`` also include
+        workers that have already exited.
+        """
+
+        summary: dict[str, dict[str, float]] = {}
+        for kind, totals in self._usage_totals.items():
+            summary[kind] = {
+                "workers": 0,
+                "cpu_load": 0.0,
+                "rss_bytes": 0,
+                "cpu_seconds": totals.cpu_seconds,
+                "audio_seconds": totals.audio_seconds,
+            }
+        for handle in self._handles:
+            entry = summary.setdefault(
+                handle.profile.kind,
+                {
+                    "workers": 0,
+                    "cpu_load": 0.0,
+                    "rss_bytes": 0,
+                    "cpu_seconds": 0.0,
+                    "audio_seconds": 0.0,
+                },
+            )
+            entry["workers"] += 1
+            entry["cpu_load"] += handle.usage.cpu_load
+            entry["rss_bytes"] += handle.usage.rss_bytes
+            entry["cpu_seconds"] += handle.usage.cpu_seconds
+            entry["audio_seconds"] += handle.activity.bytes_written / (SAMPLE_RATE * 2)
+        for entry in summary.values():
+            audio_seconds = entry["audio_seconds"]
+            entry["realtime_cost"] = entry["cpu_seconds"] / audio_seconds if audio_seconds else 0.0
+        return summary
+
+    def _worker_counts(self, slug: str) -> tuple[int, int]:
+        """Return running plus starting workers, overall and for ``slug``."""
+
+        total = len(self._handles) + sum(self._reserved.values())
+        per_profile = self._reserved[slug] + sum(
+            1 for handle in self._handles if handle.profile.slug == slug
+        )
+        return total, per_profile
+
+    def _preemption_victim(self, profile: NoiseStreamProfile) -> _BaseStreamHandle | None:
+        """Return the oldest ambient stream an alarm profile may displace."""
+
+        if profile.priority != PRIORITY_ALARM:
+            return None
+        ambient = [
+            handle
+            for handle in self._handles
+            if handle.profile.priority == PRIORITY_AMBIENT and not handle.closed
+        ]
+        if not ambient:
+            return None
+        return min(ambient, key=lambda handle: handle.started)
+
+    async def _async_acquire_slot(self, profile: NoiseStreamProfile) -> None:
+        """Reserve a worker slot, queueing briefly before answering 503."""
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + ADMISSION_QUEUE_TIMEOUT
+        while True:
+            async with self._capacity:
+                total, per_profile = self._worker_counts(profile.slug)
+                if per_profile < self._max_workers_per_profile and total < self._max_workers:
+                    self._reserved[profile.slug] += 1
+                    return
+
+                victim = None
+                if per_profile < self._max_workers_per_profile:
+                    victim = self._preemption_victim(profile)
+                if victim is None:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        _LOGGER.warning(
+                            "Rejecting stream for %s: %s/%s workers running",
+                            profile.slug,
+                            total,
+                            self._max_workers,
+                        )
+                        raise web.HTTPServiceUnavailable(
+                            headers={"Retry-After": str(ADMISSION_RETRY_AFTER)}
+                        )
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(self._capacity.wait(), remaining)
+                    continue
+
+            _LOGGER.info(
+                "Preempting ambient stream %s for alarm profile %s",
+                victim.profile.slug,
+                profile.slug,
+            )
+            await victim.close()
+
+    async def _async_release_slot(self) -> None:
+        async with self._capacity:
+            self._capacity.notify_all()
+
+    async def _async_cancel_reservation(self, slug: str) -> None:
+        """Give back a slot reserved for a worker that is not started after all."""
+
+        self._reserved[slug] -= 1
+        await self._async_release_slot()
+
+    async def _create_process_handle(
+        self, profile: NoiseStreamProfile, options: NoiseStreamOptions, *, relay: bool = False
+    ) -> _BaseStreamHandle:
+        """Start a worker for ``profile``; a slot must already be reserved.
+
+        With ``relay`` the worker writes into a plain pipe whose non-blocking
+        read end is kept on the handle for ``os.splice``.
+        """
+
+        labels = profile.metric_labels
+        spawn_started = asyncio.get_running_loop().time()
+        relay_fd: int | None = None
+        try:
+            if relay:
+                relay_fd, write_fd = os.pipe()
+                os.set_blocking(relay_fd, False)
+                try:
+                    process = await self._launch_process(profile, options, stdout=write_fd)
+                finally:
+                    os.close(write_fd)
+            else:
+                process = await self._launch_process(profile, options)
+        except BaseException as err:
+            if relay_fd is not None:
+                os.close(relay_fd)
+            self._reserved[profile.slug] -= 1
+            if isinstance(err, Exception):
+                self.metrics.worker_spawn_failures.inc(labels)
+            await self._async_release_slot()
+            raise
+        self.metrics.worker_spawns.inc(labels)
+        self.metrics.spawn_latency.observe(
+            labels, asyncio.get_running_loop().time() - spawn_started
+        )
         stderr_task = self.hass.async_create_task(
-            self._forward_stderr(profile.slug, process),
+            self._forward_stderr(profile, process),
             name=f"noise_generator_stderr_{profile.slug}",
         )
-        return _ProcessStreamHandle(self, process, stderr_task)
+        handle = _ProcessStreamHandle(self, profile, process, stderr_task, relay_fd)
+        handle.degradable = options.degradable(profile)
+        handle.activity.on_write = functools.partial(self._on_stream_write, handle)
+        handle.activity.on_underrun = functools.partial(self._on_underrun, labels)
+        self._handles.add(handle)
+        self._reserved[profile.slug] -= 1
+        return handle
 
-    async def _launch_process(self, profile: NoiseStreamProfile) -> asyncio.subprocess.Process:
+    async def _launch_process(
+        self,
+        profile: NoiseStreamProfile,
+        options: NoiseStreamOptions,
+        stdout: int = asyncio.subprocess.PIPE,
+    ) -> asyncio.subprocess.Process:
         """Launch the subprocess that produces streaming audio."""
 
-        params = dict(profile.definition[CONF_PROFILE_PARAMETERS])
-        profile_type = profile.definition.get(CONF_PROFILE_TYPE, DEFAULT_PROFILE_TYPE)
-        profile_subtype = profile.definition.get(CONF_PROFILE_SUBTYPE, DEFAULT_PROFILE_SUBTYPE)
-        parameters_payload = json.dumps(params, separators=(",", ":"))
+        compiled = profile.compiled or compile_profile(profile.definition)
         _LOGGER.debug(
             "Launching profile slug=%s mode=%s subtype=%s params=%s",
             profile.slug,
-            profile_type,
-            profile_subtype,
-            params,
+            compiled.profile_type,
+            compiled.subtype,
+            dict(compiled.parameters),
         )
         args = [
             sys.executable,
             "-m",
             "custom_components.noise_generator.noise_process",
-            "--mode",
-            profile_type,
-            "--subtype",
-            profile_subtype,
-            "--volume",
-            str(params[CONF_VOLUME]),
+            "--profile",
+            compiled.payload,
             "--sample-rate",
             str(SAMPLE_RATE),
             "--chunk-duration",
             str(STREAM_CHUNK_DURATION),
-            "--parameters",
-            parameters_payload,
+            "--start-chunk-duration",
+            str(STREAM_START_CHUNK_DURATION),
+            "--stats",
         ]
-        seed = params.get(CONF_SEED)
-        if seed is not None:
-            args.extend(["--seed", str(seed)])
+        if options.duration > 0:
+            args.extend(
+                ["--duration", str(options.duration), "--fade-out", str(options.fade_out)]
+            )
+        if options.offset > 0:
+            args.extend(["--offset", str(options.offset)])
+        nice = self._worker_nice
+        if self._alarm_normal_priority and profile.priority == PRIORITY_ALARM:
+            nice = 0
+        if nice > 0:
+            args.extend(["--nice", str(nice)])
+        if self._worker_cpus:
+            args.extend(["--cpus", ",".join(map(str, self._worker_cpus))])
+        if self._degradation and options.degradable(profile):
+            args.extend(["--degrade", str(self._degradation)])
 
         return await asyncio.create_subprocess_exec(
             *args,
-            stdout=asyncio.subprocess.PIPE,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=stdout,
             stderr=asyncio.subprocess.PIPE,
         )
 
+    def _on_stream_write(self, handle: _BaseStreamHandle, size: int) -> None:
+        """Count served bytes and record how long the first write took to arrive."""
+
+        self.metrics.bytes_served.inc(handle.labels, size)
+        if handle.activity.bytes_written == size:
+            self.metrics.time_to_first_byte.observe(
+                handle.labels, asyncio.get_running_loop().time() - handle.requested
+            )
+
     async def _forward_stderr(
-        self, slug: str, process: asyncio.subprocess.Process
+        self, profile: NoiseStreamProfile, process: asyncio.subprocess.Process
     ) -> None:
-        """Drain stderr from the worker process for debugging."""
+        """Drain stderr from the worker process for debugging and metrics."""
 
         assert process.stderr is not None
+        labels = profile.metric_labels
         try:
             while True:
                 line = await process.stderr.readline()
                 if not line:
                     break
-                _LOGGER.debug("[%s] %s", slug, line.decode(errors="ignore").rstrip())
+                text = line.decode(errors="ignore").rstrip()
+                if text.startswith(WORKER_STATS_PREFIX):
+                    self._record_worker_stats(labels, text[len(WORKER_STATS_PREFIX) :])
+                    continue
+                _LOGGER.debug("[%s] %s", profile.slug, text)
         except asyncio.CancelledError:
             raise
 
+    def _record_worker_stats(self, labels: tuple[str, str], payload: str) -> None:
+        try:
+            stats = json.loads(payload)
+            for seconds in stats.get("chunk_seconds", []):
+                self.metrics.chunk_generation.observe(labels, float(seconds))
+        except (AttributeError, TypeError, ValueError):
+            _LOGGER.debug("Ignoring malformed worker stats: %s", payload[:200])
+
 
 class _BaseStreamHandle:
     """Protocol for stream handles."""
 
+    profile: NoiseStreamProfile
+    activity: StreamActivity
+    usage: WorkerUsage
+    pid: int | None
+    relay_fd: int | None
+    labels: tuple[str, str]
+    started: float
+    requested: float
+    degradable: bool
+    closed: bool
+
+    def attach(self, request: web.Request) -> None:  # pragma: no cover - interface only
+        raise NotImplementedError
+
+    def abort(self) -> None:  # pragma: no cover - interface only
+        raise NotImplementedError
+
+    async def read_header(self) -> bytes:  # pragma: no cover - interface only
+        raise NotImplementedError
+
     async def read_chunk(self) -> bytes:  # pragma: no cover - interface only
         raise NotImplementedError
 
+    async def async_update_parameters(
+        self, updates: dict[str, Any]
+    ) -> None:  # pragma: no cover - interface only
+        raise NotImplementedError
+
+    async def async_switch_profile(
+        self, profile: NoiseStreamProfile
+    ) -> None:  # pragma: no cover - interface only
+        raise NotImplementedError
+
+    async def async_set_degradation(self, level: int) -> None:  # pragma: no cover
+        raise NotImplementedError
+
     async def close(self) -> None:  # pragma: no cover - interface only
         raise NotImplementedError
 
@@ -270,40 +1139,261 @@ class _ProcessStreamHandle(_BaseStreamHandle):
     def __init__(
         self,
         manager: NoiseStreamManager,
+        profile: NoiseStreamProfile,
         process: asyncio.subprocess.Process,
         stderr_task: asyncio.Task[None],
+        relay_fd: int | None = None,
     ) -> None:
         self._manager = manager
+        self.profile = profile
+        self.parameters: dict[str, Any] = dict(profile.definition[CONF_PROFILE_PARAMETERS])
         self._process = process
         self._stderr_task = stderr_task
         self._stdout = process.stdout
         self._closed = False
+        self.labels = profile.metric_labels
+        self.started = asyncio.get_running_loop().time()
+        self.requested = self.started
+        self.activity = StreamActivity()
+        self.usage = WorkerUsage()
+        self.pid: int | None = process.pid
+        self.relay_fd = relay_fd
+        self.degradable = False
+        self._request_task: asyncio.Task[Any] | None = None
+        self._transport: asyncio.BaseTransport | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def attach(self, request: web.Request) -> None:
+        """Remember the request so the watchdog can abort it."""
+
+        self._request_task = asyncio.current_task()
+        self._transport = request.transport
+
+    def abort(self) -> None:
+        """Drop the client connection and cancel the request handler."""
+
+        if self._transport is not None:
+            self._transport.abort()
+        task = self._request_task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+
+    async def read_header(self) -> bytes:
+        """Read the WAV header the worker writes before its audio."""
+
+        if self._stdout is None or self._closed:
+            return b""
+        return await self._stdout.readexactly(WAV_HEADER_SIZE)
 
     async def read_chunk(self) -> bytes:
         if self._stdout is None or self._closed:
             return b""
         return await self._stdout.read(STDOUT_READ_SIZE)
 
+    async def async_update_parameters(self, updates: dict[str, Any]) -> None:
+        """Normalise the merged parameters and hand the updated ones to the worker.
+
+        Only the keys in ``updates`` are sent and the worker merges them, so a
+        volume change does not redesign filters or restart other ramps.
+        """
+
+        cleaned = coerce_profile(
+            {
+                CONF_PROFILE_TYPE: self.profile.definition.get(CONF_PROFILE_TYPE),
+                CONF_PROFILE_SUBTYPE: self.profile.definition.get(CONF_PROFILE_SUBTYPE),
+                CONF_PROFILE_PARAMETERS: {**self.parameters, **updates},
+            }
+        )
+        self.parameters = cleaned[CONF_PROFILE_PARAMETERS]
+        changed = {key: self.parameters[key] for key in updates if key in self.parameters}
+        if changed:
+            await self._send_control({"parameters": changed})
+
+    async def async_switch_profile(self, profile: NoiseStreamProfile) -> None:
+        """Crossfade the worker into a new profile definition.
+
+        Live overrides from ``async_update_parameters`` are dropped.
+        """
+
+        self.profile = profile
+        self.parameters = dict(profile.definition[CONF_PROFILE_PARAMETERS])
+        compiled = profile.compiled or compile_profile(profile.definition)
+        await self._send_control(
+            {
+                "profile": compiled.worker_definition,
+                "crossfade": PROFILE_CROSSFADE_DURATION,
+            }
+        )
+
+    async def async_set_degradation(self, level: int) -> None:
+        """Ask the worker to render at a cheaper level; 0 restores full quality."""
+
+        await self._send_control({"degrade": level})
+
+    async def _send_control(self, message: dict[str, Any]) -> None:
+        stdin = self._process.stdin
+        if self._closed or stdin is None or stdin.is_closing():
+            return
+        stdin.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        with contextlib.suppress(ConnectionError):
+            await stdin.drain()
+
+    async def _async_reap(self) -> None:
+        """Wait for the worker to exit, discarding output nobody will read.
+
+        ``Process.wait`` also waits for the stdout pipe to close, which never
+        happens while a full, unread pipe keeps reading paused.
+        """
+
+        if self._stdout is not None:
+            # A request handler that is being cancelled may still own the reader.
+            with contextlib.suppress(RuntimeError):
+                while await self._stdout.read(STDOUT_READ_SIZE):
+                    pass
+        await self._process.wait()
+
     async def close(self) -> None:
         if self._closed:
             return
         self._closed = True
 
         process = self._process
+        if process.stdin is not None:
+            process.stdin.close()
         if process.returncode is None:
             process.terminate()
             try:
-                await asyncio.wait_for(process.wait(), timeout=5)
+                await asyncio.wait_for(self._async_reap(), timeout=5)
             except asyncio.TimeoutError:
                 process.kill()
-                await process.wait()
+                await self._async_reap()
 
         self._stdout = None
+        if self.relay_fd is not None:
+            os.close(self.relay_fd)
+            self.relay_fd = None
         if self._stderr_task:
             self._stderr_task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
                 await self._stderr_task
+        self._manager._record_usage(self)
         self._manager._handles.discard(self)
+        await self._manager._async_release_slot()
+
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _read_proc_usage(pid: int) -> tuple[float, int, int, int] | None:
+    """Return CPU seconds, RSS bytes and context switches of ``pid`` on Linux."""
+
+    try:
+        with open(f"/proc/{pid}/stat", encoding="ascii") as stat_file:
+            stat = stat_file.read()
+        with open(f"/proc/{pid}/status", encoding="ascii") as status_file:
+            status = status_file.read()
+    except OSError:
+        return None
+
+    # The command name may contain spaces; fields resume after its ")".
+    fields = stat[stat.rfind(")") + 2 :].split()
+    cpu_seconds = (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+    values: dict[str, int] = {}
+    for line in status.splitlines():
+        key, _, value = line.partition(":")
+        if key in ("VmRSS", "voluntary_ctxt_switches", "nonvoluntary_ctxt_switches"):
+            values[key] = int(value.split()[0])
+    return (
+        cpu_seconds,
+        values.get("VmRSS", 0) * 1024,
+        values.get("voluntary_ctxt_switches", 0),
+        values.get("nonvoluntary_ctxt_switches", 0),
+    )
+
+
+def _read_proc_usages(pids: list[int]) -> list[tuple[float, int, int, int] | None]:
+    return [_read_proc_usage(pid) for pid in pids]
+
+
+def _resolve_mix_layers(
+    definition: dict[str, Any], definitions: Mapping[str, dict[str, Any]]
+) -> None:
+    """Embed the audio definition of every profile a mix refers to.
+
+    Layers are matched by slug or display name; mixes cannot nest, and
+    layers that do not resolve are dropped with a warning.
+    """
+
+    by_name = {
+        candidate[CONF_PROFILE_NAME].casefold(): candidate for candidate in definitions.values()
+    }
+    resolved = []
+    for layer in definition[CONF_PROFILE_PARAMETERS].get(CONF_MIX_LAYERS, []):
+        reference = layer[CONF_MIX_PROFILE]
+        target = (
+            definitions.get(reference)
+            or definitions.get(slugify(reference))
+            or by_name.get(reference.casefold())
+        )
+        if target is None or target[CONF_PROFILE_TYPE] == "mix":
+            _LOGGER.warning(
+                "Mix %s: layer %s does not name a noise or tonal profile",
+                definition[CONF_PROFILE_NAME],
+                reference,
+            )
+            continue
+        resolved.append(
+            {
+                **layer,
+                CONF_MIX_DEFINITION: {
+                    key: value for key, value in target.items() if key != CONF_PROFILE_NAME
+                },
+            }
+        )
+    definition[CONF_PROFILE_PARAMETERS][CONF_MIX_LAYERS] = resolved
+
+
+async def _async_client_listening(request: web.Request) -> bool:
+    """Return whether the client takes the WAV header and stays to hear more.
+
+    Probing clients read the headers and hang up at once; players keep the
+    connection open while they wait for audio. The client must still be
+    connected after ``STREAM_PROBE_WINDOW`` and have acknowledged everything
+    sent so far, which a client that stopped reading eventually can't do.
+    Clients that have not done so within ``STREAM_PROBE_TIMEOUT`` count as
+    probes. Where the send queue can't be inspected, only the connection is
+    checked.
+    """
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    while True:
+        transport = request.transport
+        if transport is None or transport.is_closing():
+            return False
+        elapsed = loop.time() - started
+        if elapsed >= STREAM_PROBE_WINDOW and not unacknowledged_bytes(transport):
+            return True
+        if elapsed >= STREAM_PROBE_TIMEOUT:
+            return False
+        await asyncio.sleep(STREAM_PROBE_POLL)
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    """Return True if an If-None-Match header matches ``etag``."""
+
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
 
 
 def _coerce_seed(seed: Any | None) -> Any | None:
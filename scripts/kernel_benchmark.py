@@ -0,0 +1,102 @@
+"""Compare the Numba kernels with the pure Python sample loops.
+
+Every measurement runs in a fresh interpreter, once with the kernels and
+once with ``NUMBA_DISABLE_JIT=1`` (the path taken without Numba). A warm-up
+run fills the on-disk compilation cache first, so the load time reflects a
+worker after the first one; streaming workers load the kernels in the
+background after their first chunk. For each colour the table shows the
+kernel load time (importing Numba and compiling or loading every kernel,
+which ``load()`` does before the kernels are used), the render cost per
+second of audio, and whether both paths produced identical PCM.
+
+Example::
+
+    python scripts/kernel_benchmark.py --seconds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Loads the generator modules without the Home Assistant package __init__.
+CHILD = """
+import hashlib, json, sys, time, types
+for name, path in (("custom_components", "custom_components"),
+                   ("custom_components.noise_generator", "custom_components/noise_generator")):
+    module = types.ModuleType(name)
+    module.__path__ = [sys.argv[1] + "/" + path]
+    sys.modules[name] = module
+from custom_components.noise_generator.const import SAMPLE_RATE
+from custom_components.noise_generator.kernels import load
+from custom_components.noise_generator.noise import create_generator, pack_samples
+subtype, seconds = sys.argv[2], float(sys.argv[3])
+started = time.perf_counter()
+kernels = load()
+loading = time.perf_counter() - started
+generator = create_generator("color_noise", subtype, 0.5, 1234, {})
+digest = hashlib.sha256()
+chunk = SAMPLE_RATE // 2
+begin = time.process_time()
+for _ in range(int(seconds * 2)):
+    digest.update(pack_samples(generator.next_samples(chunk)))
+render = time.process_time() - begin
+print(json.dumps({"kernels": kernels is not None, "load": loading,
+                  "render": render / seconds, "digest": digest.hexdigest()}))
+"""
+
+
+def _measure(subtype: str, seconds: float, *, jit: bool) -> dict[str, object]:
+    env = dict(os.environ)
+    if jit:
+        env.pop("NUMBA_DISABLE_JIT", None)
+    else:
+        env["NUMBA_DISABLE_JIT"] = "1"
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, str(ROOT), subtype, str(seconds)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=10.0, help="audio rendered per run")
+    parser.add_argument(
+        "--subtypes", nargs="+", default=["white", "pink", "brown"], help="colours to run"
+    )
+    args = parser.parse_args(argv)
+
+    if not _measure("white", 0.5, jit=True)["kernels"]:
+        print("Numba is not installed; only the Python loops can be measured")
+        return
+    for subtype in args.subtypes:
+        _measure(subtype, 0.5, jit=True)
+
+    print(
+        f"{'colour':>7} {'load ms':>9} {'ms CPU/s':>9} {'ms CPU/s':>9} "
+        f"{'speed-up':>9} {'same PCM':>9}"
+    )
+    print(f"{'':>7} {'numba':>9} {'python':>9} {'numba':>9}")
+    for subtype in args.subtypes:
+        python = _measure(subtype, args.seconds, jit=False)
+        numba = _measure(subtype, args.seconds, jit=True)
+        print(
+            f"{subtype:>7} {numba['load'] * 1000:>9.1f} "
+            f"{python['render'] * 1000:>9.1f} {numba['render'] * 1000:>9.1f} "
+            f"{python['render'] / numba['render']:>8.1f}x "
+            f"{'yes' if python['digest'] == numba['digest'] else 'NO':>9}"
+        )
+
+
+if __name__ == "__main__":
+    main()
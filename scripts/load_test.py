@@ -0,0 +1,416 @@
+"""Concurrent-listener load test for the Noise Generator stream view.
+
+Runs ``NoiseStreamView`` and ``NoiseStreamManager`` on an aiohttp test server
+with a stub ``hass`` object, so no Home Assistant instance is needed (the
+``homeassistant`` and ``aiohttp`` packages must still be importable, as in any
+integration development environment). Each step opens N simulated speakers
+that prebuffer, then read at the real-time PCM rate, occasionally disconnect
+and reconnect, and reports per step:
+
+* time to first audio byte (p50/p95/max) and admission rejections,
+* sustained throughput and buffer underruns seen by the speakers,
+* host CPU, CPU of this process (the event loop), and live worker count,
+* event-loop lag (p99/max) measured by a 50 ms ticker.
+
+The speakers share the event loop with the server, so loop lag and process
+CPU are slightly pessimistic compared with a real installation.
+
+Example::
+
+    python scripts/load_test.py --listeners 10,20,50 --duration 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector, web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+from custom_components.noise_generator import stream  # noqa: E402
+from custom_components.noise_generator.const import (  # noqa: E402
+    CONF_MAX_WORKERS,
+    CONF_MAX_WORKERS_PER_PROFILE,
+    CONF_PROFILE_NAME,
+    CONF_PROFILE_PARAMETERS,
+    CONF_PROFILE_SUBTYPE,
+    CONF_PROFILE_TYPE,
+    CONF_VOLUME,
+    DOMAIN,
+    SAMPLE_RATE,
+    STREAM_URL_PATH,
+    TONAL_SUBTYPES,
+    WAV_HEADER_SIZE,
+)
+
+BYTE_RATE = SAMPLE_RATE * 2
+ENTRY_ID = "load_test"
+LAG_INTERVAL = 0.05
+SAMPLE_INTERVAL = 0.5
+
+
+class _StubBus:
+    def async_listen_once(self, _event: str, _callback: Any):
+        return lambda: None
+
+
+class StubHass:
+    """The subset of ``HomeAssistant`` the stream manager touches."""
+
+    def __init__(self, base_url: str = "") -> None:
+        self.data: dict[str, Any] = {}
+        self.bus = _StubBus()
+        self.base_url = base_url
+
+    def async_create_task(self, target, name: str | None = None) -> asyncio.Task:
+        return asyncio.get_running_loop().create_task(target, name=name)
+
+    async def async_add_executor_job(self, target, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+
+def _track_time_interval(_hass: StubHass, action, interval: timedelta):
+    async def _run() -> None:
+        while True:
+            await asyncio.sleep(interval.total_seconds())
+            await action(datetime.now())
+
+    task = asyncio.get_running_loop().create_task(_run())
+    return task.cancel
+
+
+async def _get_url(hass: StubHass, **_kwargs: Any) -> str:
+    return hass.base_url
+
+
+# The manager only needs these two helpers from a running instance.
+stream.async_track_time_interval = _track_time_interval
+stream.async_get_url = _get_url
+
+
+@dataclass
+class StepStats:
+    """Measurements collected while one step is running."""
+
+    listeners: int
+    ttfb: list[float] = field(default_factory=list)
+    statuses: dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    sessions: int = 0
+    underruns: int = 0
+    bytes_received: int = 0
+    listen_seconds: float = 0.0
+    loop_lag: list[float] = field(default_factory=list)
+    workers: list[int] = field(default_factory=list)
+
+
+def _host_cpu_times() -> tuple[float, float] | None:
+    """Return ``(busy, total)`` jiffies from /proc/stat, if available."""
+
+    try:
+        with open("/proc/stat", encoding="ascii") as handle:
+            fields = [float(value) for value in handle.readline().split()[1:]]
+    except OSError:
+        return None
+    idle = fields[3] + (fields[4] if len(fields) > 4 else 0.0)
+    total = sum(fields)
+    return total - idle, total
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return math.nan
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def _listen(
+    session: ClientSession,
+    url: str,
+    stats: StepStats,
+    until: float,
+    prebuffer: float,
+) -> None:
+    """Play one stream like a speaker: prebuffer, then consume in real time."""
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    stats.sessions += 1
+    async with session.get(url) as response:
+        stats.statuses[response.status] = stats.statuses.get(response.status, 0) + 1
+        if response.status != 200:
+            await response.read()
+            return
+        # The WAV header is sent before the worker starts; time the audio.
+        first = b""
+        while len(first) <= WAV_HEADER_SIZE:
+            chunk = await response.content.readany()
+            if not chunk:
+                return
+            first += chunk
+        first_byte = loop.time()
+        stats.ttfb.append(first_byte - started)
+        received = len(first)
+        buffer_bytes = prebuffer * BYTE_RATE
+        consumed = 0.0
+        playing_since: float | None = None
+        try:
+            while loop.time() < until:
+                now = loop.time()
+                if playing_since is None:
+                    if received - consumed >= buffer_bytes:
+                        playing_since = now
+                else:
+                    played = consumed + (now - playing_since) * BYTE_RATE
+                    if played > received:
+                        # The device ran dry; it re-buffers before playing again.
+                        stats.underruns += 1
+                        consumed = received
+                        playing_since = None
+                    elif received - played >= buffer_bytes:
+                        # Buffer full: only read what playback frees up.
+                        await asyncio.sleep((received - played - buffer_bytes) / BYTE_RATE + 0.01)
+                        continue
+                chunk = await response.content.readany()
+                if not chunk:
+                    break
+                received += len(chunk)
+        finally:
+            stats.bytes_received += received
+            stats.listen_seconds += loop.time() - first_byte
+
+
+async def _speaker(
+    session: ClientSession,
+    url: str,
+    stats: StepStats,
+    stop_at: float,
+    rng: random.Random,
+    args: argparse.Namespace,
+) -> None:
+    """Keep one speaker connected, with churn and reconnects, until ``stop_at``."""
+
+    loop = asyncio.get_running_loop()
+    await asyncio.sleep(rng.uniform(0, args.ramp))
+    while loop.time() < stop_at:
+        length = rng.expovariate(1 / args.session) if args.session > 0 else math.inf
+        until = min(stop_at, loop.time() + length)
+        try:
+            await _listen(session, url, stats, until, args.prebuffer)
+        except Exception as err:  # noqa: BLE001 - count it and keep the speaker going
+            stats.errors += 1
+            if args.verbose:
+                print(f"  listener error: {err!r}", file=sys.stderr)
+        await asyncio.sleep(rng.uniform(0, args.reconnect_delay))
+
+
+async def _monitor(
+    manager: stream.NoiseStreamManager, stats: StepStats, stop_at: float
+) -> None:
+    """Sample loop lag and the live worker count while a step runs."""
+
+    loop = asyncio.get_running_loop()
+    next_sample = loop.time()
+    while loop.time() < stop_at:
+        expected = loop.time() + LAG_INTERVAL
+        await asyncio.sleep(LAG_INTERVAL)
+        stats.loop_lag.append(max(0.0, loop.time() - expected))
+        if loop.time() >= next_sample:
+            stats.workers.append(len(manager._handles))
+            next_sample += SAMPLE_INTERVAL
+
+
+def _profiles(names: list[str]) -> list[dict[str, Any]]:
+    profiles = []
+    for name in names:
+        profile_type = "tonal_noise" if name in TONAL_SUBTYPES else "color_noise"
+        profiles.append(
+            {
+                CONF_PROFILE_NAME: name,
+                CONF_PROFILE_TYPE: profile_type,
+                CONF_PROFILE_SUBTYPE: name,
+                CONF_PROFILE_PARAMETERS: {CONF_VOLUME: 0.5},
+            }
+        )
+    return profiles
+
+
+async def _run_step(
+    server: TestServer,
+    manager: stream.NoiseStreamManager,
+    listeners: int,
+    args: argparse.Namespace,
+) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    stats = StepStats(listeners=listeners)
+    slugs = [profile.slug for profile in manager.iter_profiles()]
+    rng = random.Random(args.seed + listeners)
+
+    host_before = _host_cpu_times()
+    cpu_before = time.process_time()
+    wall_before = loop.time()
+    stop_at = wall_before + args.ramp + args.duration
+
+    connector = TCPConnector(limit=0)
+    timeout = ClientTimeout(total=None, sock_read=args.read_timeout)
+    async with ClientSession(connector=connector, timeout=timeout) as session:
+        speakers = [
+            _speaker(
+                session,
+                str(server.make_url(f"{STREAM_URL_PATH}/{ENTRY_ID}/{slugs[index % len(slugs)]}")),
+                stats,
+                stop_at,
+                random.Random(rng.random()),
+                args,
+            )
+            for index in range(listeners)
+        ]
+        await asyncio.gather(_monitor(manager, stats, stop_at), *speakers)
+
+    wall = loop.time() - wall_before
+    host_after = _host_cpu_times()
+    host_cpu = math.nan
+    if host_before and host_after and host_after[1] > host_before[1]:
+        host_cpu = (host_after[0] - host_before[0]) / (host_after[1] - host_before[1])
+
+    # Let closing workers drain before the next step starts.
+    while manager._handles:
+        await asyncio.sleep(0.1)
+
+    return {
+        "listeners": listeners,
+        "sessions": stats.sessions,
+        "statuses": stats.statuses,
+        "errors": stats.errors,
+        "ttfb_p50_ms": _percentile(stats.ttfb, 0.5) * 1000,
+        "ttfb_p95_ms": _percentile(stats.ttfb, 0.95) * 1000,
+        "ttfb_max_ms": max(stats.ttfb, default=math.nan) * 1000,
+        "throughput_mb_s": stats.bytes_received / wall / 1e6,
+        "realtime_ratio": (
+            stats.bytes_received / (stats.listen_seconds * BYTE_RATE)
+            if stats.listen_seconds
+            else math.nan
+        ),
+        "underruns": stats.underruns,
+        "host_cpu_pct": host_cpu * 100,
+        "loop_process_cpu_pct": (time.process_time() - cpu_before) / wall * 100,
+        "workers_mean": statistics.fmean(stats.workers) if stats.workers else 0.0,
+        "workers_max": max(stats.workers, default=0),
+        "loop_lag_p99_ms": _percentile(stats.loop_lag, 0.99) * 1000,
+        "loop_lag_max_ms": max(stats.loop_lag, default=math.nan) * 1000,
+        "worker_usage": manager.usage_summary(),
+    }
+
+
+def _print_row(result: dict[str, Any]) -> None:
+    rejected = sum(count for status, count in result["statuses"].items() if status != 200)
+    print(
+        f"{result['listeners']:>5} "
+        f"{result['ttfb_p50_ms']:>8.0f} {result['ttfb_p95_ms']:>8.0f} "
+        f"{result['throughput_mb_s']:>7.2f} {result['realtime_ratio']:>6.2f} "
+        f"{result['underruns']:>5} {rejected + result['errors']:>5} "
+        f"{result['host_cpu_pct']:>6.1f} {result['loop_process_cpu_pct']:>6.1f} "
+        f"{result['workers_max']:>4} "
+        f"{result['loop_lag_p99_ms']:>7.1f} {result['loop_lag_max_ms']:>7.1f}",
+        flush=True,
+    )
+
+
+async def _main(args: argparse.Namespace) -> list[dict[str, Any]]:
+    steps = [int(value) for value in args.listeners.split(",")]
+    hass = StubHass()
+    manager = stream.NoiseStreamManager(hass, ENTRY_ID)
+    limit = args.max_workers or max(steps)
+    manager.update_settings(
+        {CONF_MAX_WORKERS: limit, CONF_MAX_WORKERS_PER_PROFILE: limit}
+    )
+    manager.update_profiles(_profiles(args.profiles.split(",")))
+    hass.data[DOMAIN] = {"entries": {ENTRY_ID: {"manager": manager}}}
+
+    view = stream.NoiseStreamView(hass)
+
+    async def _handle(request: web.Request) -> web.StreamResponse:
+        return await view.get(request, **request.match_info)
+
+    app = web.Application()
+    app.router.add_get(view.url, _handle)
+    server = TestServer(app)
+    await server.start_server()
+    hass.base_url = str(server.make_url("")).rstrip("/")
+
+    if not args.json:
+        print(
+            f"{'N':>5} {'ttfb50':>8} {'ttfb95':>8} {'MB/s':>7} {'rt':>6} "
+            f"{'under':>5} {'fail':>5} {'host%':>6} {'loop%':>6} {'wrk':>4} "
+            f"{'lag99':>7} {'lagmax':>7}"
+        )
+    results = []
+    try:
+        for listeners in steps:
+            result = await _run_step(server, manager, listeners, args)
+            results.append(result)
+            if not args.json:
+                _print_row(result)
+    finally:
+        await manager.async_shutdown()
+        await server.close()
+    return results
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--listeners", default="1,5,10,20,50", help="comma separated listener counts per step"
+    )
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per step")
+    parser.add_argument(
+        "--ramp", type=float, default=2.0, help="seconds over which listeners connect"
+    )
+    parser.add_argument(
+        "--session", type=float, default=20.0, help="mean session length in seconds, 0 = no churn"
+    )
+    parser.add_argument(
+        "--reconnect-delay", type=float, default=1.0, help="max pause before reconnecting"
+    )
+    parser.add_argument(
+        "--prebuffer", type=float, default=2.0, help="seconds of audio a speaker buffers"
+    )
+    parser.add_argument(
+        "--profiles", default="white,pink,brown", help="comma separated subtypes to stream"
+    )
+    parser.add_argument(
+        "--max-workers", type=int, default=0, help="worker cap, default the largest step"
+    )
+    parser.add_argument("--read-timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--verbose", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    # Workers are started as ``python -m custom_components.noise_generator...``.
+    os.chdir(ROOT)
+    results = asyncio.run(_main(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
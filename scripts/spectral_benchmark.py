@@ -0,0 +1,289 @@
+"""Check that every noise colour still has the spectrum it is meant to have.
+
+Each colour is rendered from a fixed seed at full volume, and its power
+spectral density is estimated with Welch's method (Hann-windowed segments,
+50 % overlap). A straight line fitted to the density in dB over log2 of the
+frequency gives the slope in dB per octave, which is compared with the
+target: 0 for white, -3 for pink, -6 for brown and the configured slope for
+custom noise. Custom noise must also be 3 dB below that line at both
+cutoffs, and parametric EQ must match its designed response relative to the
+same base noise rendered without the bands, in sixth-octave bands because
+the two renders do not share their random values. DC offset, clipping rate and RMS
+level are reported next to the render cost per second of audio.
+
+The script exits with status 1 if any check fails, so it can gate a
+rewrite of the synthesis code. It uses the Numba kernels when Numba is
+installed; set ``NUMBA_DISABLE_JIT=1`` to check the Python loops instead.
+NumPy is needed for the spectral estimate.
+
+Example::
+
+    python scripts/spectral_benchmark.py --seconds 60 --slope -4.5 --low 100 --high 6000
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Load the generator modules without the Home Assistant package __init__.
+for _name, _path in (
+    ("custom_components", "custom_components"),
+    ("custom_components.noise_generator", "custom_components/noise_generator"),
+):
+    _module = types.ModuleType(_name)
+    _module.__path__ = [str(ROOT / _path)]
+    sys.modules.setdefault(_name, _module)
+
+from custom_components.noise_generator.const import (  # noqa: E402
+    CONF_CUSTOM_HIGH_CUTOFF,
+    CONF_CUSTOM_LOW_CUTOFF,
+    CONF_CUSTOM_SLOPE,
+    CONF_EQ_BANDS,
+    CONF_EQ_BASE,
+    SAMPLE_RATE,
+    SPECTRAL_BLOCK_SIZE,
+)
+from custom_components.noise_generator.eq import design_bands  # noqa: E402
+from custom_components.noise_generator.kernels import load as load_kernels  # noqa: E402
+from custom_components.noise_generator.noise import (  # noqa: E402
+    create_generator,
+    custom_design,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TARGET_SLOPES = {"white": 0.0, "pink": -3.0, "brown": -6.0}
+# Fit ranges in Hz. Brown noise is a leaky integrator: flat below about
+# 140 Hz, and the discrete integrator bends away from -6 dB/oct near Nyquist.
+FIT_RANGES = {"white": (50.0, 16000.0), "pink": (50.0, 16000.0), "brown": (600.0, 6000.0)}
+
+SLOPE_TOLERANCE = 0.25  # dB/oct over two octaves or more
+CUTOFF_TOLERANCE = 1.0  # dB around the -3 dB corner
+EQ_TOLERANCE = 1.0  # dB per sixth-octave band, where the response is above EQ_FLOOR
+EQ_FLOOR = -12.0
+DC_LIMIT = 0.01  # of full scale
+CLIP_LIMIT = 1e-4  # fraction of samples at or beyond full scale
+
+EQ_PARAMETERS = {
+    CONF_EQ_BASE: "pink",
+    CONF_EQ_BANDS: [
+        {"type": "low_shelf", "frequency": 80, "gain": -6, "q": 0.7},
+        {"type": "peak", "frequency": 1000, "gain": -9, "q": 2},
+        {"type": "high_shelf", "frequency": 8000, "gain": 4, "q": 0.7},
+        {"type": "notch", "frequency": 60, "gain": 0, "q": 10},
+    ],
+}
+
+
+def _render(subtype: str, seconds: float, seed: int, volume: float, parameters: dict):
+    """Return the rendered samples and the CPU seconds spent per audio second."""
+
+    generator = create_generator("color_noise", subtype, volume, seed, parameters)
+    chunk = SAMPLE_RATE // 2
+    blocks = []
+    begin = time.process_time()
+    for _ in range(max(1, int(seconds * 2))):
+        blocks.append(generator.next_samples(chunk))
+    render = time.process_time() - begin
+    samples = np.array([sample for block in blocks for sample in block])
+    return samples, render / (len(samples) / SAMPLE_RATE)
+
+
+def welch(samples, size: int):
+    """Return ``(frequencies, density)`` of a one-sided Welch estimate."""
+
+    window = np.hanning(size)
+    step = size // 2
+    frames = np.lib.stride_tricks.sliding_window_view(samples, size)[::step]
+    total = np.zeros(size // 2 + 1)
+    for start in range(0, len(frames), 64):
+        spectra = np.fft.rfft(frames[start : start + 64] * window, axis=1)
+        total += np.sum(spectra.real**2 + spectra.imag**2, axis=0)
+    density = total / (len(frames) * SAMPLE_RATE * np.sum(window**2))
+    density[1:-1] *= 2
+    return np.fft.rfftfreq(size, 1 / SAMPLE_RATE), density
+
+
+def _band_levels(frequencies, density, low: float, high: float, per_octave: int = 6):
+    """Return log2 band centres and mean levels in dB of fractional-octave bands."""
+
+    octaves = math.log2(high / low)
+    edges = low * 2.0 ** (np.arange(int(octaves * per_octave) + 1) / per_octave)
+    centres, levels = [], []
+    for lower, upper in zip(edges[:-1], edges[1:]):
+        selected = density[(frequencies >= lower) & (frequencies < upper)]
+        if len(selected):
+            centres.append(math.log2(math.sqrt(lower * upper)))
+            levels.append(10 * math.log10(float(np.mean(selected))))
+    return np.array(centres), np.array(levels)
+
+
+def fit_slope(frequencies, density, low: float, high: float) -> tuple[float, float]:
+    """Return the ``(slope, intercept)`` in dB per octave over ``[low, high]`` Hz."""
+
+    centres, levels = _band_levels(frequencies, density, low, high)
+    slope, intercept = np.polyfit(centres, levels, 1)
+    return float(slope), float(intercept)
+
+
+def _level_at(frequencies, density, frequency: float) -> float:
+    """Return the mean level in dB over the sixth of an octave centred on ``frequency``."""
+
+    _, levels = _band_levels(
+        frequencies, density, frequency * 2 ** (-1 / 12), frequency * 2 ** (1 / 12)
+    )
+    if len(levels):
+        return float(levels[0])
+    return 10 * math.log10(float(np.interp(frequency, frequencies, density)))
+
+
+def _eq_response(frequencies, coefficients):
+    """Return the designed power response in dB of a biquad cascade."""
+
+    z = np.exp(-2j * np.pi * frequencies / SAMPLE_RATE)
+    response = np.ones(len(frequencies), dtype=complex)
+    for b0, b1, b2, a1, a2 in coefficients:
+        response *= (b0 + b1 * z + b2 * z * z) / (1 + a1 * z + a2 * z * z)
+    return 10 * np.log10(np.maximum(np.abs(response) ** 2, 1e-30))
+
+
+def check(subtype: str, args: argparse.Namespace) -> dict[str, object]:
+    """Render one colour and return its measurements and failed checks."""
+
+    parameters: dict = {}
+    if subtype == "custom":
+        parameters = {
+            CONF_CUSTOM_SLOPE: args.slope,
+            CONF_CUSTOM_LOW_CUTOFF: args.low,
+            CONF_CUSTOM_HIGH_CUTOFF: args.high,
+        }
+    elif subtype == "eq":
+        parameters = EQ_PARAMETERS
+
+    samples, render = _render(subtype, args.seconds, args.seed, args.volume, parameters)
+    frequencies, density = welch(samples, args.segment)
+    result: dict[str, object] = {
+        "render": render,
+        "dc": float(np.mean(samples)),
+        "clipped": float(np.mean(np.abs(samples) >= 1.0)),
+        "rms": 20 * math.log10(max(float(np.sqrt(np.mean(samples**2))), 1e-12)),
+        "notes": [],
+        "failures": [],
+    }
+    notes, failures = result["notes"], result["failures"]
+
+    fit_density = density
+    resolved = 8 * SAMPLE_RATE / args.segment, SAMPLE_RATE / 2 ** (13 / 12)
+    if subtype == "custom":
+        target, low, high, order = custom_design(parameters)
+        # The shaper's own blocks smear the response over a few of their bins.
+        resolved = max(resolved[0], 8 * SAMPLE_RATE / SPECTRAL_BLOCK_SIZE), resolved[1]
+        # Divide out the Butterworth corners so the tilt is fitted right up to them.
+        poles = 2 * order
+        positive = np.maximum(frequencies, 1.0)
+        fit_density = density * (1 + (low / positive) ** poles) * (1 + (positive / high) ** poles)
+        fit_low, fit_high = max(low, resolved[0]), min(high, resolved[1])
+    elif subtype == "eq":
+        target = None
+        base = str(parameters[CONF_EQ_BASE])
+        reference, _ = _render(base, args.seconds, args.seed, args.volume, {})
+        _, base_density = welch(reference, args.segment)
+        designed = 10 ** (_eq_response(frequencies, design_bands(parameters[CONF_EQ_BANDS])) / 10)
+        _, measured = _band_levels(frequencies, density, 30, 16000)
+        _, expected = _band_levels(frequencies, base_density * designed, 30, 16000)
+        _, response = _band_levels(frequencies, designed, 30, 16000)
+        audible = response > EQ_FLOOR
+        error = float(np.max(np.abs(measured[audible] - expected[audible])))
+        notes.append(f"EQ error {error:.2f} dB")
+        if error > EQ_TOLERANCE:
+            failures.append(f"EQ response off by {error:.2f} dB")
+    else:
+        target = TARGET_SLOPES[subtype]
+        fit_low, fit_high = FIT_RANGES[subtype]
+
+    result["target"] = target
+    result["slope"] = None
+    if target is not None and fit_high < fit_low * 2 ** (1 / 3):
+        notes.append("passband too narrow to fit a slope")
+    elif target is not None:
+        slope, intercept = fit_slope(frequencies, fit_density, fit_low, fit_high)
+        result["slope"] = slope
+        # Fits over less than two octaves are allowed proportionally more error.
+        tolerance = SLOPE_TOLERANCE * max(1.0, 2.0 / math.log2(fit_high / fit_low))
+        if abs(slope - target) > tolerance:
+            failures.append(f"slope {slope:+.2f} dB/oct, expected {target:+.2f}")
+    if result["slope"] is not None and subtype == "custom":
+        for name, corner in (("low", low), ("high", high)):
+            # Corners near Nyquist, or within a few bins of DC, cannot be resolved.
+            if not resolved[0] < corner < resolved[1]:
+                continue
+            drop = _level_at(frequencies, density, corner) - (
+                slope * math.log2(corner) + intercept
+            )
+            notes.append(f"{name} cutoff {drop:+.1f} dB")
+            if abs(drop + 3.0) > CUTOFF_TOLERANCE:
+                failures.append(f"{name} cutoff at {drop:+.1f} dB, expected -3.0")
+
+    if abs(result["dc"]) > DC_LIMIT:
+        failures.append(f"DC offset {result['dc']:+.4f}")
+    if result["clipped"] > CLIP_LIMIT:
+        failures.append(f"{result['clipped']:.3%} of samples clipped")
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio rendered per colour")
+    parser.add_argument(
+        "--subtypes",
+        nargs="+",
+        default=["white", "pink", "brown", "custom", "eq"],
+        help="colours to check",
+    )
+    parser.add_argument("--seed", type=int, default=1234, help="seed of every render")
+    parser.add_argument("--volume", type=float, default=1.0, help="profile volume")
+    parser.add_argument("--segment", type=int, default=16384, help="Welch segment length")
+    parser.add_argument("--slope", type=float, default=-4.5, help="custom slope in dB/oct")
+    parser.add_argument("--low", type=float, default=100.0, help="custom low cutoff in Hz")
+    parser.add_argument("--high", type=float, default=6000.0, help="custom high cutoff in Hz")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("NumPy is not installed; it is needed for the spectral estimate")
+        return 2
+    loops = "Numba" if load_kernels() is not None else "Python"
+    print(f"Rendering {args.seconds:g} s per colour with the {loops} sample loops")
+
+    print(
+        f"{'colour':>7} {'target':>7} {'slope':>7} {'DC':>8} {'clipped':>8} "
+        f"{'RMS dBFS':>9} {'ms CPU/s':>9}  result"
+    )
+    failed = False
+    for subtype in args.subtypes:
+        result = check(subtype, args)
+        failures = result["failures"]
+        failed = failed or bool(failures)
+        target = "" if result["target"] is None else f"{result['target']:+.2f}"
+        slope = "" if result["slope"] is None else f"{result['slope']:+.2f}"
+        print(
+            f"{subtype:>7} {target:>7} {slope:>7} {result['dc']:>+8.4f} "
+            f"{result['clipped']:>8.3%} {result['rms']:>9.1f} "
+            f"{result['render'] * 1000:>9.1f}  {'FAIL' if failures else 'ok'}"
+        )
+        for line in (*result["notes"], *failures):
+            print(f"{'':>9}{line}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Compare event-loop CPU of the copying stream relay with the splice relay.
+
+Each stream is a source process writing PCM-sized blocks to a pipe and a
+sink process reading from a loopback TCP socket. This process sits in the
+middle, as Home Assistant does, and relays each stream either through a
+``StreamReader`` plus transport writes (the default path) or with
+``SpliceRelay``. Both paths use HTTP chunk framing. Only the CPU time of this
+process is measured, starting once every stream is connected, so process
+start-up and the sources and sinks do not skew the result.
+
+Example::
+
+    python scripts/splice_benchmark.py --streams 16 --duration 20 --rate 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from custom_components.noise_generator.const import (  # noqa: E402
+    SAMPLE_RATE,
+    STDOUT_READ_SIZE,
+    STREAM_CHUNK_DURATION,
+)
+from custom_components.noise_generator.relay import (  # noqa: E402
+    SPLICE_AVAILABLE,
+    SpliceRelay,
+    splice_socket_fd,
+)
+
+BYTE_RATE = SAMPLE_RATE * 2
+
+# Writes worker-sized blocks at ``rate`` times real time (0 = as fast as possible).
+SOURCE = """
+import os, sys, time
+rate, block = float(sys.argv[1]), int(sys.argv[2])
+data = os.urandom(block)
+interval = block / ({byte_rate} * rate) if rate else 0
+deadline = time.monotonic()
+try:
+    while True:
+        os.write(1, data)
+        if interval:
+            deadline += interval
+            time.sleep(max(0.0, deadline - time.monotonic()))
+except BrokenPipeError:
+    pass
+""".format(byte_rate=BYTE_RATE)
+
+SINK = """
+import socket, sys
+sock = socket.create_connection(("127.0.0.1", int(sys.argv[1])))
+while sock.recv(1 << 16):
+    pass
+"""
+
+
+class _Activity:
+    def begin_write(self, _now: float) -> None:
+        pass
+
+    def end_write(self, _size: int) -> None:
+        pass
+
+
+class _Clock:
+    """Start the measurement once every stream has its source running."""
+
+    def __init__(self, streams: int, duration: float) -> None:
+        self._waiting = streams
+        self._duration = duration
+        self._started = asyncio.Event()
+        self.stop_at = 0.0
+        self.cpu_before = 0.0
+
+    async def ready(self) -> float:
+        self._waiting -= 1
+        if not self._waiting:
+            self.cpu_before = time.process_time()
+            self.stop_at = asyncio.get_running_loop().time() + self._duration
+            self._started.set()
+        await self._started.wait()
+        return self.stop_at
+
+
+async def _source(rate: float, stdout: int) -> asyncio.subprocess.Process:
+    block = int(BYTE_RATE * STREAM_CHUNK_DURATION)
+    return await asyncio.create_subprocess_exec(
+        sys.executable, "-c", SOURCE, str(rate), str(block), stdout=stdout
+    )
+
+
+async def _copy_stream(writer: asyncio.StreamWriter, rate: float, clock: _Clock) -> int:
+    """The default path: read the pipe into Python and write chunk-framed data."""
+
+    process = await _source(rate, asyncio.subprocess.PIPE)
+    assert process.stdout is not None
+    loop = asyncio.get_running_loop()
+    total = 0
+    try:
+        stop_at = await clock.ready()
+        while loop.time() < stop_at:
+            chunk = await process.stdout.read(STDOUT_READ_SIZE)
+            if not chunk:
+                break
+            writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+            await writer.drain()
+            total += len(chunk)
+    finally:
+        process.kill()
+        # wait() also waits for the pipe, so drain what is left unread.
+        while await process.stdout.read(STDOUT_READ_SIZE):
+            pass
+        await process.wait()
+    return total
+
+
+async def _splice_stream(writer: asyncio.StreamWriter, rate: float, clock: _Clock) -> int:
+    """The splice path: the pipe is moved to the socket inside the kernel."""
+
+    socket_fd = splice_socket_fd(writer.transport)
+    if socket_fd is None:
+        raise RuntimeError("splice is not available for this socket")
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    try:
+        process = await _source(rate, write_fd)
+    finally:
+        os.close(write_fd)
+    relay = SpliceRelay(read_fd, socket_fd, chunked=True)
+    stop_at = await clock.ready()
+    task = asyncio.ensure_future(relay.relay(_Activity()))
+    try:
+        await asyncio.wait_for(asyncio.shield(task), stop_at - asyncio.get_running_loop().time())
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        process.kill()
+        await process.wait()
+        total = await task
+        os.close(read_fd)
+        os.close(socket_fd)
+    return total
+
+
+async def _run(mode: str, args: argparse.Namespace) -> dict[str, float]:
+    totals: list[int] = []
+    done = asyncio.Event()
+    clock = _Clock(args.streams, args.duration)
+
+    async def _handle(_reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        relay = _splice_stream if mode == "splice" else _copy_stream
+        try:
+            totals.append(await relay(writer, args.rate, clock))
+        finally:
+            writer.close()
+            if len(totals) == args.streams:
+                done.set()
+
+    server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    sinks = [
+        await asyncio.create_subprocess_exec(sys.executable, "-c", SINK, str(port))
+        for _ in range(args.streams)
+    ]
+    await done.wait()
+    cpu = time.process_time() - clock.cpu_before
+    server.close()
+    await server.wait_closed()
+    for sink in sinks:
+        await sink.wait()
+
+    megabytes = sum(totals) / 1e6
+    stream_seconds = args.streams * args.duration
+    return {
+        "cpu_s": cpu,
+        "mb": megabytes,
+        "cpu_ms_per_stream_s": cpu / stream_seconds * 1000,
+        "cpu_ms_per_mb": cpu / megabytes * 1000 if megabytes else float("nan"),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--streams", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument(
+        "--rate", type=float, default=1.0, help="multiple of real time, 0 = unthrottled"
+    )
+    args = parser.parse_args(argv)
+
+    modes = ["copy", "splice"] if SPLICE_AVAILABLE else ["copy"]
+    if not SPLICE_AVAILABLE:
+        print("os.splice is not available here; only the copy path is measured")
+    print(f"{'mode':>6} {'MB':>9} {'CPU s':>7} {'ms CPU/stream-s':>16} {'ms CPU/MB':>10}")
+    for mode in modes:
+        result = asyncio.run(_run(mode, args))
+        print(
+            f"{mode:>6} {result['mb']:>9.1f} {result['cpu_s']:>7.2f} "
+            f"{result['cpu_ms_per_stream_s']:>16.3f} {result['cpu_ms_per_mb']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
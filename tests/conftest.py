@@ -0,0 +1,19 @@
+"""Shared setup for the tests of the integration's pure-Python modules."""
+
+from __future__ import annotations
+
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Load the generator modules without the Home Assistant package __init__,
+# the same way the scripts do.
+for _name, _path in (
+    ("custom_components", "custom_components"),
+    ("custom_components.noise_generator", "custom_components/noise_generator"),
+):
+    _module = types.ModuleType(_name)
+    _module.__path__ = [str(ROOT / _path)]
+    sys.modules.setdefault(_name, _module)
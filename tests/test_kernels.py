@@ -0,0 +1,51 @@
+"""The Numba kernels must render exactly what the Python loops render."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("numba")
+
+from custom_components.noise_generator import kernels  # noqa: E402
+from custom_components.noise_generator.noise import create_generator, pack_samples  # noqa: E402
+
+LENGTH = 20000
+
+
+@pytest.fixture(scope="module")
+def compiled() -> kernels.Kernels:
+    loaded = kernels.load()
+    if loaded is None:
+        pytest.skip("Numba kernels are disabled")
+    return loaded
+
+
+def _render(subtype: str, seed: object, switch_at: int | None, monkeypatch) -> bytes:
+    """Render with the Python loops, switching to the kernels at ``switch_at``."""
+
+    loaded = kernels.current()
+    monkeypatch.setattr(kernels, "_KERNELS", None)
+    generator = create_generator("color_noise", subtype, 0.8, seed, {})
+    if switch_at is None:
+        return pack_samples(generator.next_samples(LENGTH))
+    head = generator.next_samples(switch_at)
+    monkeypatch.setattr(kernels, "_KERNELS", loaded)
+    return pack_samples(head + generator.next_samples(LENGTH - switch_at))
+
+
+@pytest.mark.parametrize("subtype", ["white", "pink", "brown"])
+@pytest.mark.parametrize("switch_at", [0, 1, 7777])
+def test_kernels_match_python_loops(compiled, monkeypatch, subtype: str, switch_at: int) -> None:
+    python = _render(subtype, 1234, None, monkeypatch)
+    assert _render(subtype, 1234, switch_at, monkeypatch) == python
+
+
+@pytest.mark.parametrize("subtype", ["pink", "brown"])
+def test_kernels_seek_like_python_loops(compiled, monkeypatch, subtype: str) -> None:
+    generator = create_generator("color_noise", subtype, 0.8, 99, {})
+    generator.seek(50000)
+    with_kernels = pack_samples(generator.next_samples(LENGTH))
+    monkeypatch.setattr(kernels, "_KERNELS", None)
+    generator = create_generator("color_noise", subtype, 0.8, 99, {})
+    generator.seek(50000)
+    assert pack_samples(generator.next_samples(LENGTH)) == with_kernels
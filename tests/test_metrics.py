@@ -0,0 +1,54 @@
+"""Tests for the Prometheus text rendering."""
+
+from __future__ import annotations
+
+from custom_components.noise_generator.const import METRICS_TTFB_BUCKETS
+from custom_components.noise_generator.metrics import NoiseMetrics
+
+LABELS = ("color_noise", "pink")
+
+
+def test_render_lists_every_metric_with_help_and_type() -> None:
+    metrics = NoiseMetrics()
+    text = metrics.render()
+    assert text.endswith("\n")
+    for metric in vars(metrics).values():
+        assert f"# HELP {metric.name} {metric.documentation}\n" in text
+        assert f"# TYPE {metric.name} {metric.kind}\n" in text
+
+
+def test_render_counters() -> None:
+    metrics = NoiseMetrics()
+    metrics.streams_started.inc(LABELS)
+    metrics.streams_started.inc(LABELS)
+    metrics.bytes_served.inc(LABELS, 44)
+    lines = metrics.render().splitlines()
+    assert 'noise_generator_streams_started_total{type="color_noise",subtype="pink"} 2.0' in lines
+    assert 'noise_generator_served_bytes_total{type="color_noise",subtype="pink"} 44.0' in lines
+
+
+def test_render_histogram_buckets_are_cumulative() -> None:
+    metrics = NoiseMetrics()
+    for value in (0.03, 0.2, 0.2, 10.0):
+        metrics.time_to_first_byte.observe(LABELS, value)
+    lines = metrics.render().splitlines()
+    name = "noise_generator_time_to_first_byte_seconds"
+    labels = 'type="color_noise",subtype="pink"'
+    buckets = [line for line in lines if line.startswith(f"{name}_bucket{{")]
+    assert len(buckets) == len(METRICS_TTFB_BUCKETS) + 1
+    assert f'{name}_bucket{{{labels},le="0.025"}} 0' in lines
+    assert f'{name}_bucket{{{labels},le="0.05"}} 1' in lines
+    assert f'{name}_bucket{{{labels},le="0.25"}} 3' in lines
+    assert f'{name}_bucket{{{labels},le="5.0"}} 3' in lines
+    assert f'{name}_bucket{{{labels},le="+Inf"}} 4' in lines
+    assert f"{name}_sum{{{labels}}} 10.43" in lines
+    assert f"{name}_count{{{labels}}} 4" in lines
+
+
+def test_render_escapes_label_values() -> None:
+    metrics = NoiseMetrics()
+    metrics.probes.inc(("tonal_noise", 'say "hi"\\\n'))
+    assert (
+        'noise_generator_probes_total{type="tonal_noise",subtype="say \\"hi\\"\\\\\\n"} 1.0'
+        in metrics.render().splitlines()
+    )
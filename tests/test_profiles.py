@@ -0,0 +1,151 @@
+"""Tests for profile normalisation."""
+
+from __future__ import annotations
+
+from custom_components.noise_generator.const import (
+    CONF_EQ_BANDS,
+    CONF_EQ_BASE,
+    CONF_MIX_DEFINITION,
+    CONF_MIX_LAYERS,
+    CONF_MODULATION,
+    CONF_MODULATION_DEPTH,
+    CONF_MODULATION_PERIOD,
+    CONF_PROFILE_PARAMETERS,
+    CONF_PROFILE_SUBTYPE,
+    CONF_PROFILE_TYPE,
+    DEFAULT_EQ_BASE,
+    DEFAULT_EQ_Q,
+    DEFAULT_MODULATION_DEPTH,
+    EQ_FREQUENCY_MIN,
+    EQ_GAIN_MAX,
+    EQ_MAX_BANDS,
+    EQ_Q_MIN,
+    MIX_MAX_LAYERS,
+    MODULATION_CUTOFF_DRIFT,
+    MODULATION_PERIOD_MAX,
+    MODULATION_PERIOD_MIN,
+    MODULATION_WAVES,
+)
+from custom_components.noise_generator.noise import coerce_profile
+
+
+def _parameters(profile_type: str, subtype: str, parameters: dict) -> dict:
+    return coerce_profile(
+        {
+            CONF_PROFILE_TYPE: profile_type,
+            CONF_PROFILE_SUBTYPE: subtype,
+            CONF_PROFILE_PARAMETERS: parameters,
+        }
+    )[CONF_PROFILE_PARAMETERS]
+
+
+def test_eq_bands_are_clamped_and_filtered() -> None:
+    parameters = _parameters(
+        "color_noise",
+        "eq",
+        {
+            CONF_EQ_BASE: "violet",
+            CONF_EQ_BANDS: [
+                {"type": "peak", "frequency": 5, "gain": 40, "q": 0},
+                {"type": "notch", "frequency": "60"},
+                {"type": "bell", "frequency": 100},
+                {"type": "peak"},
+                "low_shelf 80 6 0.7",
+            ],
+        },
+    )
+    assert parameters[CONF_EQ_BASE] == DEFAULT_EQ_BASE
+    assert parameters[CONF_EQ_BANDS] == [
+        {"type": "peak", "frequency": EQ_FREQUENCY_MIN, "gain": EQ_GAIN_MAX, "q": EQ_Q_MIN},
+        {"type": "notch", "frequency": 60.0, "gain": 0.0, "q": DEFAULT_EQ_Q},
+    ]
+
+
+def test_eq_bands_are_limited() -> None:
+    bands = [{"type": "peak", "frequency": 100 * (index + 1)} for index in range(12)]
+    parameters = _parameters("color_noise", "eq", {CONF_EQ_BANDS: bands})
+    assert len(parameters[CONF_EQ_BANDS]) == EQ_MAX_BANDS
+
+
+def test_eq_fields_are_dropped_from_other_colours() -> None:
+    parameters = _parameters("color_noise", "pink", {CONF_EQ_BASE: "white", CONF_EQ_BANDS: []})
+    assert CONF_EQ_BASE not in parameters
+    assert CONF_EQ_BANDS not in parameters
+
+
+def test_mix_layers_are_normalised() -> None:
+    layers = [
+        {"profile": "Rain", "gain": 2},
+        {"profile": "Fan", "gain": "loud"},
+        {
+            "profile": "Beep",
+            "gain": -1,
+            CONF_MIX_DEFINITION: {CONF_PROFILE_TYPE: "tonal_noise", CONF_PROFILE_SUBTYPE: "x"},
+        },
+        {"profile": "Nested", CONF_MIX_DEFINITION: {CONF_PROFILE_TYPE: "mix"}},
+    ]
+    coerced = coerce_profile(
+        {CONF_PROFILE_TYPE: "mix", CONF_PROFILE_PARAMETERS: {CONF_MIX_LAYERS: layers}}
+    )
+    assert coerced[CONF_PROFILE_SUBTYPE] == "mix"
+    result = coerced[CONF_PROFILE_PARAMETERS][CONF_MIX_LAYERS]
+    assert [(layer["profile"], layer["gain"]) for layer in result] == [
+        ("Rain", 1.0),
+        ("Beep", 0.0),
+        ("Nested", 1.0),
+    ]
+    assert result[1][CONF_MIX_DEFINITION][CONF_PROFILE_TYPE] == "tonal_noise"
+    assert CONF_MIX_DEFINITION not in result[2]
+
+
+def test_mix_layers_without_a_profile_are_dropped() -> None:
+    layers = [{"profile": "", "gain": 0.5}, {"gain": 0.5}, "Rain", {"profile": "Rain"}]
+    parameters = _parameters("mix", "mix", {CONF_MIX_LAYERS: layers})
+    assert parameters[CONF_MIX_LAYERS] == [{"profile": "Rain", "gain": 1.0}]
+
+
+def test_mix_layers_are_limited() -> None:
+    layers = [{"profile": f"Layer {index}"} for index in range(MIX_MAX_LAYERS + 2)]
+    parameters = _parameters("mix", "mix", {CONF_MIX_LAYERS: layers})
+    assert len(parameters[CONF_MIX_LAYERS]) == MIX_MAX_LAYERS
+
+
+def test_modulation_is_clamped() -> None:
+    parameters = _parameters(
+        "color_noise",
+        "white",
+        {CONF_MODULATION: MODULATION_WAVES, CONF_MODULATION_PERIOD: 0.5, CONF_MODULATION_DEPTH: 3},
+    )
+    assert parameters[CONF_MODULATION] == MODULATION_WAVES
+    assert parameters[CONF_MODULATION_PERIOD] == MODULATION_PERIOD_MIN
+    assert parameters[CONF_MODULATION_DEPTH] == 1.0
+
+    parameters = _parameters(
+        "tonal_noise",
+        "gentle_beep",
+        {CONF_MODULATION: MODULATION_WAVES, CONF_MODULATION_PERIOD: 1e9},
+    )
+    assert parameters[CONF_MODULATION_PERIOD] == MODULATION_PERIOD_MAX
+    assert parameters[CONF_MODULATION_DEPTH] == DEFAULT_MODULATION_DEPTH
+
+
+def test_filter_modulation_needs_custom_colour() -> None:
+    drift = {
+        CONF_MODULATION: MODULATION_CUTOFF_DRIFT,
+        CONF_MODULATION_PERIOD: 20,
+        CONF_MODULATION_DEPTH: 0.5,
+    }
+    assert CONF_MODULATION in _parameters("color_noise", "custom", dict(drift))
+    for profile_type, subtype in (("color_noise", "pink"), ("tonal_noise", "gentle_beep")):
+        parameters = _parameters(profile_type, subtype, dict(drift))
+        assert CONF_MODULATION not in parameters
+        assert CONF_MODULATION_PERIOD not in parameters
+        assert CONF_MODULATION_DEPTH not in parameters
+
+
+def test_unknown_modulation_is_dropped() -> None:
+    parameters = _parameters(
+        "color_noise", "white", {CONF_MODULATION: "wobble", CONF_MODULATION_DEPTH: 0.3}
+    )
+    assert CONF_MODULATION not in parameters
+    assert CONF_MODULATION_DEPTH not in parameters
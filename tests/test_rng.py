@@ -0,0 +1,45 @@
+"""Tests for the counter-based random source."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.noise_generator.rng import CounterRandom
+
+
+def test_same_seed_gives_same_values() -> None:
+    first, second = CounterRandom("seed"), CounterRandom("seed")
+    assert [first.random() for _ in range(100)] == [second.random() for _ in range(100)]
+
+
+def test_different_seeds_differ() -> None:
+    first, second = CounterRandom(1), CounterRandom(2)
+    assert [first.random() for _ in range(10)] != [second.random() for _ in range(10)]
+
+
+def test_values_are_in_unit_interval() -> None:
+    rng = CounterRandom(3)
+    assert all(0.0 <= rng.random() < 1.0 for _ in range(1000))
+
+
+def test_seek_jumps_to_the_same_value() -> None:
+    straight = CounterRandom(4)
+    values = [straight.random() for _ in range(1000)]
+    rng = CounterRandom(4)
+    rng.seek(700)
+    assert [rng.random() for _ in range(300)] == values[700:]
+    assert rng.position == 1000
+
+
+def test_uniform_scales_random() -> None:
+    rng, reference = CounterRandom(5), CounterRandom(5)
+    assert rng.uniform(-1.0, 1.0) == -1.0 + 2.0 * reference.random()
+
+
+def test_random_array_matches_random() -> None:
+    pytest.importorskip("numpy")
+    rng, reference = CounterRandom(6), CounterRandom(6)
+    rng.seek(12345)
+    reference.seek(12345)
+    assert rng.random_array(500).tolist() == [reference.random() for _ in range(500)]
+    assert rng.position == reference.position
@@ -0,0 +1,29 @@
+"""Tests for the worker CPU list parser."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.noise_generator.scheduling import parse_cpu_list
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("", []),
+        ("  ", []),
+        ("3", [3]),
+        ("2-3", [2, 3]),
+        ("0,2,4-5", [0, 2, 4, 5]),
+        ("5, 1-2, 2", [1, 2, 5]),
+        ("4-4", [4]),
+    ],
+)
+def test_parse_cpu_list(text: str, expected: list[int]) -> None:
+    assert parse_cpu_list(text) == expected
+
+
+@pytest.mark.parametrize("text", ["a", "3-1", "-1", ",", "0-2-4", "1.5"])
+def test_parse_cpu_list_rejects_invalid(text: str) -> None:
+    with pytest.raises(ValueError):
+        parse_cpu_list(text)
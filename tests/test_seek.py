@@ -0,0 +1,67 @@
+"""A seeded render seeked to an offset must equal a straight render sliced there."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.noise_generator.const import (
+    CONF_CUSTOM_HIGH_CUTOFF,
+    CONF_CUSTOM_LOW_CUTOFF,
+    CONF_CUSTOM_SLOPE,
+    CONF_EQ_BANDS,
+    CONF_EQ_BASE,
+    CONF_MODULATION,
+    CONF_MODULATION_PERIOD,
+    MODULATION_CUTOFF_DRIFT,
+    MODULATION_WAVES,
+)
+from custom_components.noise_generator.noise import create_generator, pack_samples
+
+CUSTOM = {CONF_CUSTOM_SLOPE: -4.5, CONF_CUSTOM_LOW_CUTOFF: 100.0, CONF_CUSTOM_HIGH_CUTOFF: 6000.0}
+EQ_BANDS = [
+    {"type": "low_shelf", "frequency": 80.0, "gain": 6.0, "q": 0.7},
+    {"type": "peak", "frequency": 1000.0, "gain": -9.0, "q": 2.0},
+]
+
+PROFILES = {
+    "white": ("color_noise", "white", {}),
+    "pink": ("color_noise", "pink", {}),
+    "brown": ("color_noise", "brown", {}),
+    "custom": ("color_noise", "custom", CUSTOM),
+    "custom_drift": (
+        "color_noise",
+        "custom",
+        {**CUSTOM, CONF_MODULATION: MODULATION_CUTOFF_DRIFT, CONF_MODULATION_PERIOD: 5.0},
+    ),
+    "eq": ("color_noise", "eq", {CONF_EQ_BASE: "brown", CONF_EQ_BANDS: EQ_BANDS}),
+    "tonal": ("tonal_noise", "gentle_beep", {}),
+    "tonal_waves": (
+        "tonal_noise",
+        "custom_tonal",
+        {CONF_MODULATION: MODULATION_WAVES, CONF_MODULATION_PERIOD: 5.0},
+    ),
+}
+
+LENGTH = 8000
+
+
+def _render(name: str, offset: int) -> bytes:
+    profile_type, subtype, parameters = PROFILES[name]
+    generator = create_generator(profile_type, subtype, 0.8, "seek-test", dict(parameters))
+    if offset:
+        generator.seek(offset)
+    return pack_samples(generator.next_samples(LENGTH))
+
+
+@pytest.mark.parametrize("name", list(PROFILES))
+@pytest.mark.parametrize("offset", [1, 4095, 33333])
+def test_seek_matches_straight_render(name: str, offset: int) -> None:
+    profile_type, subtype, parameters = PROFILES[name]
+    generator = create_generator(profile_type, subtype, 0.8, "seek-test", dict(parameters))
+    straight = pack_samples(generator.next_samples(offset + LENGTH))
+    assert _render(name, offset) == straight[2 * offset :]
+
+
+@pytest.mark.parametrize("name", list(PROFILES))
+def test_seeded_render_is_reproducible(name: str) -> None:
+    assert _render(name, 0) == _render(name, 0)
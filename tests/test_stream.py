@@ -0,0 +1,29 @@
+"""Tests for the stream view helpers."""
+
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.noise_generator.stream import _etag_matches  # noqa: E402
+
+ETAG = '"0123abcd-30-0-0-v4"'
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ("", False),
+        (ETAG, True),
+        (f"W/{ETAG}", True),
+        (f'"other", {ETAG}', True),
+        (f'"other",W/{ETAG} ', True),
+        ("*", True),
+        ('"other"', False),
+        (ETAG.strip('"'), False),
+    ],
+)
+def test_etag_matches(header: str | None, expected: bool) -> None:
+    assert _etag_matches(header, ETAG) is expected